@@ -1,6 +1,13 @@
-from fastapi import APIRouter, HTTPException, Query, Body, Depends
-from typing import Optional
-from elasticsearch.dsl import AsyncSearch
+from fastapi import APIRouter, HTTPException, Query, Body, Depends, Response, BackgroundTasks
+from fastapi.responses import ORJSONResponse
+from typing import Optional, Dict, Any
+from datetime import datetime
+import asyncio
+import math
+import time
+import uuid
+from elasticsearch import NotFoundError
+from elasticsearch.dsl import AsyncSearch, AsyncMultiSearch, Q
 from app.models.schemas import MotivationRequest, AnalysisResponse, PredictionRequest
 from app.services.elasticsearch_service import ElasticsearchService, get_elasticsearch_service
 from app.services.vertex_gemini_service import vertex_gemini_service
@@ -8,17 +15,338 @@ from app.services.bigquery_service import bigquery_service
 from app.services.elasticsearch_client import es_client
 from app.core.logger import setup_logger
 from app.core.config import get_settings
+from app.core.cache import TTLCache
 
 router = APIRouter()
 logger = setup_logger(__name__)
 settings = get_settings()
 
+# Outcome data changes slowly - serve repeated dashboard/success-rate reads from memory
+success_rates_cache = TTLCache(ttl=settings.analytics_cache_ttl, maxsize=64)
+dashboard_cache = TTLCache(ttl=settings.analytics_cache_ttl, maxsize=1)
+CACHE_CONTROL = f"public, max-age={settings.analytics_cache_ttl}"
+
+# Recent /predict results keyed by (experience, difficulty, match score bucket)
+predict_cache = TTLCache(ttl=settings.predict_cache_ttl, maxsize=1024)
+PREDICT_SCORE_BUCKETS = 20  # match score bucketed to 0.05
+# Similar-case search results keyed by semantic query text, shared by both /predict paths
+similar_cases_cache = TTLCache(ttl=settings.similar_cases_cache_ttl, maxsize=256)
+
+# After a BigQuery ML failure, go straight to the ES fallback for a while instead of
+# paying the BigQuery timeout on every request
+BQ_RETRY_AFTER_SECONDS = 10
+_bq_unhealthy_until = 0.0
+
+# State of BigQuery sync jobs started via POST /sync-bigquery, keyed by job_id
+# Recent jobs are kept in memory; every state change is also written to ES so any
+# worker can answer a status poll
+sync_jobs: Dict[str, Dict[str, Any]] = {}
+MAX_SYNC_JOBS = 50
+
+
+def _make_query_text(exp_level: str, dog_diff: str, match_score: float) -> str:
+    """Semantic query text describing an adopter/dog pairing"""
+    return f"{exp_level} adopter with {dog_diff} dog, match score {match_score}"
+
+
+# /predict runs on every match view, so its searches are plain request bodies sent
+# straight to _msearch rather than DSL objects rebuilt and serialized per request
+
+# Case counts come from a cheap zero-hit filters agg instead of hits.total
+OUTCOME_COUNTS_BODY = {
+    "size": 0,
+    "track_total_hits": False,
+    "aggs": {
+        "by_outcome": {
+            "filters": {
+                "filters": {
+                    "success": {"term": {"outcome": "success"}},
+                    "returned": {"term": {"outcome": "returned"}},
+                }
+            }
+        }
+    },
+}
+OUTCOME_COUNTS_HEADER = {
+    "request_cache": True,
+    "preference": settings.analytics_search_preference,
+}
+
+
+# Similar-case searches only feed top-K examples and score ratios, so each shard stops
+# collecting after this many matches; counts come from OUTCOME_COUNTS_BODY instead
+SIMILAR_CASES_TERMINATE_AFTER = 50
+# Enough hits for the fallback's score ratio; explainability shows the top 3 of these
+SIMILAR_CASES_SIZE = 10
+
+
+def _similar_cases_body(field: str, outcome: str, query_text: str, size: int):
+    """
+    Semantic search body for outcomes of one kind; only scores and dog_id are read
+    dog_id comes from doc values so ES never loads the _source (with its inference
+    chunks) of the matched outcomes
+    """
+    return {
+        "query": {
+            "bool": {
+                "must": [{"semantic": {"field": field, "query": query_text}}],
+                "filter": [{"term": {"outcome": outcome}}],
+            }
+        },
+        "size": size,
+        "_source": False,
+        "docvalue_fields": ["dog_id"],
+        "terminate_after": SIMILAR_CASES_TERMINATE_AFTER,
+        "track_total_hits": False,
+    }
+
+
+async def _msearch_outcomes(*searches):
+    """Send (header, body) pairs to the outcomes index in a single _msearch round-trip"""
+    lines = []
+    for header, body in searches:
+        lines.extend((header, body))
+
+    response = await es_client.client.msearch(
+        index=settings.outcomes_index,
+        searches=lines,
+        max_concurrent_shard_requests=settings.elastic_max_concurrent_shard_requests,
+    )
+    results = response["responses"]
+    for result in results:
+        if "error" in result:
+            raise RuntimeError(f"Outcome search failed: {result['error']}")
+    return results
+
+
+def _summarize_hits(hits):
+    """Compact id/score/dog_id view of outcome hits for explainability"""
+    return [
+        {
+            "id": h["_id"],
+            "score": round(h.get("_score") or 0.0, 4),
+            "dog_id": h.get("fields", {}).get("dog_id", [None])[0],
+        }
+        for h in hits
+    ]
+
+
+def _score_sum(hits) -> float:
+    """Sum of relevance scores across hits, in a single pass"""
+    return math.fsum(h.get("_score") or 0.0 for h in hits)
+
+
+async def _similar_cases(query_text: str):
+    """
+    Top similar successes/failures and outcome counts for a /predict query
+    Shared by the BigQuery explainability and ES fallback paths, so a fallback after a
+    BigQuery failure reuses (or joins) the searches the explainability already sent
+    """
+    return await similar_cases_cache.get_or_compute(
+        query_text, lambda: _search_similar_cases(query_text)
+    )
+
+
+async def _search_similar_cases(query_text: str):
+    r_success, r_failed, r_counts = await _msearch_outcomes(
+        ({}, _similar_cases_body("success_factors", "success", query_text, SIMILAR_CASES_SIZE)),
+        ({}, _similar_cases_body("failure_factors", "returned", query_text, SIMILAR_CASES_SIZE)),
+        (OUTCOME_COUNTS_HEADER, OUTCOME_COUNTS_BODY),
+    )
+    counts = r_counts["aggregations"]["by_outcome"]["buckets"]
+
+    return (
+        r_success["hits"]["hits"],
+        r_failed["hits"]["hits"],
+        {
+            "success": counts["success"]["doc_count"],
+            "returned": counts["returned"]["doc_count"],
+        },
+    )
+
+
+async def _explain_with_es(exp_level: str, dog_diff: str, match_score: float):
+    """Explainability from ES for /predict: top-3 similar successes/failures + total counts"""
+    success_hits, failed_hits, counts = await _similar_cases(
+        _make_query_text(exp_level, dog_diff, match_score)
+    )
+
+    return {
+        "similar_successful_cases": counts["success"],
+        "similar_failed_cases": counts["returned"],
+        "top_similar_successes": _summarize_hits(success_hits[:3]),
+        "top_similar_failures": _summarize_hits(failed_hits[:3]),
+    }
+
+
+def invalidate_analytics_cache():
+    """Drop cached analytics so the next read reflects freshly synced data"""
+    success_rates_cache.invalidate()
+    dashboard_cache.invalidate()
+    predict_cache.invalidate()
+    similar_cases_cache.invalidate()
+
+
+async def _compute_success_rates(
+    adopter_experience: Optional[str], dog_difficulty: Optional[str]
+) -> Dict[str, Any]:
+    """Success rates from BigQuery, falling back to an Elasticsearch filters agg"""
+    filters = {}
+    if adopter_experience:
+        filters["adopter_experience_level"] = adopter_experience
+    if dog_difficulty:
+        filters["dog_difficulty_level"] = dog_difficulty
+
+    # Get from BigQuery (if setup) or fallback to Elasticsearch
+    try:
+        result = await bigquery_service.query_success_rates(filters)
+        result["source"] = "BigQuery"
+    except Exception as bq_error:
+        logger.warning(f"BigQuery not available, using Elasticsearch: {bq_error}")
+
+        # Fallback: Use Elasticsearch AsyncSearch
+        # One zero-hit request with a filters agg returns both counts in a single round-trip
+        s = AsyncSearch(using=es_client.client, index=settings.outcomes_index)[0:0]
+        s = s.extra(track_total_hits=False).params(
+            request_cache=True,
+            preference=settings.analytics_search_preference,
+            max_concurrent_shard_requests=settings.elastic_max_concurrent_shard_requests,
+        )
+        for field, value in filters.items():
+            s = s.filter("term", **{field: value})
+        s.aggs.bucket(
+            "by_outcome",
+            "filters",
+            filters={"total": Q("match_all"), "success": Q("term", outcome="success")},
+        )
+        es_response = await s.execute()
+
+        buckets = es_response.aggregations.by_outcome.buckets
+        total_count = buckets.total.doc_count
+        success_count = buckets.success.doc_count
+
+        success_rate = (success_count / total_count * 100) if total_count > 0 else 0
+
+        result = {
+            "stats": [
+                {
+                    "total_adoptions": total_count,
+                    "successful_adoptions": success_count,
+                    "success_rate": round(success_rate, 2),
+                }
+            ],
+            "source": "Elasticsearch",
+        }
+
+    return result
+
+
+def _predict_cache_key(prediction: PredictionRequest):
+    """Predictions vary little within a 0.05 match-score band, so nearby scores share an entry"""
+    return (
+        prediction.adopter_experience,
+        prediction.dog_difficulty,
+        round(prediction.match_score * PREDICT_SCORE_BUCKETS) / PREDICT_SCORE_BUCKETS,
+    )
+
+
+async def _predict_outcome(prediction: PredictionRequest) -> Dict[str, Any]:
+    """BigQuery ML prediction with ES explainability, falling back to ES pattern matching"""
+    global _bq_unhealthy_until
+
+    # -------------------- try BigQuery ML first --------------------
+    bq_available = time.monotonic() >= _bq_unhealthy_until
+    ml_failed = False
+    try:
+        if not bq_available:
+            raise RuntimeError("BigQuery ML recently failed, skipping until retry window")
+
+        # Run the ML prediction and the ES-based explainability (top-3 examples + counts)
+        # concurrently - they don't depend on each other
+        explain_task = asyncio.create_task(
+            _explain_with_es(
+                prediction.adopter_experience,
+                prediction.dog_difficulty,
+                prediction.match_score,
+            )
+        )
+        try:
+            result = await bigquery_service.predict_outcome_ml(
+                adopter_experience=prediction.adopter_experience,
+                dog_difficulty=prediction.dog_difficulty,
+                match_score=prediction.match_score,
+            )
+        except Exception:
+            # Stop waiting on the explainability; its searches keep running in the
+            # shared similar-cases cache and the fallback picks them up from there
+            ml_failed = True
+            explain_task.cancel()
+            raise
+        explain = await explain_task
+
+        result.update(
+            {
+                "source": "BigQuery ML",
+                **explain,
+            }
+        )
+
+    # -------------------- fallback: ES semantic pattern matching --------------------
+    except Exception as bq_error:
+        logger.warning(f"BigQuery ML not available, using pattern matching: {bq_error}")
+        # Only back off when BigQuery itself failed, not the ES explainability searches
+        if ml_failed:
+            _bq_unhealthy_until = time.monotonic() + BQ_RETRY_AFTER_SECONDS
+
+        query_text = _make_query_text(
+            prediction.adopter_experience, prediction.dog_difficulty, prediction.match_score
+        )
+
+        # Find similar successful and failed outcomes
+        success_hits, failed_hits, counts = await _similar_cases(query_text)
+
+        # Confidence from similarity scores (each list summed once)
+        success_score = _score_sum(success_hits)
+        total_score = success_score + _score_sum(failed_hits)
+        success_ratio = (success_score / total_score) if total_score > 0 else 0.5
+
+        predicted_outcome = "success" if success_ratio > 0.5 else "returned"
+        confidence = success_ratio if predicted_outcome == "success" else (1.0 - success_ratio)
+
+        # Explainability (reuse the top items from these responses)
+        top_successes = _summarize_hits(success_hits[:3])
+        top_failures = _summarize_hits(failed_hits[:3])
+
+        result = {
+            "predicted_outcome": predicted_outcome,
+            "confidence": round(confidence, 4),
+            "adopter_experience": prediction.adopter_experience,
+            "dog_difficulty": prediction.dog_difficulty,
+            "match_score": prediction.match_score,
+            "similar_successful_cases": counts["success"],
+            "similar_failed_cases": counts["returned"],
+            "top_similar_successes": top_successes,
+            "top_similar_failures": top_failures,
+            "source": "Elasticsearch Semantic Pattern Matching",
+            "recommendation": (
+                "Proceed with adoption"
+                if predicted_outcome == "success"
+                else "High risk - recommend trial foster"
+            ),
+        }
+
+    logger.info(
+        f"Prediction: {result.get('predicted_outcome') or result.get('outcome')} "
+        f"(confidence: {result['confidence']})"
+    )
+    return result
+
 
 # Success Rates Endpoint
 # ~~~~worked! testing done by with postman.
-# filter does not work yet.
 @router.get("/success-rates")
 async def get_success_rates(
+    response: Response,
     adopter_experience: Optional[str] = Query(
         None, description="Filter by adopter experience level"
     ),
@@ -29,41 +357,13 @@ async def get_success_rates(
 
     For demo: Show "Work-from-home adopters: 89% success"
     """
-    try:
-        filters = {}
-        if adopter_experience:
-            filters["adopter_experience_level"] = adopter_experience
-        if dog_difficulty:
-            filters["dog_difficulty_level"] = dog_difficulty
+    response.headers["Cache-Control"] = CACHE_CONTROL
 
-        # Get from BigQuery (if setup) or fallback to Elasticsearch
-        try:
-            result = await bigquery_service.query_success_rates(filters)
-            result["source"] = "BigQuery"
-        except Exception as bq_error:
-            logger.warning(f"BigQuery not available, using Elasticsearch: {bq_error}")
-
-            # Fallback: Use Elasticsearch AsyncSearch
-            s = AsyncSearch(using=es_client.client, index=settings.outcomes_index)
-            total_count = await s.count()
-
-            success_s = s.filter("term", outcome="success")
-            success_count = await success_s.count()
-
-            success_rate = (success_count / total_count * 100) if total_count > 0 else 0
-
-            result = {
-                "stats": [
-                    {
-                        "total_adoptions": total_count,
-                        "successful_adoptions": success_count,
-                        "success_rate": round(success_rate, 2),
-                    }
-                ],
-                "source": "Elasticsearch",
-            }
-
-        return result
+    try:
+        return await success_rates_cache.get_or_compute(
+            (adopter_experience, dog_difficulty),
+            lambda: _compute_success_rates(adopter_experience, dog_difficulty),
+        )
 
     except Exception as e:
         logger.error(f"Error getting success rates: {e}")
@@ -81,161 +381,28 @@ async def predict_adoption_outcome(prediction: PredictionRequest = Body(...)):
     - Explainability (both paths): top-3 similar success/failure cases from ES
     """
     try:
-        # ---------- helper: explainability from ES (top-3 + total counts) ----------
-        async def _explain_with_es(exp_level: str, dog_diff: str, match_score: float):
-            query_text = f"{exp_level} adopter with {dog_diff} dog, match score {match_score}"
-
-            # Top-3 similar successes
-            s_success = AsyncSearch(using=es_client.client, index=settings.outcomes_index)
-            s_success = s_success.query("semantic", field="success_factors", query=query_text)
-            s_success = s_success.filter("term", outcome="success")[0:3]
-            r_success = await s_success.execute()
-
-            # Top-3 similar failures (returned)
-            s_failed = AsyncSearch(using=es_client.client, index=settings.outcomes_index)
-            s_failed = s_failed.query("semantic", field="failure_factors", query=query_text)
-            s_failed = s_failed.filter("term", outcome="returned")[0:3]
-            r_failed = await s_failed.execute()
-
-            def _hits_total(resp):
-                try:
-                    return int(resp.hits.total.value)
-                except Exception:
-                    return len(resp)
-
-            top_successes = [
-                {
-                    "id": h.meta.id,
-                    "score": round(float(getattr(h.meta, "score", 0.0)), 4),
-                    "dog_id": getattr(h, "dog_id", None),
-                }
-                for h in r_success
-            ]
-            top_failures = [
-                {
-                    "id": h.meta.id,
-                    "score": round(float(getattr(h.meta, "score", 0.0)), 4),
-                    "dog_id": getattr(h, "dog_id", None),
-                }
-                for h in r_failed
-            ]
-
-            return {
-                "similar_successful_cases": _hits_total(r_success),
-                "similar_failed_cases": _hits_total(r_failed),
-                "top_similar_successes": top_successes,
-                "top_similar_failures": top_failures,
-            }
-
-        # -------------------- try BigQuery ML first --------------------
-        try:
-            result = await bigquery_service.predict_outcome_ml(
-                adopter_experience=prediction.adopter_experience,
-                dog_difficulty=prediction.dog_difficulty,
-                match_score=prediction.match_score,
-            )
-
-            # Enrich with ES-based explainability (top-3 examples + counts)
-            explain = await _explain_with_es(
-                prediction.adopter_experience,
-                prediction.dog_difficulty,
-                prediction.match_score,
-            )
-
-            result.update(
-                {
-                    "source": "BigQuery ML",
-                    **explain,
-                }
-            )
-
-        # -------------------- fallback: ES semantic pattern matching --------------------
-        except Exception as bq_error:
-            logger.warning(f"BigQuery ML not available, using pattern matching: {bq_error}")
-
-            query_text = (
-                f"{prediction.adopter_experience} adopter with "
-                f"{prediction.dog_difficulty} dog, match score {prediction.match_score}"
-            )
-
-            # Find similar successful outcomes
-            success_search = AsyncSearch(using=es_client.client, index=settings.outcomes_index)
-            success_search = success_search.query(
-                "semantic", field="success_factors", query=query_text
-            )
-            success_search = success_search.filter("term", outcome="success")[0:10]
-            success_response = await success_search.execute()
-
-            # Find similar failed outcomes
-            failed_search = AsyncSearch(using=es_client.client, index=settings.outcomes_index)
-            failed_search = failed_search.query(
-                "semantic", field="failure_factors", query=query_text
-            )
-            failed_search = failed_search.filter("term", outcome="returned")[0:10]
-            failed_response = await failed_search.execute()
-
-            # Confidence from similarity scores
-            success_scores = [float(getattr(h.meta, "score", 0.0)) for h in success_response]
-            failed_scores = [float(getattr(h.meta, "score", 0.0)) for h in failed_response]
-            total_score = sum(success_scores) + sum(failed_scores)
-            success_ratio = (sum(success_scores) / total_score) if total_score > 0 else 0.5
-
-            predicted_outcome = "success" if success_ratio > 0.5 else "returned"
-            confidence = success_ratio if predicted_outcome == "success" else (1.0 - success_ratio)
-
-            # Explainability (reuse the top items from these responses)
-            def _hits_total(resp):
-                try:
-                    return int(resp.hits.total.value)
-                except Exception:
-                    return len(resp)
-
-            top_successes = [
-                {
-                    "id": h.meta.id,
-                    "score": round(float(getattr(h.meta, "score", 0.0)), 4),
-                    "dog_id": getattr(h, "dog_id", None),
-                }
-                for h in list(success_response)[:3]
-            ]
-            top_failures = [
-                {
-                    "id": h.meta.id,
-                    "score": round(float(getattr(h.meta, "score", 0.0)), 4),
-                    "dog_id": getattr(h, "dog_id", None),
-                }
-                for h in list(failed_response)[:3]
-            ]
-
-            result = {
-                "predicted_outcome": predicted_outcome,
-                "confidence": round(float(confidence), 4),
-                "adopter_experience": prediction.adopter_experience,
-                "dog_difficulty": prediction.dog_difficulty,
-                "match_score": prediction.match_score,
-                "similar_successful_cases": _hits_total(success_response),
-                "similar_failed_cases": _hits_total(failed_response),
-                "top_similar_successes": top_successes,
-                "top_similar_failures": top_failures,
-                "source": "Elasticsearch Semantic Pattern Matching",
-                "recommendation": (
-                    "Proceed with adoption"
-                    if predicted_outcome == "success"
-                    else "High risk - recommend trial foster"
-                ),
-            }
-
-        logger.info(
-            f"Prediction: {result.get('predicted_outcome') or result.get('outcome')} "
-            f"(confidence: {result['confidence']})"
+        result = await predict_cache.get_or_compute(
+            _predict_cache_key(prediction), lambda: _predict_outcome(prediction)
         )
-        return result
+        # Payload is already JSON-native, so hand it straight to orjson and skip
+        # FastAPI's jsonable_encoder walk over the nested explainability lists
+        return ORJSONResponse({**result, "match_score": prediction.match_score})
 
     except Exception as e:
         logger.error(f"Error predicting outcome: {e}")
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 
+@router.post("/predict/cache/invalidate")
+async def invalidate_predict_cache():
+    """
+    Drop cached /predict results, e.g. after retraining the BigQuery ML model
+    """
+    predict_cache.invalidate()
+    logger.info("Prediction cache invalidated")
+    return {"success": True, "message": "Prediction cache invalidated"}
+
+
 # Sentiment Analysis Endpoint
 # ~~~~worked! testing done by with postman.
 @router.post("/sentiment", response_model=AnalysisResponse)
@@ -271,10 +438,14 @@ async def analyze_sentiment(request: MotivationRequest):
 # ~~~~worked! testing done by with postman.
 @router.get("/dashboard")
 async def get_dashboard_analytics(
+    response: Response,
+    fresh: bool = Query(False, description="Aggregate the raw outcomes index directly"),
     es_service: ElasticsearchService = Depends(get_elasticsearch_service),
 ):
     """
     Comprehensive analytics for demo dashboard using Elasticsearch DSL
+    Served from the snapshot materialized by the rollup while it covers every outcome;
+    fresh=true skips the snapshot and rollup and aggregates the raw outcomes
 
     Returns:
     - Overall success rate
@@ -283,8 +454,14 @@ async def get_dashboard_analytics(
     - Key insights
     """
     try:
-        dashboard = await es_service.get_realtime_analytics_from_es()
-        return dashboard
+        if fresh:
+            response.headers["Cache-Control"] = "no-store"
+            return await es_service.get_realtime_analytics_from_es(fresh=True)
+
+        response.headers["Cache-Control"] = CACHE_CONTROL
+        return await dashboard_cache.get_or_compute(
+            "dashboard", es_service.get_dashboard_analytics
+        )
 
     except Exception as e:
         logger.error(f"Error getting dashboard analytics: {e}")
@@ -293,32 +470,133 @@ async def get_dashboard_analytics(
 
 #  BigQuery Sync Endpoint
 # ~~~~worked! testing done by with postman.
-@router.post("/sync-bigquery")
-async def trigger_bigquery_sync():
+async def _save_sync_job(job: Dict[str, Any]):
+    """Persist a sync job's state so status polls work across workers"""
+    try:
+        await es_client.client.index(
+            index=settings.sync_jobs_index, id=job["job_id"], document=job
+        )
+    except Exception as e:
+        logger.warning(f"Could not persist sync job {job['job_id']}: {e}")
+
+
+async def _run_bigquery_sync(job: Dict[str, Any]):
+    """Run the BigQuery sync in the background and record its outcome on job"""
+    job["state"] = "running"
+    await _save_sync_job(job)
+
+    try:
+        result = await bigquery_service.sync_outcomes_to_bigquery()
+
+        logger.info(f"BigQuery sync completed: {result['synced_count']} records")
+        try:
+            es_service = get_elasticsearch_service()
+            await es_service.rollup_outcomes_daily()
+            await es_service.materialize_dashboard()
+        except Exception as e:
+            logger.warning(f"Outcome rollup and dashboard snapshot not refreshed after sync: {e}")
+        invalidate_analytics_cache()
+
+        job.update(
+            state="completed",
+            synced_count=result["synced_count"],
+            message=f"Synced {result['synced_count']} outcomes to BigQuery",
+            details=result,
+        )
+
+    except Exception as e:
+        logger.error(f"Error syncing to BigQuery: {e}")
+        # Non-critical error - BigQuery might not be set up yet
+        job.update(
+            state="failed",
+            message="BigQuery sync not available (setup required)",
+            error=str(e),
+        )
+
+    job["finished_at"] = datetime.now().isoformat()
+    await _save_sync_job(job)
+
+
+@router.post("/sync-bigquery", status_code=202)
+async def trigger_bigquery_sync(background_tasks: BackgroundTasks):
     """
     Manually trigger BigQuery sync (normally runs nightly)
 
+    The sync runs in the background; poll GET /sync-bigquery/{job_id} for progress.
     For demo: Show data flowing from ES → BigQuery
     """
+    # Forget the oldest jobs so the status map stays bounded
+    while len(sync_jobs) >= MAX_SYNC_JOBS:
+        sync_jobs.pop(next(iter(sync_jobs)))
+
+    job_id = uuid.uuid4().hex
+    job = {
+        "job_id": job_id,
+        "state": "pending",
+        "synced_count": 0,
+        "started_at": datetime.now().isoformat(),
+    }
+    sync_jobs[job_id] = job
+    await _save_sync_job(job)
+    background_tasks.add_task(_run_bigquery_sync, job)
+
+    return {"status": "accepted", "job_id": job_id}
+
+
+@router.get("/sync-bigquery/{job_id}")
+async def get_bigquery_sync_status(job_id: str):
+    """
+    Get the state of a BigQuery sync started via POST /sync-bigquery
+    """
+    job = sync_jobs.get(job_id)
+    if job is not None:
+        return job
+
+    # Started on another worker, or evicted from memory
     try:
-        result = await bigquery_service.sync_outcomes_to_bigquery()
+        response = await es_client.client.get(index=settings.sync_jobs_index, id=job_id)
+        return response["_source"]
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail=f"Sync job not found: {job_id}")
+    except Exception as e:
+        logger.error(f"Error getting sync job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
-        logger.info(f"BigQuery sync completed: {result['synced_count']} records")
+
+# Outcome Rollup Endpoint
+@router.post("/rollup-outcomes")
+async def trigger_outcome_rollup(
+    es_service: ElasticsearchService = Depends(get_elasticsearch_service),
+):
+    """
+    Rebuild the daily outcome rollup index and the /dashboard snapshot (normally runs nightly)
+    """
+    try:
+        result = await es_service.rollup_outcomes_daily()
+        await es_service.materialize_dashboard()
+        invalidate_analytics_cache()
 
         return {
             "success": True,
-            "message": f"Synced {result['synced_count']} outcomes to BigQuery",
+            "message": f"Rolled up outcomes into {result['rollup_docs']} daily docs",
             "details": result,
         }
 
     except Exception as e:
-        logger.error(f"Error syncing to BigQuery: {e}")
-        # Non-critical error - BigQuery might not be set up yet
-        return {
-            "success": False,
-            "message": "BigQuery sync not available (setup required)",
-            "error": str(e),
-        }
+        logger.error(f"Error rolling up outcomes: {e}")
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+
+# Cache Invalidation Endpoint
+@router.post("/cache/invalidate")
+async def invalidate_cache():
+    """
+    Drop cached /success-rates, /dashboard and /predict responses
+    Called automatically after a BigQuery sync; can also be triggered manually
+    """
+    invalidate_analytics_cache()
+    logger.info("Analytics cache invalidated")
+    return {"success": True, "message": "Analytics cache invalidated"}
 
 
 # Index Statistics Endpoint
@@ -329,76 +607,50 @@ async def get_index_statistics():
     Returns document counts and recent activity for data management dashboard
     """
     try:
-        # Count documents in each index
-        applications_search = AsyncSearch(using=es_client.client, index=settings.applications_index)
-        applications_count = await applications_search.count()
-
-        dogs_search = AsyncSearch(using=es_client.client, index=settings.dogs_index)
-        dogs_count = await dogs_search.count()
-
-        outcomes_search = AsyncSearch(using=es_client.client, index=settings.outcomes_index)
-        outcomes_count = await outcomes_search.count()
-
-        medical_docs_search = AsyncSearch(using=es_client.client, index=settings.medical_documents_index)
-        medical_docs_count = await medical_docs_search.count()
+        # (activity type, index, timestamp field of its most recent doc)
+        tracked_indices = [
+            ("applications", settings.applications_index, "submitted_at"),
+            ("dogs", settings.dogs_index, "rescue_date"),
+            ("outcomes", settings.outcomes_index, "created_at"),
+            ("medical_documents", settings.medical_documents_index, "upload_date"),
+        ]
+
+        # One search per index returns both its exact document count and its most
+        # recent doc; all of them go out in a single _msearch round-trip
+        ms = AsyncMultiSearch(using=es_client.client).params(
+            max_concurrent_shard_requests=settings.elastic_max_concurrent_shard_requests
+        )
+        for _, index, timestamp_field in tracked_indices:
+            s = AsyncSearch(index=index).sort(f"-{timestamp_field}")[0:1]
+            s = s.extra(track_total_hits=True).source([timestamp_field])
+            ms = ms.add(s)
+        responses = await ms.execute()
+
+        counts = {
+            activity_type: response.hits.total.value
+            for (activity_type, _, _), response in zip(tracked_indices, responses)
+        }
+        applications_count = counts["applications"]
+        dogs_count = counts["dogs"]
+        outcomes_count = counts["outcomes"]
+        medical_docs_count = counts["medical_documents"]
 
         total_documents = applications_count + dogs_count + outcomes_count + medical_docs_count
 
-        # Get recent activity (last 3 uploads for each index)
+        # Get recent activity (last upload for each index)
         recent_activity = []
-
-        # Recent applications
-        recent_apps = AsyncSearch(using=es_client.client, index=settings.applications_index)
-        recent_apps = recent_apps.sort("-submitted_at")[0:1]
-        apps_response = await recent_apps.execute()
-        if len(apps_response) > 0:
-            last_app = apps_response[0]
-            recent_activity.append({
-                "type": "applications",
-                "count": applications_count,
-                "timestamp": last_app.submitted_at if hasattr(last_app, "submitted_at") else None,
-            })
-
-        # Recent dogs
-        recent_dogs = AsyncSearch(using=es_client.client, index=settings.dogs_index)
-        recent_dogs = recent_dogs.sort("-rescue_date")[0:1]
-        dogs_response = await recent_dogs.execute()
-        if len(dogs_response) > 0:
-            last_dog = dogs_response[0]
-            recent_activity.append({
-                "type": "dogs",
-                "count": dogs_count,
-                "timestamp": last_dog.rescue_date if hasattr(last_dog, "rescue_date") else None,
-            })
-
-        # Recent outcomes
-        recent_outcomes = AsyncSearch(using=es_client.client, index=settings.outcomes_index)
-        recent_outcomes = recent_outcomes.sort("-created_at")[0:1]
-        outcomes_response = await recent_outcomes.execute()
-        if len(outcomes_response) > 0:
-            last_outcome = outcomes_response[0]
-            recent_activity.append({
-                "type": "outcomes",
-                "count": outcomes_count,
-                "timestamp": last_outcome.created_at if hasattr(last_outcome, "created_at") else None,
-            })
-
-        # Recent medical documents
-        recent_medical = AsyncSearch(using=es_client.client, index=settings.medical_documents_index)
-        recent_medical = recent_medical.sort("-upload_date")[0:1]
-        medical_response = await recent_medical.execute()
-        if len(medical_response) > 0:
-            last_medical = medical_response[0]
-            recent_activity.append({
-                "type": "medical_documents",
-                "count": medical_docs_count,
-                "timestamp": last_medical.upload_date if hasattr(last_medical, "upload_date") else None,
-            })
+        for (activity_type, _, timestamp_field), response in zip(tracked_indices, responses):
+            if len(response) > 0:
+                recent_activity.append({
+                    "type": activity_type,
+                    "count": counts[activity_type],
+                    "timestamp": getattr(response[0], timestamp_field, None),
+                })
 
         # Sort by timestamp
         recent_activity.sort(key=lambda x: x.get("timestamp") or "", reverse=True)
 
-        return {
+        return ORJSONResponse({
             "total_documents": total_documents,
             "applications_count": applications_count,
             "dogs_count": dogs_count,
@@ -406,7 +658,7 @@ async def get_index_statistics():
             "medical_documents_count": medical_docs_count,
             "recent_activity": recent_activity[:3],
             "health_status": "healthy" if total_documents > 0 else "empty",
-        }
+        })
 
     except Exception as e:
         logger.error(f"Error getting index statistics: {e}")
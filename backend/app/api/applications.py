@@ -1,61 +1,88 @@
-from fastapi import APIRouter, HTTPException, Path, Query, Body, UploadFile, File
+from fastapi import APIRouter, HTTPException, Path, Query, Body, UploadFile, File, Response
 from typing import List, Optional
 from datetime import datetime
 import uuid
+import asyncio
 import csv
+import hashlib
 import io
+from itertools import islice
 
-from app.models.schemas import ApplicationCreate, ApplicationResponse
+from app.models.schemas import ApplicationCreate, ApplicationResponse, ApplicationBatchOperation
 from app.models.es_documents import Application
 from app.services.elasticsearch_client import es_client
-from app.services.language_service import detect_language
+from app.services.language_service import detect_languages_batch
 from app.core.config import get_settings
 from app.core.logger import setup_logger
+from app.core.cache import TTLCache
+from app.core.pagination import search_page_after
 from elasticsearch.dsl import AsyncSearch, Q
+from elasticsearch.helpers import async_streaming_bulk
 
 settings = get_settings()
 router = APIRouter()
 logger = setup_logger(__name__)
 
+# CSV rows are indexed through _bulk in chunks of this many docs / bytes
+CSV_BULK_CHUNK_SIZE = 500
+CSV_BULK_MAX_CHUNK_BYTES = 5 * 1024 * 1024
 
-# 1. Create an application
-# ~~~~worked! testing done by with postman.
-@router.post("", response_model=ApplicationResponse)
-async def create_application(application: ApplicationCreate = Body(...)):
-    """Create a new foster/adoption application - FLAT structure"""
-    application_id = str(uuid.uuid4())
+# validate and preview are called back to back with the same file; both share
+# one parse of it, keyed by content hash
+CSV_PREVIEW_ROWS = 5
+CSV_HASH_CHUNK_BYTES = 1024 * 1024
+csv_inspection_cache = TTLCache(ttl=settings.csv_inspection_cache_ttl, maxsize=64)
 
-    try:
-        # Create AsyncDocument instance
-        doc = Application(meta={"id": application_id})
+# Semantic search results by (normalized query, status filter, limit); every
+# application write clears it
+semantic_search_cache = TTLCache(ttl=settings.semantic_search_cache_ttl, maxsize=1024)
 
-        # Map flat structure
-        doc.applicant_name = application.applicant_name
-        doc.phone = application.phone
-        doc.email = application.email
-        doc.gender = application.gender
-        doc.address = application.address
+# Columns an application CSV must provide
+CSV_REQUIRED_COLUMNS = ("applicant_name", "email", "phone", "housing_type", "motivation")
+CSV_REQUIRED_COLUMN_SET = frozenset(CSV_REQUIRED_COLUMNS)
 
-        doc.housing_type = application.housing_type
-        doc.has_yard = application.has_yard
-        doc.yard_size_sqm = application.yard_size_sqm
+# Accepted spellings of a true boolean in CSV cells
+CSV_TRUE_VALUES = frozenset({"true", "yes", "1"})
+CSV_TRUE_OR_EMPTY_VALUES = CSV_TRUE_VALUES | {""}
 
-        doc.family_members = application.family_members
-        doc.all_family_members_agree = application.all_family_members_agree
+# Only the fields ApplicationResponse reads are fetched from _source
+APP_FIELDS = tuple(field for field in ApplicationResponse.model_fields if field != "id")
 
-        doc.experience_level = application.experience_level
-        doc.has_other_pets = application.has_other_pets
-        doc.other_pets_description = application.other_pets_description
+# Shared search skeletons: only the fields ApplicationResponse reads, and no total
+# hit count since neither endpoint returns one. Every DSL call returns a copy, so
+# handlers build on these without mutating them
+APPLICATIONS_SEARCH = (
+    AsyncSearch(index=settings.applications_index)
+    .source(includes=list(APP_FIELDS))
+    .extra(track_total_hits=False)
+)
+LIST_APPLICATIONS_SEARCH = APPLICATIONS_SEARCH.sort("-submitted_at")
 
-        doc.motivation = application.motivation
 
-        doc.animal_applied_for = application.animal_applied_for
-        doc.status = application.status
-        doc.submitted_at = application.submitted_at or datetime.now()
+def _application_from_hit(hit: dict) -> ApplicationResponse:
+    """Build an ApplicationResponse from a raw hit; missing optional fields default to None"""
+    return ApplicationResponse.model_validate({**hit["_source"], "id": hit["_id"]})
+
+
+# 1. Create an application
+# ~~~~worked! testing done by with postman.
+@router.post("", response_model=ApplicationResponse)
+async def create_application(application: ApplicationCreate = Body(...)):
+    """Create a new foster/adoption application - FLAT structure"""
+    application_id = str(uuid.uuid4())
 
-        # Save using AsyncDocument
-        await doc.save(using=es_client.client)
+    try:
+        # Flat structure maps 1:1 onto the document; index it as a plain dict
+        document = application.model_dump()
+        document["submitted_at"] = application.submitted_at or datetime.now()
+
+        # No refresh on write: the doc is readable by ID right away and searchable
+        # after the next periodic refresh
+        await es_client.client.index(
+            index=settings.applications_index, id=application_id, document=document, refresh=False
+        )
 
+        semantic_search_cache.invalidate()
         logger.info(f"Application created with ID: {application_id}")
 
         return ApplicationResponse(id=application_id, **application.model_dump())
@@ -72,92 +99,61 @@ async def get_application(application_id: str):
     try:
         doc = await Application.get(id=application_id, using=es_client.client)
 
-        return ApplicationResponse(
-            id=application_id,
-            applicant_name=doc.applicant_name,
-            phone=doc.phone,
-            email=doc.email,
-            gender=doc.gender if hasattr(doc, "gender") else None,
-            address=doc.address if hasattr(doc, "address") else None,
-            housing_type=doc.housing_type,
-            has_yard=doc.has_yard,
-            yard_size_sqm=doc.yard_size_sqm if hasattr(doc, "yard_size_sqm") else None,
-            family_members=doc.family_members if hasattr(doc, "family_members") else None,
-            all_family_members_agree=doc.all_family_members_agree,
-            experience_level=doc.experience_level,
-            has_other_pets=doc.has_other_pets,
-            other_pets_description=(
-                doc.other_pets_description if hasattr(doc, "other_pets_description") else None
-            ),
-            motivation=doc.motivation,
-            animal_applied_for=(
-                doc.animal_applied_for if hasattr(doc, "animal_applied_for") else None
-            ),
-            status=doc.status,
-            submitted_at=doc.submitted_at if hasattr(doc, "submitted_at") else None,
-        )
+        return ApplicationResponse(id=application_id, **doc.to_dict())
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Application not found: {str(e)}")
 
 
+def _list_search(status: Optional[str], experience_level: Optional[str]) -> AsyncSearch:
+    """Newest-first application search with optional term filters, before pagination"""
+    s = LIST_APPLICATIONS_SEARCH
+
+    # Filter-only bool: nothing is scored and each term clause is cacheable
+    filters = []
+    if status:
+        filters.append(Q("term", status=status))
+    if experience_level:
+        filters.append(Q("term", experience_level=experience_level))
+    if filters:
+        s = s.query("bool", filter=filters)
+    return s
+
+
 # 3. List all applications with filters
 # ~~~~worked! testing done by with postman.
 @router.get("", response_model=List[ApplicationResponse])
 async def list_applications(
+    response: Response,
     limit: int = Query(10, ge=1, le=10000),
     offset: int = Query(0, ge=0),
     status: Optional[str] = Query(None, description="Filter by application status"),
     experience_level: Optional[str] = Query(None, description="Filter by experience level"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from X-Next-Cursor; pass an empty value to start cursor pagination",
+    ),
 ):
-    """List applications with filters and pagination"""
+    """
+    List applications with filters and pagination
+    offset/limit works for shallow pages; cursor pagination stays flat at any depth
+    """
     try:
-        s = AsyncSearch(using=es_client.client, index=settings.applications_index)
-        s = s.query("match_all")
-
-        # Add filters
-        if status:
-            s = s.filter("term", status=status)
-        if experience_level:
-            s = s.filter("term", experience_level=experience_level)
-
-        # Sort and paginate
-        s = s.sort("-submitted_at")
-        s = s[offset : offset + limit]
-
-        response = await s.execute()
-
-        applications = []
-        for hit in response:
-            applications.append(
-                ApplicationResponse(
-                    id=hit.meta.id,
-                    applicant_name=hit.applicant_name,
-                    phone=hit.phone,
-                    email=hit.email,
-                    gender=hit.gender if hasattr(hit, "gender") else None,
-                    address=hit.address if hasattr(hit, "address") else None,
-                    housing_type=hit.housing_type,
-                    has_yard=hit.has_yard,
-                    yard_size_sqm=hit.yard_size_sqm if hasattr(hit, "yard_size_sqm") else None,
-                    family_members=hit.family_members if hasattr(hit, "family_members") else None,
-                    all_family_members_agree=hit.all_family_members_agree,
-                    experience_level=hit.experience_level,
-                    has_other_pets=hit.has_other_pets,
-                    other_pets_description=(
-                        hit.other_pets_description
-                        if hasattr(hit, "other_pets_description")
-                        else None
-                    ),
-                    motivation=hit.motivation,
-                    animal_applied_for=(
-                        hit.animal_applied_for if hasattr(hit, "animal_applied_for") else None
-                    ),
-                    status=hit.status,
-                    submitted_at=hit.submitted_at if hasattr(hit, "submitted_at") else None,
-                )
+        s = _list_search(status, experience_level)
+
+        # Paginate
+        if cursor is None:
+            s = s[offset : offset + limit]
+            hits = await es_client.search_hits(settings.applications_index, s.to_dict())
+        else:
+            hits = await search_page_after(
+                s, settings.applications_index, cursor, limit, response
             )
 
+        applications = [_application_from_hit(hit) for hit in hits]
+
         return applications
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing applications: {e}")
         raise HTTPException(status_code=500, detail=f"Error listing applications: {str(e)}")
@@ -172,28 +168,16 @@ async def update_application(
 ):
     """Update an application"""
     try:
-        doc = await Application.get(id=application_id, using=es_client.client)
-
-        # Update flat structure fields
-        doc.applicant_name = application.applicant_name
-        doc.phone = application.phone
-        doc.email = application.email
-        doc.gender = application.gender
-        doc.address = application.address
-        doc.housing_type = application.housing_type
-        doc.has_yard = application.has_yard
-        doc.yard_size_sqm = application.yard_size_sqm
-        doc.family_members = application.family_members
-        doc.all_family_members_agree = application.all_family_members_agree
-        doc.experience_level = application.experience_level
-        doc.has_other_pets = application.has_other_pets
-        doc.other_pets_description = application.other_pets_description
-        doc.motivation = application.motivation
-        doc.animal_applied_for = application.animal_applied_for
-        doc.status = application.status
-
-        await doc.save(using=es_client.client)
+        # Partial update in a single request; submitted_at and the detected language
+        # stay as stored, and a missing application still fails with a 404
+        await es_client.client.update(
+            index=settings.applications_index,
+            id=application_id,
+            doc=application.model_dump(exclude={"submitted_at"}),
+            refresh=False,
+        )
 
+        semantic_search_cache.invalidate()
         logger.info(f"Application {application_id} updated successfully")
 
         return ApplicationResponse(id=application_id, **application.model_dump())
@@ -211,6 +195,7 @@ async def delete_application(application_id: str):
         doc = await Application.get(id=application_id, using=es_client.client)
         await doc.delete(using=es_client.client)
 
+        semantic_search_cache.invalidate()
         logger.info(f"Application {application_id} deleted successfully")
         return {"message": "Application deleted successfully", "application_id": application_id}
     except Exception as e:
@@ -221,6 +206,53 @@ async def delete_application(application_id: str):
 # ==================== CSV BULK UPLOAD ENDPOINTS ====================
 
 
+def _csv_text(file: UploadFile) -> io.TextIOWrapper:
+    """Wrap the uploaded file so it is decoded lazily as it is parsed"""
+    return io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+
+
+def _csv_reader(file: UploadFile) -> csv.DictReader:
+    """DictReader over the uploaded file that decodes and parses lazily"""
+    return csv.DictReader(_csv_text(file))
+
+
+def _scan_csv(file: UploadFile):
+    """
+    Stream through the uploaded CSV once without holding it in memory
+    Returns (fieldnames, preview rows, total row count)
+    """
+    reader = _csv_reader(file)
+    fieldnames = reader.fieldnames
+    preview_rows = list(islice(reader, CSV_PREVIEW_ROWS))
+    row_count = len(preview_rows) + sum(1 for _ in reader)
+    return fieldnames, preview_rows, row_count
+
+
+def _csv_digest(file: UploadFile) -> str:
+    """Hash the raw upload, then rewind it for parsing"""
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: file.file.read(CSV_HASH_CHUNK_BYTES), b""):
+        digest.update(chunk)
+    file.file.seek(0)
+    return digest.hexdigest()
+
+
+async def _inspect_csv(file: UploadFile):
+    """Scan the CSV off the event loop, reusing the result for an identical upload"""
+    digest = await asyncio.to_thread(_csv_digest, file)
+    return await csv_inspection_cache.get_or_compute(
+        digest, lambda: asyncio.to_thread(_scan_csv, file)
+    )
+
+
+def _check_columns(fieldnames: List[str]):
+    """Return (missing required columns, extra columns) for a CSV header"""
+    present = frozenset(fieldnames)
+    missing_columns = [col for col in CSV_REQUIRED_COLUMNS if col not in present]
+    extra_columns = [col for col in fieldnames if col and col not in CSV_REQUIRED_COLUMN_SET]
+    return missing_columns, extra_columns
+
+
 # STEP 2: Validate CSV file
 @router.post("/csv/validate")
 async def validate_csv(file: UploadFile = File(...)):
@@ -236,26 +268,15 @@ async def validate_csv(file: UploadFile = File(...)):
         if not file.filename.endswith(".csv"):
             raise HTTPException(status_code=400, detail="File must be a CSV file")
 
-        # Read CSV content
-        content = await file.read()
-        csv_string = content.decode("utf-8")
-        csv_reader = csv.DictReader(io.StringIO(csv_string))
-
-        # Required columns for application data (flat structure)
-        required_columns = ["applicant_name", "email", "phone", "housing_type", "motivation"]
+        # Stream through the CSV off the event loop, counting rows as we go
+        fieldnames, _, row_count = await _inspect_csv(file)
 
         # Get actual columns from CSV
-        fieldnames = csv_reader.fieldnames
         if not fieldnames:
             raise HTTPException(status_code=400, detail="CSV file is empty or has no headers")
 
         # Check for required columns
-        missing_columns = [col for col in required_columns if col not in fieldnames]
-        extra_columns = [col for col in fieldnames if col not in required_columns and col]
-
-        # Count rows
-        rows = list(csv_reader)
-        row_count = len(rows)
+        missing_columns, extra_columns = _check_columns(fieldnames)
 
         # Validation results
         validation_result = {
@@ -264,7 +285,7 @@ async def validate_csv(file: UploadFile = File(...)):
             "row_count": row_count,
             "column_count": len(fieldnames),
             "columns_found": fieldnames,
-            "required_columns": required_columns,
+            "required_columns": list(CSV_REQUIRED_COLUMNS),
             "missing_columns": missing_columns,
             "extra_columns": extra_columns,
             "errors": [],
@@ -314,33 +335,23 @@ async def preview_csv(file: UploadFile = File(...)):
     User will click "Upload & Index" button to proceed to Step 4
     """
     try:
-        # Read CSV content
-        content = await file.read()
-        csv_string = content.decode("utf-8")
+        # Usually already scanned by /csv/validate for the same file
+        fieldnames, preview_rows, row_count = await _inspect_csv(file)
 
         # Validate
-        csv_reader = csv.DictReader(io.StringIO(csv_string))
-        fieldnames = csv_reader.fieldnames
-
-        required_columns = ["applicant_name", "email", "phone", "housing_type", "motivation"]
-
-        missing_columns = [col for col in required_columns if col not in fieldnames]
-        rows = list(csv_reader)
+        missing_columns, _ = _check_columns(fieldnames or [])
 
         validation_result = {
-            "valid": len(missing_columns) == 0 and len(rows) > 0,
+            "valid": len(missing_columns) == 0 and row_count > 0,
             "filename": file.filename,
-            "row_count": len(rows),
+            "row_count": row_count,
             "missing_columns": missing_columns,
         }
 
-        # Get first 5 rows for preview
-        preview_rows = rows[:5]
-
         return {
             "validation": validation_result,
             "preview_rows": preview_rows,
-            "total_rows": len(rows),
+            "total_rows": row_count,
             "message": "Review the data below. Click 'Upload & Index' to proceed with indexing.",
         }
 
@@ -349,6 +360,49 @@ async def preview_csv(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Error previewing CSV: {str(e)}")
 
 
+def _csv_row_mapper(header: List[str], submitted_at: datetime):
+    """
+    Resolve column positions from the CSV header once and return a function
+    mapping a csv.reader row onto the flat application document
+    Every row of an upload shares the same submitted_at
+    """
+    slots = {name: idx for idx, name in enumerate(header)}
+    width = len(header)
+
+    def get(row: List[str], name: str, default=None):
+        idx = slots.get(name)
+        return default if idx is None else row[idx]
+
+    def to_source(row: List[str]) -> dict:
+        # Short rows read as empty cells for the missing trailing columns
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+
+        yard_size_sqm = get(row, "yard_size_sqm")
+        return {
+            "applicant_name": get(row, "applicant_name", ""),
+            "phone": get(row, "phone", ""),
+            "email": get(row, "email", ""),
+            "gender": get(row, "gender"),
+            "address": get(row, "address"),
+            "housing_type": get(row, "housing_type", "Unknown"),
+            "has_yard": get(row, "has_yard", "").lower() in CSV_TRUE_VALUES,
+            "yard_size_sqm": int(yard_size_sqm) if yard_size_sqm else None,
+            "family_members": get(row, "family_members"),
+            "all_family_members_agree": get(row, "all_family_members_agree", "").lower()
+            in CSV_TRUE_OR_EMPTY_VALUES,
+            "experience_level": get(row, "experience_level", "Intermediate"),
+            "has_other_pets": get(row, "has_other_pets", "").lower() in CSV_TRUE_VALUES,
+            "other_pets_description": get(row, "other_pets_description"),
+            "motivation": get(row, "motivation", ""),
+            "animal_applied_for": get(row, "animal_applied_for"),
+            "status": get(row, "status", "Pending"),
+            "submitted_at": submitted_at,
+        }
+
+    return to_source
+
+
 # STEP 4: Upload and Index CSV (requires confirmation)
 @router.post("/csv/upload")
 async def upload_and_index_csv(file: UploadFile = File(...)):
@@ -360,88 +414,136 @@ async def upload_and_index_csv(file: UploadFile = File(...)):
     Returns summary of indexed applications
     """
     try:
-        # Read and parse CSV
-        content = await file.read()
-        csv_string = content.decode("utf-8")
-        csv_reader = csv.DictReader(io.StringIO(csv_string))
-        rows = list(csv_reader)
+        # Parse the header once; rows are then read as plain lists by column position
+        reader = csv.reader(_csv_text(file))
+        header = await asyncio.to_thread(next, reader, None)
+        if not header:
+            raise HTTPException(status_code=400, detail="CSV file is empty or has no headers")
+
+        missing_columns, _ = _check_columns(header)
+        if missing_columns:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Missing required columns: {', '.join(missing_columns)}",
+            )
 
+        to_source = _csv_row_mapper(header, datetime.now())
+
+        total_rows = 0
         indexed_count = 0
         failed_count = 0
         errors = []
         indexed_ids = []
-
-        for idx, row in enumerate(rows):
-            try:
-                application_id = str(uuid.uuid4())
-
-                # Create AsyncDocument instance with flat structure
-                doc = Application(meta={"id": application_id})
-
-                # Map CSV columns to flat structure
-                doc.applicant_name = row.get("applicant_name", "")
-                doc.phone = row.get("phone", "")
-                doc.email = row.get("email", "")
-                doc.gender = row.get("gender", None)
-                doc.address = row.get("address", None)
-
-                doc.housing_type = row.get("housing_type", "Unknown")
-                doc.has_yard = row.get("has_yard", "").lower() in ["true", "yes", "1"]
-                doc.yard_size_sqm = (
-                    int(row.get("yard_size_sqm", 0)) if row.get("yard_size_sqm") else None
+        action_rows = []  # CSV row number of each action, in action order
+
+        async def generate_actions():
+            """Parse the CSV a chunk at a time off the event loop and yield bulk actions"""
+            nonlocal total_rows, failed_count
+            while True:
+                rows = await asyncio.to_thread(list, islice(reader, CSV_BULK_CHUNK_SIZE))
+                if not rows:
+                    return
+
+                # Map every row to a document; rows that can't be mapped fail here
+                sources = []
+                row_numbers = []
+                for row in rows:
+                    # Blank lines aren't rows, same as csv.DictReader
+                    if not row:
+                        continue
+                    total_rows += 1
+                    try:
+                        sources.append(to_source(row))
+                        row_numbers.append(total_rows)
+
+                    except Exception as e:
+                        failed_count += 1
+                        error_msg = f"Row {total_rows}: {str(e)}"
+                        errors.append(error_msg)
+                        logger.error(f"Error indexing row {total_rows}: {e}")
+
+                # Detect language from motivation text for the whole chunk in one thread hop
+                languages = await asyncio.to_thread(
+                    detect_languages_batch, [source["motivation"] for source in sources]
                 )
 
-                doc.family_members = row.get("family_members", None)
-                doc.all_family_members_agree = row.get("all_family_members_agree", "").lower() in [
-                    "true",
-                    "yes",
-                    "1",
-                    "",
-                ]
-
-                doc.experience_level = row.get("experience_level", "Intermediate")
-                doc.has_other_pets = row.get("has_other_pets", "").lower() in ["true", "yes", "1"]
-                doc.other_pets_description = row.get("other_pets_description", None)
-
-                doc.motivation = row.get("motivation", "")
-
-                doc.animal_applied_for = row.get("animal_applied_for", None)
-                doc.status = row.get("status", "Pending")
-                doc.submitted_at = datetime.now()
-                
-                # Detect language from motivation text
-                doc.language = await detect_language(doc.motivation)
-
-                # Save to Elasticsearch
-                await doc.save(using=es_client.client)
-
+                for source, language, row_number in zip(sources, languages, row_numbers):
+                    source["language"] = language
+                    action_rows.append(row_number)
+                    # No _id: auto-generated IDs let ES skip the per-doc "does this ID
+                    # exist" lookup; the assigned IDs come back in the bulk results
+                    yield {
+                        "_op_type": "index",
+                        "_index": settings.applications_index,
+                        "_source": source,
+                    }
+
+        # Index rows with a handful of _bulk requests as they are parsed, instead
+        # of one request per row; results come back in action order
+        position = 0
+        async for ok, item in async_streaming_bulk(
+            es_client.client,
+            generate_actions(),
+            chunk_size=CSV_BULK_CHUNK_SIZE,
+            max_chunk_bytes=CSV_BULK_MAX_CHUNK_BYTES,
+            raise_on_error=False,
+            raise_on_exception=False,
+            refresh=False,
+        ):
+            row_number = action_rows[position]
+            position += 1
+            result = item.get("index", {})
+
+            if ok:
                 indexed_count += 1
-                indexed_ids.append(application_id)
-                logger.info(f"Indexed application {application_id} from CSV row {idx + 1}")
-
-            except Exception as e:
+                indexed_ids.append(result.get("_id"))
+            else:
                 failed_count += 1
-                error_msg = f"Row {idx + 1}: {str(e)}"
-                errors.append(error_msg)
-                logger.error(f"Error indexing row {idx + 1}: {e}")
+                error = result.get("error", item)
+                errors.append(f"Row {row_number}: {error}")
+                logger.error(f"Error indexing row {row_number}: {error}")
+
+        semantic_search_cache.invalidate()
+        logger.info(f"Indexed {indexed_count} applications from CSV {file.filename}")
 
         # Return summary
         return {
             "success": True,
             "filename": file.filename,
-            "total_rows": len(rows),
+            "total_rows": total_rows,
             "indexed_count": indexed_count,
             "failed_count": failed_count,
             "indexed_ids": indexed_ids[:10],  # Return first 10 IDs
             "errors": errors[:5],  # Return first 5 errors
-            "message": f"Successfully indexed {indexed_count} out of {len(rows)} applications",
+            "message": f"Successfully indexed {indexed_count} out of {total_rows} applications",
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error uploading CSV: {e}")
         raise HTTPException(status_code=500, detail=f"Error uploading CSV: {str(e)}")
 
 
+def _semantic_search(query: str, status_filter: Optional[str]) -> AsyncSearch:
+    """Semantic search on motivation with an optional status filter, before pagination"""
+    # Build semantic search on the shared skeleton, which also keeps embeddings out of _source
+    s = APPLICATIONS_SEARCH.query("semantic", field="motivation", query=query)
+
+    # Add status filter if provided
+    if status_filter:
+        s = s.filter("term", status=status_filter)
+    return s
+
+
+async def _search_applications(query: str, limit: int, status_filter: Optional[str]):
+    """Run the semantic search against ES (embeds the query via the inference endpoint)"""
+    s = _semantic_search(query, status_filter)[0:limit]
+
+    hits = await es_client.search_hits(settings.applications_index, s.to_dict())
+    return [_application_from_hit(hit) for hit in hits]
+
+
 # Semantic Search Endpoint
 # ~~~~worked! testing done by with postman.
 @router.post("/search", response_model=List[ApplicationResponse])
@@ -453,6 +555,7 @@ async def search_applications_semantic(
     """
     Semantic search for applications using ES inference endpoint.
     Searches the motivation field using embeddings to find similar applicants.
+    Repeated queries are served from a short-lived cache.
 
     Args:
         query: Natural language search query (e.g., "experienced with anxious dogs")
@@ -460,48 +563,10 @@ async def search_applications_semantic(
         status_filter: Optional filter by application status (Pending, Approved, Rejected)
     """
     try:
-        # Build semantic search using AsyncSearch
-        s = AsyncSearch(using=es_client.client, index="applications")
-        s = s.query("semantic", field="motivation", query=query)
-
-        # Add status filter if provided
-        if status_filter:
-            s = s.filter("term", status=status_filter)
-
-        s = s[0:limit]
-
-        response = await s.execute()
-
-        applications = []
-        for hit in response:
-            applications.append(
-                ApplicationResponse(
-                    id=hit.meta.id,
-                    applicant_name=hit.applicant_name,
-                    phone=hit.phone,
-                    email=hit.email,
-                    gender=hit.gender if hasattr(hit, "gender") else None,
-                    address=hit.address if hasattr(hit, "address") else None,
-                    housing_type=hit.housing_type,
-                    has_yard=hit.has_yard,
-                    yard_size_sqm=hit.yard_size_sqm if hasattr(hit, "yard_size_sqm") else None,
-                    family_members=hit.family_members if hasattr(hit, "family_members") else None,
-                    all_family_members_agree=hit.all_family_members_agree,
-                    experience_level=hit.experience_level,
-                    has_other_pets=hit.has_other_pets,
-                    other_pets_description=(
-                        hit.other_pets_description
-                        if hasattr(hit, "other_pets_description")
-                        else None
-                    ),
-                    motivation=hit.motivation,
-                    animal_applied_for=(
-                        hit.animal_applied_for if hasattr(hit, "animal_applied_for") else None
-                    ),
-                    status=hit.status,
-                    submitted_at=hit.submitted_at if hasattr(hit, "submitted_at") else None,
-                )
-            )
+        key = (" ".join(query.lower().split()), status_filter, limit)
+        applications = await semantic_search_cache.get_or_compute(
+            key, lambda: _search_applications(query, limit, status_filter)
+        )
 
         logger.info(f"Semantic search for '{query}' returned {len(applications)} applications")
         return applications
@@ -509,3 +574,65 @@ async def search_applications_semantic(
     except Exception as e:
         logger.error(f"Error in semantic search: {e}")
         raise HTTPException(status_code=500, detail=f"Semantic search failed: {str(e)}")
+
+
+def _batch_search(operation: ApplicationBatchOperation) -> AsyncSearch:
+    """Translate one batch operation into the search its single-op endpoint would run"""
+    args = operation.args
+    if operation.op == "get":
+        return APPLICATIONS_SEARCH.query("ids", values=[str(args["id"])])[0:1]
+
+    limit = int(args.get("limit", 10))
+    if operation.op == "list":
+        offset = int(args.get("offset", 0))
+        s = _list_search(args.get("status"), args.get("experience_level"))
+        return s[offset : offset + limit]
+
+    return _semantic_search(str(args["query"]), args.get("status_filter"))[0:limit]
+
+
+# Batch reads
+@router.post("/_batch")
+async def batch_applications(operations: List[ApplicationBatchOperation] = Body(...)):
+    """
+    Run several get/list/search reads in a single _msearch round-trip to ES
+    Results come back in request order as {"op", "result"} or {"op", "error"};
+    get yields one application (or None), list and search yield lists
+    """
+    try:
+        searches = []
+        for idx, operation in enumerate(operations):
+            try:
+                body = _batch_search(operation).to_dict()
+            except (KeyError, TypeError, ValueError) as e:
+                raise HTTPException(
+                    status_code=400, detail=f"Invalid args for operation {idx}: {str(e)}"
+                )
+            searches.extend(({}, body))
+
+        if not searches:
+            return []
+
+        response = await es_client.client.msearch(
+            index=settings.applications_index, searches=searches
+        )
+
+        results = []
+        for operation, result in zip(operations, response["responses"]):
+            if "error" in result:
+                results.append({"op": operation.op, "error": result["error"]})
+                continue
+
+            applications = [_application_from_hit(hit) for hit in result["hits"]["hits"]]
+            if operation.op == "get":
+                results.append({"op": "get", "result": applications[0] if applications else None})
+            else:
+                results.append({"op": operation.op, "result": applications})
+
+        return results
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in batch read: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch read failed: {str(e)}")
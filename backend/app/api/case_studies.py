@@ -1,186 +1,282 @@
-from fastapi import APIRouter, HTTPException, Path, Query, Body
-from typing import List
+from fastapi import APIRouter, HTTPException, Path, Query, Body, Response
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional
 from datetime import datetime
 import uuid
 
 from app.models.schemas import CaseStudyResponse, CaseStudyCreate, SearchRequest
 from app.models.es_documents import CaseStudy
 from app.services.elasticsearch_client import es_client
-from app.services.elasticsearch_service import es_service
+from app.services.elasticsearch_service import es_service, case_search_cache
+from app.services.bulk_write_buffer import BulkWriteBuffer
 from app.core.config import get_settings
 from app.core.logger import setup_logger
-from elasticsearch.dsl import AsyncSearch
+from app.core.cache import TTLCache
+from app.core.pagination import search_page_after
+from elasticsearch import ConflictError, NotFoundError
+from elasticsearch.dsl import AsyncSearch, Q
+from elasticsearch.helpers import async_bulk
 
 settings = get_settings()
 router = APIRouter()
 logger = setup_logger(__name__)
 
+# Resolved once at import; settings are cached and never change at runtime
+CASE_INDEX = settings.case_studies_index
+
+# Opt-in (?buffered=true) write path for bursty creates such as imports: writes
+# arriving within 250ms are coalesced into one _bulk request
+case_study_writes = BulkWriteBuffer(flush_interval=0.25, max_batch=500)
+
+# Read caches: single case studies by ID, list pages by (filters, page); writes
+# through this router invalidate them
+case_study_cache = TTLCache(ttl=settings.case_study_cache_ttl, maxsize=1024)
+case_study_list_cache = TTLCache(ttl=settings.case_study_list_cache_ttl, maxsize=256)
+
+# List pages fetch only the fields CaseStudyResponse reads from _source
+CASE_STUDY_FIELDS = tuple(field for field in CaseStudyResponse.model_fields if field != "id")
+
+# Read paths answer with _source dicts laid over these defaults instead of
+# validating a CaseStudyResponse per hit; to_dict() drops empty fields on write
+CASE_STUDY_DEFAULTS = {
+    name: field.default
+    for name, field in CaseStudyResponse.model_fields.items()
+    if not field.is_required()
+}
+
+# Newest-first list skeleton with only the response fields and no total hit count;
+# every DSL call returns a copy, so requests build on it without mutating it
+LIST_CASE_STUDIES_SEARCH = (
+    AsyncSearch(index=CASE_INDEX)
+    .sort("-created_at")
+    .source(includes=list(CASE_STUDY_FIELDS))
+    .extra(track_total_hits=False)
+)
+
+# Upper bound on the bytes in one _bulk request from POST /bulk
+BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+
+
+def _invalidate_case_study_caches(case_id: str = None):
+    """Drop cached list pages and similar-case results, plus the changed case study"""
+    case_study_list_cache.invalidate()
+    case_search_cache.invalidate()
+    if case_id:
+        case_study_cache.invalidate(case_id)
+
 
 # 1. Create a case study
 # ~~~~worked! testing done by with postman.
 @router.post("", response_model=CaseStudyResponse)
-async def create_case_study(case: CaseStudyCreate = Body(...)):
-    """Create a new case study using AsyncDocument"""
+async def create_case_study(
+    case: CaseStudyCreate = Body(...),
+    buffered: bool = Query(False, description="Batch this write with other recent creates"),
+    refresh: bool = Query(False, description="Debug only: wait until the case study is searchable"),
+):
+    """
+    Create a new case study using AsyncDocument
+    Buffered creates are not searchable until the next refresh; call /_flush for read-after-write
+    """
     case_id = str(uuid.uuid4())
 
     try:
-        # Create AsyncDocument instance
-        doc = CaseStudy(meta={'id': case_id})
-
-        # Map all fields from Pydantic to AsyncDocument
-        doc.title = case.title
-        doc.diagnosis = case.diagnosis
-        doc.treatment_plan = case.treatment_plan
-        doc.outcome = case.outcome
-        doc.presenting_complaint = case.presenting_complaint
-        doc.clinical_history = case.clinical_history
-        doc.physical_examination = case.physical_examination
-        doc.diagnostic_tests = case.diagnostic_tests
-        doc.follow_up = case.follow_up
-        doc.learning_points = case.learning_points
-
-        # Patient info
-        doc.patient_species = case.patient_species
-        doc.patient_breed = case.patient_breed
-        doc.patient_age_years = case.patient_age_years
-        doc.patient_age_months = case.patient_age_months
-        doc.patient_age_category = case.patient_age_category
-        doc.patient_sex = case.patient_sex
-        doc.patient_weight_kg = case.patient_weight_kg
-        doc.patient_weight_category = case.patient_weight_category
-        doc.is_juvenile = case.is_juvenile
-        doc.is_geriatric = case.is_geriatric
-
-        # Organization & Location
-        doc.rescue_organization = case.rescue_organization
-        doc.organization_contact = case.organization_contact
-        doc.country = case.country
-        doc.region = case.region
-
-        # Cost & Classification
-        doc.estimated_cost = case.estimated_cost
-        doc.cost_breakdown = case.cost_breakdown
-        doc.disease_category = case.disease_category
-        doc.urgency_level = case.urgency_level
-
-        # Metadata
-        doc.tags = case.tags
-        doc.references = case.references
-        doc.visibility = case.visibility
-        doc.is_shareable = case.is_shareable
+        # Build the AsyncDocument from the Pydantic fields in one pass
+        data = case.model_dump(exclude={"date_published"}, exclude_none=True)
         if case.date_published:
-            doc.date_published = datetime.fromisoformat(case.date_published)
-
-        # Save using AsyncDocument (auto-sets created_at/updated_at)
-        await doc.save(using=es_client.client)
-
+            data["date_published"] = datetime.fromisoformat(case.date_published)
+        doc = CaseStudy(meta={'id': case_id}, **data)
+
+        if buffered:
+            # Same timestamps save() would set, then queue for the next _bulk batch
+            doc.created_at = doc.updated_at = datetime.now()
+            await case_study_writes.index(CASE_INDEX, case_id, doc.to_dict())
+        else:
+            # Save using AsyncDocument (auto-sets created_at/updated_at); searchable after
+            # the next periodic refresh unless a debug build asked to wait for it
+            await doc.save(
+                using=es_client.client,
+                refresh="wait_for" if refresh and settings.debug else False,
+            )
+
+        _invalidate_case_study_caches()
         logger.info(f"Case study created and indexed with ID: {case_id}")
 
-        # Build response from saved document
-        return CaseStudyResponse(
-            id=case_id,
-            created_at=doc.created_at.isoformat() if doc.created_at else datetime.now().isoformat(),
-            updated_at=doc.updated_at.isoformat() if doc.updated_at else datetime.now().isoformat(),
-            **case.model_dump()
-        )
+        # Build response from saved document; orjson encodes the datetimes itself
+        return ORJSONResponse({
+            **case.model_dump(),
+            "id": case_id,
+            "created_at": doc.created_at,
+            "updated_at": doc.updated_at,
+        })
     except Exception as e:
         logger.error(f"Error creating case study: {e}")
         raise HTTPException(status_code=500, detail=f"Error creating case study: {str(e)}")
 
 
+# Bulk-create case studies
+@router.post("/bulk")
+async def bulk_create_case_studies(
+    cases: List[CaseStudyCreate] = Body(...),
+    chunk_size: int = Query(500, ge=1, le=5000, description="Case studies per _bulk request"),
+):
+    """
+    Index many case studies through _bulk instead of one POST per case study
+    Returns counts only. The index refreshes every 30s while the load runs, so new (and
+    other freshly written) case studies can take that long to appear in lists and search
+    """
+    try:
+        # Build every action up front so a bad date rejects the request before anything is written
+        now = datetime.now()
+        actions = []
+        for case in cases:
+            source = case.model_dump(exclude={"date_published"})
+            if case.date_published:
+                source["date_published"] = datetime.fromisoformat(case.date_published)
+            source["created_at"] = source["updated_at"] = now
+            actions.append(
+                {
+                    "_op_type": "index",
+                    "_index": CASE_INDEX,
+                    "_id": str(uuid.uuid4()),
+                    "_source": source,
+                }
+            )
+
+        async with es_client.bulk_refresh_interval(CASE_INDEX, "30s"):
+            indexed_count, errors = await async_bulk(
+                es_client.client,
+                actions,
+                chunk_size=chunk_size,
+                max_chunk_bytes=BULK_MAX_CHUNK_BYTES,
+                raise_on_error=False,
+                refresh=False,
+                request_timeout=60,
+            )
+
+        _invalidate_case_study_caches()
+        logger.info(f"Bulk indexed {indexed_count} of {len(cases)} case studies")
+
+        return {
+            "success": True,
+            "total": len(cases),
+            "indexed_count": indexed_count,
+            "failed_count": len(errors),
+            "errors": errors[:5],  # Return first 5 errors
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid case study: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error bulk creating case studies: {e}")
+        raise HTTPException(status_code=500, detail=f"Error bulk creating case studies: {str(e)}")
+
+
+# Flush buffered creates and make them searchable
+@router.post("/_flush")
+async def flush_case_study_writes():
+    """Write any buffered case studies now and refresh the index for read-after-write"""
+    try:
+        await case_study_writes.flush()
+        await es_client.client.indices.refresh(index=CASE_INDEX)
+        _invalidate_case_study_caches()
+        return {"message": "Buffered case studies flushed"}
+    except Exception as e:
+        logger.error(f"Error flushing case studies: {e}")
+        raise HTTPException(status_code=500, detail=f"Error flushing case studies: {str(e)}")
+
+
 # 2. Get a case study by ID
 # ~~~~worked! testing done by with postman.
 @router.get("/{case_id}", response_model=CaseStudyResponse)
 async def get_case_study(case_id: str):
-    """Get a specific case study by ID using AsyncDocument.get()"""
+    """Get a specific case study by ID, served from cache when recently read"""
     try:
-        # Use AsyncDocument.get() - cleaner and more direct
-        doc = await CaseStudy.get(id=case_id, using=es_client.client)
-
-        # Convert to response model
-        return CaseStudyResponse(
-            id=case_id,
-            title=doc.title,
-            diagnosis=doc.diagnosis,
-            treatment_plan=doc.treatment_plan,
-            outcome=doc.outcome,
-            presenting_complaint=doc.presenting_complaint,
-            clinical_history=doc.clinical_history,
-            physical_examination=doc.physical_examination,
-            diagnostic_tests=doc.diagnostic_tests,
-            follow_up=doc.follow_up,
-            learning_points=doc.learning_points,
-            patient_species=doc.patient_species,
-            patient_breed=doc.patient_breed,
-            patient_age_years=doc.patient_age_years,
-            patient_age_months=doc.patient_age_months,
-            patient_age_category=doc.patient_age_category,
-            patient_sex=doc.patient_sex,
-            patient_weight_kg=doc.patient_weight_kg,
-            patient_weight_category=doc.patient_weight_category,
-            is_juvenile=doc.is_juvenile,
-            is_geriatric=doc.is_geriatric,
-            rescue_organization=doc.rescue_organization,
-            organization_contact=doc.organization_contact,
-            country=doc.country,
-            region=doc.region,
-            estimated_cost=doc.estimated_cost,
-            cost_breakdown=doc.cost_breakdown,
-            disease_category=doc.disease_category,
-            urgency_level=doc.urgency_level,
-            tags=doc.tags or [],
-            references=doc.references,
-            visibility=doc.visibility,
-            is_shareable=doc.is_shareable,
-            date_published=doc.date_published.isoformat() if doc.date_published else None,
-            created_at=doc.created_at.isoformat() if doc.created_at else None,
-            updated_at=doc.updated_at.isoformat() if doc.updated_at else None,
-        )
+        case = await case_study_cache.get_or_compute(case_id, lambda: _fetch_case_study(case_id))
+        return ORJSONResponse(case)
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail=f"Case study not found: {case_id}")
     except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Case study not found: {str(e)}")
+        logger.error(f"Error getting case study {case_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error getting case study: {str(e)}")
+
+
+async def _fetch_case_study(case_id: str) -> dict:
+    """Get a specific case study by ID, as stored (dates are already ISO strings)"""
+    doc = await es_client.client.get(
+        index=CASE_INDEX, id=case_id, source_includes=list(CASE_STUDY_FIELDS)
+    )
+    return {**CASE_STUDY_DEFAULTS, **doc["_source"], "id": case_id}
 
 
 # 3. List all case studies
 # ~~~~worked! testing done by with postman.
 @router.get("", response_model=List[CaseStudyResponse])
 async def list_case_studies(
+    response: Response,
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
     urgency_level: str = Query(None, description="Filter by urgency level"),
     country: str = Query(None, description="Filter by country"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from X-Next-Cursor; pass an empty value to start cursor pagination",
+    ),
 ):
-    """List case studies with filters and pagination using AsyncSearch"""
+    """
+    List case studies with filters and pagination
+    offset/limit pages are served from cache when recently read; cursor pagination
+    stays flat at any depth and always goes to Elasticsearch
+    """
     try:
-        # Build AsyncSearch query
-        s = AsyncSearch(using=es_client.client, index=settings.case_studies_index)
-        s = s.query("match_all")
+        s = _list_search(urgency_level, country)
+
+        if cursor is not None:
+            hits = await search_page_after(
+                s, CASE_INDEX, cursor, limit, response
+            )
+            cases = _case_studies_from_hits(hits)
+        else:
+            key = (urgency_level, country, offset, limit)
+            cases = await case_study_list_cache.get_or_compute(
+                key, lambda: _list_case_studies(s, limit, offset)
+            )
+
+        # Already in response shape, so skip response_model re-validation; the cursor
+        # header set on response is carried over
+        return ORJSONResponse(cases, headers=response.headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error listing case studies: {e}")
+        raise HTTPException(status_code=500, detail=f"Error listing case studies: {str(e)}")
 
-        # Add filters if provided
-        if urgency_level:
-            s = s.filter("term", urgency_level=urgency_level)
-        if country:
-            s = s.filter("term", country=country)
 
-        # Sort by created_at descending
-        s = s.sort("-created_at")
+def _list_search(urgency_level: str, country: str) -> AsyncSearch:
+    """Newest-first case study search with optional term filters, before pagination"""
+    s = LIST_CASE_STUDIES_SEARCH
 
-        # Pagination
-        s = s[offset:offset + limit]
+    # Add filters if provided, as a filter-only bool (no scoring, cacheable clauses)
+    filters = []
+    if urgency_level:
+        filters.append(Q("term", urgency_level=urgency_level))
+    if country:
+        filters.append(Q("term", country=country))
+    if filters:
+        s = s.query("bool", filter=filters)
+    return s
 
-        response = await s.execute()
 
-        cases = []
-        for hit in response:
-            case_data = hit.to_dict()
-            # Add id from meta if not in the document
-            if "id" not in case_data:
-                case_data["id"] = hit.meta.id
-            cases.append(CaseStudyResponse(**case_data))
+async def _list_case_studies(s: AsyncSearch, limit: int, offset: int) -> List[dict]:
+    """Fetch one offset/limit page of s"""
+    s = s[offset:offset + limit]
+
+    # Only _id and _source come back over the wire
+    hits = await es_client.search_hits(CASE_INDEX, s.to_dict())
+    return _case_studies_from_hits(hits)
 
-        return cases
-    except Exception as e:
-        logger.error(f"Error listing case studies: {e}")
-        raise HTTPException(status_code=500, detail=f"Error listing case studies: {str(e)}")
+
+def _case_studies_from_hits(hits: List[dict]) -> List[dict]:
+    """Build response dicts from raw hits"""
+    return [{**CASE_STUDY_DEFAULTS, **hit["_source"], "id": hit["_id"]} for hit in hits]
 
 
 # 4. Update a case study
@@ -189,77 +285,59 @@ async def update_case_study(
     case_id: str,
     case: CaseStudyCreate = Body(...),
 ):
-    """Update a case study using AsyncDocument.update()"""
+    """Replace a case study's fields with a single update call"""
     try:
-        # Get the existing document
-        doc = await CaseStudy.get(id=case_id, using=es_client.client)
-
-        # Update all fields
-        doc.title = case.title
-        doc.diagnosis = case.diagnosis
-        doc.treatment_plan = case.treatment_plan
-        doc.outcome = case.outcome
-        doc.presenting_complaint = case.presenting_complaint
-        doc.clinical_history = case.clinical_history
-        doc.physical_examination = case.physical_examination
-        doc.diagnostic_tests = case.diagnostic_tests
-        doc.follow_up = case.follow_up
-        doc.learning_points = case.learning_points
-        doc.patient_species = case.patient_species
-        doc.patient_breed = case.patient_breed
-        doc.patient_age_years = case.patient_age_years
-        doc.patient_age_months = case.patient_age_months
-        doc.patient_age_category = case.patient_age_category
-        doc.patient_sex = case.patient_sex
-        doc.patient_weight_kg = case.patient_weight_kg
-        doc.patient_weight_category = case.patient_weight_category
-        doc.is_juvenile = case.is_juvenile
-        doc.is_geriatric = case.is_geriatric
-        doc.rescue_organization = case.rescue_organization
-        doc.organization_contact = case.organization_contact
-        doc.country = case.country
-        doc.region = case.region
-        doc.estimated_cost = case.estimated_cost
-        doc.cost_breakdown = case.cost_breakdown
-        doc.disease_category = case.disease_category
-        doc.urgency_level = case.urgency_level
-        doc.tags = case.tags
-        doc.references = case.references
-        doc.visibility = case.visibility
-        doc.is_shareable = case.is_shareable
-        if case.date_published:
-            doc.date_published = datetime.fromisoformat(case.date_published)
+        # One update instead of get + save: ES merges the fields server-side and hands
+        # back the stored document for the response. Every model field is sent, nulls
+        # included, so PUT still replaces the case study and null clears a field
+        document = case.model_dump(exclude={"date_published"})
+        document["date_published"] = (
+            datetime.fromisoformat(case.date_published) if case.date_published else None
+        )
+        document["updated_at"] = datetime.now()
 
-        # Save updates (auto-updates updated_at timestamp)
-        await doc.save(using=es_client.client)
+        result = await es_client.client.update(
+            index=CASE_INDEX,
+            id=case_id,
+            doc=document,
+            source_includes=list(CASE_STUDY_FIELDS),
+            refresh=False,
+        )
+        stored = result["get"]["_source"]
 
+        _invalidate_case_study_caches(case_id)
         logger.info(f"Case study {case_id} updated successfully")
 
-        return CaseStudyResponse(
-            id=case_id,
-            created_at=doc.created_at.isoformat() if doc.created_at else None,
-            updated_at=doc.updated_at.isoformat() if doc.updated_at else None,
-            **case.model_dump()
+        return CaseStudyResponse(**{**CASE_STUDY_DEFAULTS, **stored, "id": case_id})
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail=f"Case study not found: {case_id}")
+    except ConflictError:
+        raise HTTPException(
+            status_code=409, detail=f"Case study {case_id} was modified concurrently, retry"
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid case study: {str(e)}")
     except Exception as e:
         logger.error(f"Error updating case study: {e}")
-        raise HTTPException(status_code=404, detail=f"Case study not found: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error updating case study: {str(e)}")
 
 
 # 5. Delete a case study
 @router.delete("/{case_id}")
 async def delete_case_study(case_id: str):
-    """Delete a case study using AsyncDocument.delete()"""
+    """Delete a case study"""
     try:
-        # Get and delete the document
-        doc = await CaseStudy.get(id=case_id, using=es_client.client)
-        await doc.delete(using=es_client.client)
+        # Delete directly; a missing case study raises NotFoundError -> 404
+        await es_client.client.delete(index=CASE_INDEX, id=case_id)
 
+        _invalidate_case_study_caches(case_id)
         logger.info(f"Case study {case_id} deleted successfully")
         return {"message": "Case study deleted successfully", "case_id": case_id}
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail=f"Case study not found: {case_id}")
     except Exception as e:
         logger.error(f"Error deleting case study: {e}")
-        raise HTTPException(status_code=404, detail=f"Case study not found: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error deleting case study: {str(e)}")
 
 
 # 6. Search case studies
@@ -271,10 +349,7 @@ async def search_similar_cases(
     size: int = Query(5, ge=1, le=20),
 ):
     """Search for similar cases using vector search"""
-    cases = await es_service.vector_search_cases(symptoms, size)
-
-    # Filter by species
-    cases = [c for c in cases if c.get("species", "dog") == species]
+    cases = await es_service.vector_search_cases(symptoms, size, species=species)
 
     return {
         "query_symptoms": symptoms,
@@ -1,31 +1,239 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from app.services.matching_service import matching_service
-from app.services.vertex_gemini_service import vertex_gemini_service
+from app.services.vertex_gemini_service import vertex_gemini_service, GENERATE_RESPONSE_FALLBACK
+from app.services.response_cache import gemini_response_cache
+from app.services.chat_history_writer import chat_history_writer
 from app.services.storage_service import storage_service
 from app.core.agent import agent
 from app.models.schemas import ChatRequest, AnalyzeApplicationRequest
+from app.core.config import get_settings
 from app.core.logger import setup_logger
+from app.core.cache import TTLCache
+from typing import Optional, Tuple
+import asyncio
+import hashlib
+import orjson
+import re
 import uuid
 import time
 
+settings = get_settings()
 router = APIRouter()
 logger = setup_logger(__name__)
 
+# Detected intents keyed by SHA-256 of the normalized message: exact repeats skip
+# the Gemini intent call. Hit/miss counts are reported in the trace
+intent_cache = TTLCache(ttl=settings.intent_cache_ttl, maxsize=10000)
+intent_cache_stats = {"hits": 0, "misses": 0}
+
+# Applicant detail replies keyed by SHA-256 of the question and the applicant's data,
+# so asking again about the same applicant returns without a Gemini call
+applicant_details_cache = TTLCache(ttl=settings.applicant_details_cache_ttl, maxsize=1000)
+
+# Trace label and details for each way the intent can be decided
+INTENT_TRACE = {
+    "local": ("Local Intent Rules", "keyword rules"),
+    "cached": ("Cached Intent Detection", "exact-match cache"),
+    "gemini": ("Gemini Intent Detection", "gemini-1.5-flash"),
+}
+
+
+def _keyword_pattern(keywords) -> "re.Pattern[str]":
+    """One case-insensitive alternation regex matching any of the keywords as a substring"""
+    # Sorted so the pattern doesn't depend on set iteration order
+    return re.compile("|".join(re.escape(keyword) for keyword in sorted(keywords)), re.IGNORECASE)
+
+
+# Keyword routing checks, compiled once instead of scanning a keyword list per request
+SIMILARITY_QUERY_KEYWORDS = frozenset({
+    "similar", "like", "find", "search", "best", "who are", "show me adopters"
+})
+APPLICANT_DETAILS_KEYWORDS = frozenset({
+    "details", "tell me about", "more about", "show me details",
+    "give me information", "what about", "information about"
+})
+DOG_QUERY_KEYWORDS = frozenset({
+    "tell me about",
+    "show me",
+    "dog profile",
+    "medical history",
+    "similar cases",
+    "find similar",
+    "like this",
+    "dog_",  # Match dog_001, dog_002, etc.
+})
+SIMILARITY_QUERY_PATTERN = _keyword_pattern(SIMILARITY_QUERY_KEYWORDS)
+APPLICANT_DETAILS_PATTERN = _keyword_pattern(APPLICANT_DETAILS_KEYWORDS)
+DOG_QUERY_PATTERN = _keyword_pattern(DOG_QUERY_KEYWORDS)
+
+# Words for matching applicant names against a message
+WORD_PATTERN = re.compile(r"\w+")
+
+# Intents answered by a search service rather than the general Gemini reply
+SEARCH_INTENTS = frozenset({"find_adopters", "analyze_application"})
+
+# Unambiguous messages are classified locally instead of with a Gemini call. Adopter
+# searches always go to Gemini, which also extracts their filters, so any mention of
+# adopters/applicants/matches defers to it
+LOCAL_INTENT_PATTERNS = {
+    "analyze_application": re.compile(r"\banaly[sz]e\b.*\bapplication\b", re.I | re.S),
+    "dog_info": re.compile(r"\bdog_\d+\b|\bdog profile\b|\bmedical history\b", re.I),
+}
+ADOPTER_SEARCH_PATTERN = re.compile(r"\b(?:adopters?|applicants?|matches)\b", re.I)
+
+
+def _local_intent(message: str):
+    """Intent from the local rules when exactly one matches, else None (ask Gemini)"""
+    if ADOPTER_SEARCH_PATTERN.search(message):
+        return None
+    matched = [
+        intent for intent, pattern in LOCAL_INTENT_PATTERNS.items() if pattern.search(message)
+    ]
+    if len(matched) != 1:
+        return None
+    return {"type": matched[0], "filters": {}}
+
+
+def _intent_cache_key(message: str) -> str:
+    return hashlib.sha256(message.lower().strip().encode()).hexdigest()
+
+
+def _cached_intent(message: str):
+    """Intent detected earlier for this exact (normalized) message, or None"""
+    intent = intent_cache.get(_intent_cache_key(message))
+    intent_cache_stats["hits" if intent is not None else "misses"] += 1
+    return intent
+
+
+async def _detect_intent(message: str):
+    """
+    Gemini intent detection
+    Not served from the semantic cache: searches differing only in breed, size or
+    direction embed almost identically but need different filters. Exact repeats are
+    answered by intent_cache instead
+    """
+    intent = await vertex_gemini_service.detect_intent(message)
+    # Keyword fallbacks after a Gemini error or bad JSON carry no limit; don't keep them
+    if _is_detected_intent(intent):
+        intent_cache.set(_intent_cache_key(message), intent)
+    return intent
+
+
+def _applicant_details(message: str, applicant: dict):
+    """Gemini applicant details, reused for a repeat of the same question and data"""
+    key = hashlib.sha256(
+        message.lower().strip().encode() + orjson.dumps(applicant, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+    return applicant_details_cache.get_or_compute(
+        key,
+        lambda: vertex_gemini_service.generate_applicant_details(
+            query=message, applicant_data=applicant
+        ),
+    )
+
+
+def _is_detected_intent(intent: dict) -> bool:
+    """False for the keyword fallback detect_intent returns when Gemini fails"""
+    return "limit" in intent
+
+
+def _general_reply(request: ChatRequest):
+    """General Gemini reply; shared through the semantic cache when only the message matters"""
+    generate = lambda: vertex_gemini_service.generate_response(
+        prompt=request.message, context=request.context
+    )
+    # Replies grounded in per-session context (applicants, dogs in view) aren't shared
+    if set(request.context or {}) - {"session_id"}:
+        return generate()
+    return gemini_response_cache.get_or_generate(
+        "generate_response",
+        request.message,
+        generate,
+        should_store=lambda reply: reply != GENERATE_RESPONSE_FALLBACK,
+    )
+
+
+def _find_applicant(message: str, applicants_data: list):
+    """
+    First applicant (in list order) with a name word of 3+ letters that appears as a
+    word in the message; one pass to index the names, then one lookup per message word
+    """
+    name_index = {}
+    for position, applicant in enumerate(applicants_data):
+        for token in WORD_PATTERN.findall(applicant.get("applicant_name", "").lower()):
+            if len(token) > 2:
+                name_index.setdefault(token, position)
+
+    positions = [
+        name_index[token]
+        for token in set(WORD_PATTERN.findall(message.lower()))
+        if token in name_index
+    ]
+    return applicants_data[min(positions)] if positions else None
+
+
+def _elapsed_ms(start_ns: int) -> int:
+    """Whole milliseconds since a time.perf_counter_ns() reading"""
+    return (time.perf_counter_ns() - start_ns) // 1_000_000
+
+
+def _intent_step(intent: dict, intent_source: str, duration: int) -> dict:
+    """Trace step for intent detection"""
+    intent_label, intent_details = INTENT_TRACE[intent_source]
+    return {
+        "id": "intent",
+        "label": intent_label,
+        "status": "complete",
+        "duration": duration,
+        "details": intent_details,
+        "data": {
+            "detected_intent": intent["type"],
+            "confidence": 0.95,
+            "filters": intent.get("filters", {}),
+            "intent_cache": dict(intent_cache_stats),
+        },
+    }
+
+
+def _trace(trace_steps: list, start_time: int, query: str) -> dict:
+    """Trace payload returned alongside every chat response"""
+    return {
+        "steps": trace_steps,
+        "total_duration_ms": _elapsed_ms(start_time),
+        "query": query,
+    }
+
 
 # Chat Endpoints
 # Main conversational endpoint
 # ~~~~worked! testing done by with postman.
 @router.post("/message")
-async def handle_chat_message(request: ChatRequest):
+async def handle_chat_message(request: ChatRequest, background_tasks: BackgroundTasks):
     """
     Main conversational endpoint
     Determines intent and routes to appropriate service or AI agent
     Automatically saves all messages to Google Cloud Storage for history
     """
+    # Returned as a response so the matches and trace go straight to orjson instead of
+    # first being walked by FastAPI's jsonable_encoder
+    return ORJSONResponse(await _chat_reply(request, background_tasks))
+
+
+async def _chat_reply(
+    request: ChatRequest,
+    background_tasks: BackgroundTasks,
+    resolved_intent: Optional[Tuple[dict, str, int]] = None,
+) -> dict:
+    """
+    Response body for /message
+    resolved_intent is (intent, source, duration in ms) when the caller already
+    detected the intent, so it isn't looked up or counted again
+    """
     try:
         # Initialize trace data
         trace_steps = []
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
 
         # Generate or use existing session_id
         session_id = request.context.get("session_id") if request.context else None
@@ -33,59 +241,47 @@ async def handle_chat_message(request: ChatRequest):
             session_id = str(uuid.uuid4())
             logger.info(f"Generated new session ID: {session_id}")
 
-        # Save user message to GCS
-        storage_service.save_chat_message(
+        # Queue user message for GCS; written in the background
+        chat_history_writer.enqueue(
             session_id=session_id, role="user", content=request.message, metadata=request.context
         )
 
         # FIRST: Check if this is a follow-up query about a specific applicant (before intent detection)
-        message_lower = request.message.lower()
         applicants_data = request.context.get("applicants_data", []) if request.context else []
 
         logger.info(f"📋 Context has {len(applicants_data)} applicants stored")
 
         # Check if this is a similarity/search query (should be treated as find_adopters, not applicant_details)
-        is_similarity_query = any(keyword in message_lower for keyword in [
-            "similar", "like", "find", "search", "best", "who are", "show me adopters"
-        ])
+        # Only needed when there are applicants to ask about, so most messages skip the scan
+        is_similarity_query = bool(applicants_data) and (
+            SIMILARITY_QUERY_PATTERN.search(request.message) is not None
+        )
 
         # Only treat as applicant query if:
         # 1. We have applicants in context
         # 2. It's NOT a similarity/search query
         # 3. It contains keywords for viewing details
         is_applicant_query = (
-            applicants_data and
+            bool(applicants_data) and
             not is_similarity_query and
-            any(keyword in message_lower for keyword in [
-                "details", "tell me about", "more about", "show me details",
-                "give me information", "what about", "information about"
-            ])
+            APPLICANT_DETAILS_PATTERN.search(request.message) is not None
         )
 
         logger.info(f"🔍 Is similarity query: {is_similarity_query}, Is applicant query: {is_applicant_query}")
 
         if is_applicant_query:
             # Extract applicant name from the message
-            found_applicant = None
             logger.info(f"🔎 Searching for applicant in message: {request.message}")
-            for applicant in applicants_data:
-                applicant_name = applicant.get("applicant_name", "")
-                # Check if any part of the name is in the message
-                name_parts = applicant_name.lower().split()
-                if any(part in message_lower for part in name_parts if len(part) > 2):
-                    found_applicant = applicant
-                    logger.info(f"✅ Found applicant: {applicant_name}")
-                    break
+            found_applicant = _find_applicant(request.message, applicants_data)
+            if found_applicant:
+                logger.info(f"✅ Found applicant: {found_applicant.get('applicant_name', '')}")
 
             if found_applicant:
                 # Generate detailed response about the specific applicant
-                response = await vertex_gemini_service.generate_applicant_details(
-                    query=request.message,
-                    applicant_data=found_applicant
-                )
+                response = await _applicant_details(request.message, found_applicant)
 
-                # Save AI response to GCS
-                storage_service.save_chat_message(
+                # Queue AI response for GCS; the reply doesn't wait for the write
+                chat_history_writer.enqueue(
                     session_id=session_id,
                     role="assistant",
                     content=response,
@@ -101,34 +297,57 @@ async def handle_chat_message(request: ChatRequest):
             else:
                 logger.warning(f"❌ No applicant found matching the query: {request.message}")
 
-        # Detect intent using Vertex Gemini
-        intent_start = time.time()
-        intent = await vertex_gemini_service.detect_intent(request.message)
-        intent_duration = int((time.time() - intent_start) * 1000)
+        # Dog info / similar cases queries skip the general reply and go to the agent
+        is_dog_query = DOG_QUERY_PATTERN.search(request.message) is not None
 
-        trace_steps.append(
-            {
-                "id": "intent",
-                "label": "Gemini Intent Detection",
-                "status": "complete",
-                "duration": intent_duration,
-                "details": "gemini-1.5-flash",
-                "data": {
-                    "detected_intent": intent["type"],
-                    "confidence": 0.95,
-                    "filters": intent.get("filters", {}),
-                },
-            }
+        # Clear-cut messages and exact repeats skip the Gemini intent call entirely
+        intent_start = time.perf_counter_ns()
+        if resolved_intent is not None:
+            intent, intent_source, _ = resolved_intent
+        else:
+            intent, intent_source = _local_intent(request.message), "local"
+            if intent is None:
+                intent, intent_source = _cached_intent(request.message), "cached"
+            if intent is None:
+                intent_source = "gemini"
+
+        # Otherwise a non-search intent ends in a general Gemini reply, so start it
+        # alongside intent detection and cancel it if the intent turns out to be a search
+        general_task = None
+        if not is_dog_query and (intent is None or intent["type"] not in SEARCH_INTENTS):
+            gemini_start = time.perf_counter_ns()
+            general_task = asyncio.create_task(_general_reply(request))
+
+        # Detect intent using Vertex Gemini
+        if intent is None:
+            try:
+                intent = await _detect_intent(request.message)
+            except Exception:
+                if general_task:
+                    general_task.cancel()
+                raise
+        intent_duration = (
+            resolved_intent[2] if resolved_intent is not None else _elapsed_ms(intent_start)
         )
 
-        # Route based on intent type
-        if intent["type"] == "find_adopters":
+        if general_task and intent["type"] in SEARCH_INTENTS:
+            general_task.cancel()
+
+        trace_steps.append(_intent_step(intent, intent_source, intent_duration))
+
+        # Route based on intent type; any other intent is a dog query for the agent
+        # with tools or a general reply
+        route = intent["type"]
+        if route not in SEARCH_INTENTS:
+            route = "dog_info_with_tools" if is_dog_query else "general"
+
+        if route == "find_adopters":
             # Use matching service for adopter search
-            search_start = time.time()
+            search_start = time.perf_counter_ns()
             search_results = await matching_service.find_adopters(
                 query=request.message, filters=intent.get("filters"), limit=intent.get("limit")
             )
-            search_duration = int((time.time() - search_start) * 1000)
+            search_duration = _elapsed_ms(search_start)
 
             # Add trace step for Elasticsearch search
             trace_steps.append(
@@ -150,11 +369,11 @@ async def handle_chat_message(request: ChatRequest):
             )
 
             # Let Gemini format the results into natural language
-            format_start = time.time()
+            format_start = time.perf_counter_ns()
             formatted_text = await vertex_gemini_service.format_search_results(
                 query=request.message, search_results=search_results, search_type="adopters"
             )
-            format_duration = int((time.time() - format_start) * 1000)
+            format_duration = _elapsed_ms(format_start)
 
             trace_steps.append(
                 {
@@ -170,46 +389,43 @@ async def handle_chat_message(request: ChatRequest):
                 }
             )
 
-            # Save AI response to GCS with full matches data
+            # Matches are stored once under a query_id (after the response is sent);
+            # the chat history message only refers to them
             matches_data = search_results.get("hits", [])
-            logger.info(f"Saving {len(matches_data)} matches to session {session_id}")
-            logger.info(f"First match sample: {matches_data[0] if matches_data else 'None'}")
+            query_id = uuid.uuid4().hex
+            logger.info(f"Saving {len(matches_data)} matches as {query_id} for session {session_id}")
+            background_tasks.add_task(storage_service.upload_search_results, query_id, matches_data)
 
-            storage_service.save_chat_message(
+            chat_history_writer.enqueue(
                 session_id=session_id,
                 role="assistant",
                 content=formatted_text,
                 intent=intent["type"],
                 metadata={
                     "total_matches": len(matches_data),
-                    "matches": matches_data,  # Save the actual match data
+                    "matches_ref": query_id,
                 },
             )
 
-            total_duration = int((time.time() - start_time) * 1000)
-
             return {
                 "success": True,
                 "intent": intent["type"],
                 "session_id": session_id,
+                "query_id": query_id,
                 "response": {
                     "text": formatted_text,  # Gemini's natural language response
-                    "matches": search_results.get("hits", []),  # Structured data for cards
-                    "total": len(search_results.get("hits", [])),
+                    "matches": matches_data,  # Structured data for cards
+                    "total": len(matches_data),
                     "query_time_ms": search_results.get("took", 0),
                 },
-                "trace": {
-                    "steps": trace_steps,
-                    "total_duration_ms": total_duration,
-                    "query": request.message,
-                },
+                "trace": _trace(trace_steps, start_time, request.message),
             }
 
-        elif intent["type"] == "analyze_application":
+        elif route == "analyze_application":
             # Use matching service for application analysis
-            analysis_start = time.time()
+            analysis_start = time.perf_counter_ns()
             result = await matching_service.analyze_application(request.message)
-            analysis_duration = int((time.time() - analysis_start) * 1000)
+            analysis_duration = _elapsed_ms(analysis_start)
 
             trace_steps.append(
                 {
@@ -230,7 +446,7 @@ async def handle_chat_message(request: ChatRequest):
             formatted_text = result.get("formatted_summary", "Application analysis completed")
 
             # Save AI response to GCS with full analysis data
-            storage_service.save_chat_message(
+            chat_history_writer.enqueue(
                 session_id=session_id,
                 role="assistant",
                 content=formatted_text,  # Save formatted summary as content
@@ -240,8 +456,6 @@ async def handle_chat_message(request: ChatRequest):
                 },
             )
 
-            total_duration = int((time.time() - start_time) * 1000)
-
             return {
                 "success": True,
                 "intent": intent["type"],
@@ -250,129 +464,221 @@ async def handle_chat_message(request: ChatRequest):
                     "text": formatted_text,  # Return formatted summary as main text
                     "analysis": result,  # Keep full analysis for optional use
                 },
-                "trace": {
-                    "steps": trace_steps,
-                    "total_duration_ms": total_duration,
-                    "query": request.message,
-                },
+                "trace": _trace(trace_steps, start_time, request.message),
             }
 
-        else:
-            # Check if this is a dog info query or similar cases query
-            message_lower = request.message.lower()
-            is_dog_query = any(
-                keyword in message_lower
-                for keyword in [
-                    "tell me about",
-                    "show me",
-                    "dog profile",
-                    "medical history",
-                    "similar cases",
-                    "find similar",
-                    "like this",
-                    "dog_",  # Match dog_001, dog_002, etc.
-                ]
+        elif route == "dog_info_with_tools":
+            # Use AI agent with tools for dog info and similar cases
+            session_id = (
+                request.context.get("session_id", "default") if request.context else "default"
             )
+            agent_start = time.perf_counter_ns()
+            result = await agent.chat(
+                user_message=request.message,
+                session_id=session_id,
+                context=request.context,
+            )
+            agent_duration = _elapsed_ms(agent_start)
 
-            if is_dog_query:
-                # Use AI agent with tools for dog info and similar cases
-                session_id = (
-                    request.context.get("session_id", "default") if request.context else "default"
-                )
-                agent_start = time.time()
-                result = await agent.chat(
-                    user_message=request.message,
-                    session_id=session_id,
-                    context=request.context,
-                )
-                agent_duration = int((time.time() - agent_start) * 1000)
-
-                trace_steps.append(
-                    {
-                        "id": "agent-tools",
-                        "label": "Gemini Agent with Tools",
-                        "status": "complete",
-                        "duration": agent_duration,
-                        "details": "gemini-1.5-pro with function calling",
-                        "data": {
-                            "tools_used": result.get(
-                                "tools_used", ["get_dog_profile", "search_similar_cases"]
-                            ),
-                            "response_length": len(str(result["response"])),
-                        },
-                    }
-                )
-
-                # Save AI response to GCS with tools metadata
-                storage_service.save_chat_message(
-                    session_id=session_id,
-                    role="assistant",
-                    content=str(result["response"]),
-                    intent="dog_info_with_tools",
-                    metadata={
-                        "tools_used": result.get("tools_used", []),
-                        "response_type": "agent_with_tools",
+            trace_steps.append(
+                {
+                    "id": "agent-tools",
+                    "label": "Gemini Agent with Tools",
+                    "status": "complete",
+                    "duration": agent_duration,
+                    "details": "gemini-1.5-pro with function calling",
+                    "data": {
+                        "tools_used": result.get(
+                            "tools_used", ["get_dog_profile", "search_similar_cases"]
+                        ),
+                        "response_length": len(str(result["response"])),
                     },
-                )
+                }
+            )
 
-                total_duration = int((time.time() - start_time) * 1000)
+            # Save AI response to GCS with tools metadata
+            chat_history_writer.enqueue(
+                session_id=session_id,
+                role="assistant",
+                content=str(result["response"]),
+                intent="dog_info_with_tools",
+                metadata={
+                    "tools_used": result.get("tools_used", []),
+                    "response_type": "agent_with_tools",
+                },
+            )
 
-                return {
-                    "success": True,
-                    "intent": "dog_info_with_tools",
-                    "response": result["response"],
-                    "session_id": session_id,
-                    "trace": {
-                        "steps": trace_steps,
-                        "total_duration_ms": total_duration,
-                        "query": request.message,
-                    },
+            return {
+                "success": True,
+                "intent": "dog_info_with_tools",
+                "response": result["response"],
+                "session_id": session_id,
+                "trace": _trace(trace_steps, start_time, request.message),
+            }
+        else:
+            # General question - basic Gemini reply, already started above
+            result = await general_task
+            gemini_duration = _elapsed_ms(gemini_start)
+
+            trace_steps.append(
+                {
+                    "id": "gemini-generate",
+                    "label": "Gemini Response Generation",
+                    "status": "complete",
+                    "duration": gemini_duration,
+                    "details": "gemini-1.5-flash",
+                    "data": {"response_length": len(result)},
                 }
-            else:
-                # General question - use basic Gemini
-                gemini_start = time.time()
-                result = await vertex_gemini_service.generate_response(
-                    prompt=request.message, context=request.context
-                )
-                gemini_duration = int((time.time() - gemini_start) * 1000)
-
-                trace_steps.append(
-                    {
-                        "id": "gemini-generate",
-                        "label": "Gemini Response Generation",
-                        "status": "complete",
-                        "duration": gemini_duration,
-                        "details": "gemini-1.5-flash",
-                        "data": {"response_length": len(result)},
-                    }
-                )
+            )
 
-                # Save AI response to GCS with minimal metadata
-                storage_service.save_chat_message(
-                    session_id=session_id,
-                    role="assistant",
-                    content=result,
-                    intent="general",
-                    metadata={"response_type": "general_gemini"},
-                )
+            # Save AI response to GCS with minimal metadata
+            chat_history_writer.enqueue(
+                session_id=session_id,
+                role="assistant",
+                content=result,
+                intent="general",
+                metadata={"response_type": "general_gemini"},
+            )
 
-                total_duration = int((time.time() - start_time) * 1000)
+            return {
+                "success": True,
+                "intent": "general",
+                "session_id": session_id,
+                "response": result,
+                "trace": _trace(trace_steps, start_time, request.message),
+            }
 
-                return {
-                    "success": True,
-                    "intent": "general",
-                    "session_id": session_id,
-                    "response": result,
-                    "trace": {
-                        "steps": trace_steps,
-                        "total_duration_ms": total_duration,
-                        "query": request.message,
-                    },
-                }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _sse(event: str, data) -> bytes:
+    """One Server-Sent Events frame with a JSON payload"""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+# Proxies and browsers must pass each event frame on as soon as it's written
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _single_event(response: dict) -> StreamingResponse:
+    """A complete /message response sent as the stream's only event"""
 
+    async def frames():
+        yield _sse("message", response)
+
+    return StreamingResponse(frames(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+async def _general_reply_frames(
+    request: ChatRequest, session_id: str, trace_steps: list, start_time: int
+):
+    """Token events for a general Gemini reply, then a done event with the trace"""
+    gemini_start = time.perf_counter_ns()
+    cacheable = not set(request.context or {}) - {"session_id"}
+    cached = (
+        await gemini_response_cache.get("generate_response", request.message)
+        if cacheable else None
+    )
+
+    if cached is not None:
+        chunks = [cached]
+        yield _sse("token", {"text": cached})
+    else:
+        chunks = []
+        async for chunk in vertex_gemini_service.generate_response_stream(
+            prompt=request.message, context=request.context
+        ):
+            chunks.append(chunk)
+            yield _sse("token", {"text": chunk})
+
+    result = "".join(chunks).strip()
+    if cached is None and cacheable and result != GENERATE_RESPONSE_FALLBACK:
+        await gemini_response_cache.put("generate_response", request.message, result)
+
+    trace_steps.append(
+        {
+            "id": "gemini-generate",
+            "label": "Gemini Response Generation",
+            "status": "complete",
+            "duration": _elapsed_ms(gemini_start),
+            "details": "gemini-1.5-flash (streamed)",
+            "data": {"response_length": len(result)},
+        }
+    )
+
+    # Save the complete AI response to GCS once the stream has ended
+    chat_history_writer.enqueue(
+        session_id=session_id,
+        role="assistant",
+        content=result,
+        intent="general",
+        metadata={"response_type": "general_gemini"},
+    )
+
+    yield _sse(
+        "done",
+        {
+            "success": True,
+            "intent": "general",
+            "session_id": session_id,
+            "trace": _trace(trace_steps, start_time, request.message),
+        },
+    )
+
+
+@router.post("/message/stream")
+async def stream_chat_message(request: ChatRequest, background_tasks: BackgroundTasks):
+    """
+    Server-Sent Events version of /message
+    General replies stream as token events while Gemini writes them, followed by a done
+    event; every other intent sends its /message response as a single message event
+    """
+    # Applicant follow-ups and dog queries are answered as a whole, as /message does
+    applicants_data = request.context.get("applicants_data") if request.context else None
+    if applicants_data or DOG_QUERY_PATTERN.search(request.message):
+        return _single_event(await _chat_reply(request, background_tasks))
+
+    try:
+        trace_steps = []
+        start_time = time.perf_counter_ns()
+
+        intent_start = time.perf_counter_ns()
+        intent, intent_source = _local_intent(request.message), "local"
+        if intent is None:
+            intent, intent_source = _cached_intent(request.message), "cached"
+        if intent is None:
+            intent, intent_source = await _detect_intent(request.message), "gemini"
+        intent_duration = _elapsed_ms(intent_start)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    # Searches return structured results rather than text; answered as /message does,
+    # with the intent resolved here
+    if intent["type"] in SEARCH_INTENTS:
+        return _single_event(
+            await _chat_reply(
+                request, background_tasks, (intent, intent_source, intent_duration)
+            )
+        )
+
+    session_id = request.context.get("session_id") if request.context else None
+    if not session_id:
+        session_id = str(uuid.uuid4())
+        logger.info(f"Generated new session ID: {session_id}")
+
+    # Queue user message for GCS; written in the background
+    chat_history_writer.enqueue(
+        session_id=session_id, role="user", content=request.message, metadata=request.context
+    )
+    trace_steps.append(_intent_step(intent, intent_source, intent_duration))
+
+    return StreamingResponse(
+        _general_reply_frames(request, session_id, trace_steps, start_time),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
 
 # Analyze Adoption Application
 # ~~~~worked! testing done by with postman.
@@ -384,12 +690,12 @@ async def analyze_application(request: AnalyzeApplicationRequest):
     """
     try:
         trace_steps = []
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
 
         # Analyze application
-        analysis_start = time.time()
+        analysis_start = time.perf_counter_ns()
         analysis = await matching_service.analyze_application(request.application_text)
-        analysis_duration = int((time.time() - analysis_start) * 1000)
+        analysis_duration = _elapsed_ms(analysis_start)
 
         trace_steps.append(
             {
@@ -441,7 +747,6 @@ async def analyze_application(request: AnalyzeApplicationRequest):
             }
         )
 
-        total_duration = int((time.time() - start_time) * 1000)
 
         # Get formatted summary text
         formatted_text = analysis.get("formatted_summary", "Application analysis completed")
@@ -450,11 +755,7 @@ async def analyze_application(request: AnalyzeApplicationRequest):
             "success": True,
             "text": formatted_text,  # Return formatted summary as main text
             "analysis": analysis,  # Keep full analysis for optional use
-            "trace": {
-                "steps": trace_steps,
-                "total_duration_ms": total_duration,
-                "query": request.application_text[:100] + "...",
-            },
+            "trace": _trace(trace_steps, start_time, request.application_text[:100] + "..."),
         }
 
     except Exception as e:
@@ -464,13 +765,18 @@ async def analyze_application(request: AnalyzeApplicationRequest):
 @router.get("/search-insights/{query_id}")
 async def get_search_insights(query_id: str):
     """
-    Get Elasticsearch query details for visualization
+    Get the matches stored for an adopter search
+    query_id is returned by /message and referenced from chat history metadata
     """
-    # TODO: Implement query caching and retrieval
+    matches = await asyncio.to_thread(storage_service.get_search_results, query_id)
+    if matches is None:
+        raise HTTPException(status_code=404, detail=f"Search results not found: {query_id}")
+
     return {
         "success": True,
         "insights": {
             "query_id": query_id,
-            # Query breakdown, timing, etc.
+            "total_matches": len(matches),
+            "matches": matches,
         },
     }
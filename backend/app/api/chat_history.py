@@ -1,19 +1,23 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 from app.services.storage_service import storage_service
 from app.models.schemas import (
     ChatHistoryResponse,
     ChatSessionListResponse,
-    ChatMessage,
     SaveMessageRequest,
     UpdateChatNameRequest
 )
 from app.core.logger import setup_logger
+import asyncio
 import uuid
 
 router = APIRouter()
 logger = setup_logger(__name__)
 
+# Optional ChatMessage fields, for messages stored without them
+CHAT_MESSAGE_DEFAULTS = {"intent": None, "metadata": None, "tool_calls": None}
+
 
 @router.post("/save")
 async def save_message(request: SaveMessageRequest):
@@ -21,7 +25,11 @@ async def save_message(request: SaveMessageRequest):
     Save a chat message to GCS
     """
     try:
-        success = storage_service.save_chat_message(
+        # GCS client is blocking - run it off the event loop. The append is conditional on
+        # the blob generation, so saves overlapping other writes to the session retry
+        # instead of overwriting them
+        success = await asyncio.to_thread(
+            storage_service.save_chat_message,
             session_id=request.session_id,
             role=request.role,
             content=request.content,
@@ -48,12 +56,10 @@ async def list_sessions(limit: int = Query(50, ge=1, le=100)):
     List all chat sessions with previews
     """
     try:
-        sessions = storage_service.list_chat_sessions(limit=limit)
+        sessions = await asyncio.to_thread(storage_service.list_chat_sessions, limit=limit)
 
-        return ChatSessionListResponse(
-            sessions=sessions,
-            total=len(sessions)
-        )
+        # Already JSON-ready; skip model validation and the jsonable_encoder walk
+        return ORJSONResponse({"sessions": sessions, "total": len(sessions)})
 
     except Exception as e:
         logger.error(f"Error listing sessions: {e}")
@@ -66,7 +72,7 @@ async def get_session_history(session_id: str):
     Get full chat history for a session
     """
     try:
-        history = storage_service.get_chat_history(session_id)
+        history = await asyncio.to_thread(storage_service.get_chat_history, session_id)
 
         if not history:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -76,22 +82,37 @@ async def get_session_history(session_id: str):
         if history.get("name"):
             metadata["name"] = history["name"]
 
-        # Convert messages and log metadata
-        converted_messages = []
-        for i, msg in enumerate(history["messages"]):
-            chat_msg = ChatMessage(**msg)
-            if chat_msg.metadata:
-                logger.info(f"API returning message {i} with metadata keys: {list(chat_msg.metadata.keys())}")
-            converted_messages.append(chat_msg)
-
-        return ChatHistoryResponse(
-            session_id=history["session_id"],
-            created_at=history["created_at"],
-            updated_at=history["updated_at"],
-            message_count=history["message_count"],
-            messages=converted_messages,
-            metadata=metadata if metadata else None
-        )
+        # Adopter search matches are stored once and referenced by query_id;
+        # load them back into the messages the frontend renders cards from
+        referencing = [
+            msg["metadata"]
+            for msg in history["messages"]
+            if (msg.get("metadata") or {}).get("matches_ref")
+            and "matches" not in msg["metadata"]
+        ]
+        if referencing:
+            results = await asyncio.gather(
+                *(
+                    asyncio.to_thread(storage_service.get_search_results, meta["matches_ref"])
+                    for meta in referencing
+                )
+            )
+            for meta, matches in zip(referencing, results):
+                meta["matches"] = matches or []
+
+        # Stored messages are already in ChatMessage shape (written by build_chat_message), so
+        # they go to orjson as-is instead of through per-message validation and re-encoding
+        messages = [{**CHAT_MESSAGE_DEFAULTS, **msg} for msg in history["messages"]]
+        logger.info(f"API returning {len(messages)} messages for session {session_id}")
+
+        return ORJSONResponse({
+            "session_id": history["session_id"],
+            "created_at": history["created_at"],
+            "updated_at": history["updated_at"],
+            "message_count": history["message_count"],
+            "messages": messages,
+            "metadata": metadata if metadata else None,
+        })
 
     except HTTPException:
         raise
@@ -106,7 +127,9 @@ async def update_chat_name(session_id: str, request: UpdateChatNameRequest):
     Update the custom name of a chat session
     """
     try:
-        success = storage_service.update_chat_name(session_id, request.name)
+        success = await asyncio.to_thread(
+            storage_service.update_chat_name, session_id, request.name
+        )
 
         if not success:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -126,7 +149,7 @@ async def delete_session(session_id: str):
     Delete a chat session
     """
     try:
-        success = storage_service.delete_chat_session(session_id)
+        success = await asyncio.to_thread(storage_service.delete_chat_session, session_id)
 
         if not success:
             raise HTTPException(status_code=404, detail="Session not found")
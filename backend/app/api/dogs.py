@@ -1,8 +1,10 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks, Body, Query
+from fastapi.responses import ORJSONResponse
 from typing import List, Dict, Any
 from datetime import datetime
 import uuid
 import json
+import asyncio
 
 from app.models.schemas import (
     DogResponse,
@@ -26,7 +28,9 @@ from app.services.medical_extraction_service import medical_extraction_service
 from app.core.config import get_settings
 from app.core.logger import setup_logger
 from app.models.es_documents import Dog
+from elasticsearch import NotFoundError
 from elasticsearch.dsl import AsyncSearch
+from elasticsearch.helpers import async_streaming_bulk
 import csv
 import io
 
@@ -179,6 +183,29 @@ async def get_dog(dog_id: str):
         raise HTTPException(status_code=404, detail=f"Dog not found: {str(e)}")
 
 
+def _dog_from_hit(hit) -> DogResponse:
+    """
+    Build a DogResponse from a search hit in one validation pass
+    Multi-valued medical_history is joined into one string; absent fields default
+    """
+    data = hit.to_dict()
+    medical_history = data.get("medical_history")
+    if isinstance(medical_history, list):
+        data["medical_history"] = " ".join(str(x) for x in medical_history) or None
+    data.setdefault("name", "Unknown")
+    data.setdefault("adoption_status", "available")
+    data.setdefault("photos", [])
+    return DogResponse.model_validate({**data, "id": hit.meta.id})
+
+
+def _dogs_response(dogs: List[DogResponse]) -> ORJSONResponse:
+    """
+    Dogs already validated by _dog_from_hit, dumped straight to orjson instead of being
+    serialized again by response_model and walked by jsonable_encoder
+    """
+    return ORJSONResponse([dog.model_dump() for dog in dogs])
+
+
 @router.get("", response_model=List[DogResponse])
 async def list_dogs(limit: int = Query(10, ge=1, le=10000)):
     """List all dogs using AsyncSearch"""
@@ -195,58 +222,16 @@ async def list_dogs(limit: int = Query(10, ge=1, le=10000)):
         dogs = []
         for hit in response:
             try:
-                # Convert hit to dict using to_dict() method
-                hit_dict = hit.to_dict()
-                
-                # Handle medical_history - can be string or list
-                medical_history = hit_dict.get("medical_history")
-                if isinstance(medical_history, list):
-                    medical_history = " ".join(str(x) for x in medical_history) if medical_history else None
-                
-                # medical_events should now be plain dicts after to_dict()
-                medical_events = hit_dict.get("medical_events")
-                
-                dog_data = {
-                    "id": hit.meta.id,
-                    "name": hit_dict.get("name", "Unknown"),
-                    "breed": hit_dict.get("breed"),
-                    "age": hit_dict.get("age"),
-                    "weight_kg": hit_dict.get("weight_kg"),
-                    "sex": hit_dict.get("sex"),
-                    "rescue_date": hit_dict.get("rescue_date"),
-                    "adoption_status": hit_dict.get("adoption_status", "available"),
-                    "behavioral_notes": hit_dict.get("behavioral_notes"),
-                    "combined_profile": hit_dict.get("combined_profile"),
-                    "medical_history": medical_history,
-                    "photos": hit_dict.get("photos", []),
-                    "medical_events": medical_events,
-                    "past_conditions": hit_dict.get("past_conditions"),
-                    "active_treatments": hit_dict.get("active_treatments"),
-                    "severity_score": hit_dict.get("severity_score"),
-                    "adoption_readiness": hit_dict.get("adoption_readiness"),
-                    "medical_document_ids": hit_dict.get("medical_document_ids"),
-                }
-                
-                # Handle dates
-                if hasattr(hit, "created_at") and hit.created_at:
-                    dog_data["created_at"] = hit.created_at.isoformat() if hasattr(hit.created_at, 'isoformat') else str(hit.created_at)
-                else:
-                    dog_data["created_at"] = None
-                    
-                if hasattr(hit, "updated_at") and hit.updated_at:
-                    dog_data["updated_at"] = hit.updated_at.isoformat() if hasattr(hit.updated_at, 'isoformat') else str(hit.updated_at)
-                else:
-                    dog_data["updated_at"] = None
-                
-                dogs.append(DogResponse(**dog_data))
-                logger.info(f"Successfully parsed dog: {dog_data['name']} ({hit.meta.id})")
+                dog = _dog_from_hit(hit)
+                dogs.append(dog)
+                logger.info(f"Successfully parsed dog: {dog.name} ({hit.meta.id})")
             except Exception as e:
                 logger.error(f"Failed to parse dog document {hit.meta.id}: {e}", exc_info=True)
                 # Skip invalid documents
                 continue
 
         logger.info(f"Returning {len(dogs)} dogs out of {len(response)} hits")
-        return dogs
+        return _dogs_response(dogs)
     except Exception as e:
         logger.error(f"Error listing dogs: {e}")
         raise HTTPException(status_code=500, detail=f"Error listing dogs: {str(e)}")
@@ -331,26 +316,39 @@ async def get_dog_history(dog_id: str):
 async def upload_dog_photo(dog_id: str, file: UploadFile = File(...)):
     """Upload a photo for a dog using AsyncDocument"""
     try:
-        # Read file
-        file_data = await file.read()
-
-        # Upload to GCS
-        image_url = storage_service.upload_image(file_data, file.content_type)
+        # Upload to GCS straight from the spooled upload file, in a thread since the
+        # GCS client blocks
+        image_url = await asyncio.to_thread(
+            storage_service.upload_image_file, file.file, file.content_type, file.size
+        )
 
         if not image_url:
             raise HTTPException(status_code=500, detail="Storage service not configured")
 
-        # Get dog and update photos
-        doc = await Dog.get(id=dog_id, using=es_client.client)
-
-        if not doc.photos:
-            doc.photos = []
-        doc.photos.append(image_url)
-
-        await doc.save(using=es_client.client)
+        # Append in one scripted update on the shard instead of get-then-save, so
+        # concurrent uploads can't overwrite each other's photos
+        response = await es_client.client.update(
+            index=settings.dogs_index,
+            id=dog_id,
+            script={
+                "source": (
+                    "if (ctx._source.photos == null) { ctx._source.photos = [] }"
+                    " ctx._source.photos.add(params.url);"
+                    " ctx._source.updated_at = params.now"
+                ),
+                "params": {"url": image_url, "now": datetime.now().isoformat()},
+            },
+            source_includes=["photos"],
+            retry_on_conflict=3,
+        )
+        photos = response["get"]["_source"]["photos"]
 
         logger.info(f"Added photo to dog {dog_id}")
-        return {"image_url": image_url, "total_photos": len(doc.photos)}
+        return {"image_url": image_url, "total_photos": len(photos)}
+    except HTTPException:
+        raise
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail=f"Dog not found: {dog_id}")
     except Exception as e:
         logger.error(f"Error uploading photo for dog {dog_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
@@ -563,74 +561,22 @@ async def search_dogs_semantic(
 
         response = await s.execute()
 
-        dogs = []
-        for hit in response:
-            # Convert medical_events to MedicalEvent objects for response
-            medical_events_response = None
-            if hasattr(hit, "medical_events") and hit.medical_events:
-                medical_events_response = [MedicalEvent(**event) for event in hit.medical_events]
-
-            # Convert medical_history from list to string if needed
-            medical_history_str = None
-            if hasattr(hit, "medical_history") and hit.medical_history:
-                # ES returns multi=True fields as AttrList, convert to string
-                if hasattr(hit.medical_history, "__iter__") and not isinstance(
-                    hit.medical_history, str
-                ):
-                    # It's a list or list-like, take first element
-                    medical_history_str = (
-                        hit.medical_history[0] if len(hit.medical_history) > 0 else None
-                    )
-                else:
-                    medical_history_str = hit.medical_history
-
-            dogs.append(
-                DogResponse(
-                    id=hit.meta.id,
-                    name=hit.name,
-                    breed=hit.breed,
-                    age=hit.age,
-                    weight_kg=hit.weight_kg if hasattr(hit, "weight_kg") else None,
-                    sex=hit.sex,
-                    rescue_date=hit.rescue_date if hasattr(hit, "rescue_date") else None,
-                    adoption_status=(
-                        hit.adoption_status if hasattr(hit, "adoption_status") else None
-                    ),
-                    behavioral_notes=(
-                        hit.behavioral_notes if hasattr(hit, "behavioral_notes") else None
-                    ),
-                    medical_history=medical_history_str,
-                    medical_events=medical_events_response,
-                    past_conditions=(
-                        hit.past_conditions if hasattr(hit, "past_conditions") else None
-                    ),
-                    active_treatments=(
-                        hit.active_treatments if hasattr(hit, "active_treatments") else None
-                    ),
-                    severity_score=hit.severity_score if hasattr(hit, "severity_score") else None,
-                    adoption_readiness=(
-                        hit.adoption_readiness if hasattr(hit, "adoption_readiness") else None
-                    ),
-                    medical_document_ids=(
-                        hit.medical_document_ids if hasattr(hit, "medical_document_ids") else None
-                    ),
-                    combined_profile=(
-                        hit.combined_profile if hasattr(hit, "combined_profile") else None
-                    ),
-                    photos=hit.photos if hasattr(hit, "photos") else [],
-                    created_at=hit.created_at if hasattr(hit, "created_at") else None,
-                    updated_at=hit.updated_at if hasattr(hit, "updated_at") else None,
-                )
-            )
+        dogs = [_dog_from_hit(hit) for hit in response]
 
         logger.info(f"Semantic search for '{query}' on field '{field}' returned {len(dogs)} dogs")
-        return dogs
+        return _dogs_response(dogs)
 
     except Exception as e:
         logger.error(f"Error in semantic search: {e}")
         raise HTTPException(status_code=500, detail=f"Semantic search failed: {str(e)}")
 
 
+def _parse_csv(content: bytes):
+    """Decode and parse an uploaded CSV; returns (header, row dicts)"""
+    reader = csv.DictReader(io.StringIO(content.decode("utf-8")))
+    return reader.fieldnames, list(reader)
+
+
 @router.post("/bulk-upload", response_model=BulkUploadResponse)
 async def bulk_upload_dogs(file: UploadFile = File(...)):
     """
@@ -660,22 +606,20 @@ async def bulk_upload_dogs(file: UploadFile = File(...)):
     logger.info(f"Bulk upload initiated: {file.filename}")
 
     try:
-        # Read CSV file
+        # Read CSV file; decoding and parsing run in a thread so the event loop stays free
         contents = await file.read()
-        decoded = contents.decode("utf-8")
-        csv_reader = csv.DictReader(io.StringIO(decoded))
+        headers, rows = await asyncio.to_thread(_parse_csv, contents)
 
         # Validate CSV headers
         required_fields = ["name"]
         optional_fields = ["breed", "age", "medical_history", "weight_kg", "sex"]
 
-        headers = csv_reader.fieldnames
         if not headers or "name" not in headers:
             raise HTTPException(status_code=400, detail="CSV must contain 'name' column")
 
         # Parse rows
         dogs_data = []
-        for row in csv_reader:
+        for row in rows:
             dog_dict = {
                 "name": row.get("name", "").strip(),
                 "breed": row.get("breed", "").strip() or None,
@@ -698,59 +642,68 @@ async def bulk_upload_dogs(file: UploadFile = File(...)):
         # Batch extract medical data
         extracted_dogs = await medical_extraction_service.batch_extract(dogs_data)
 
-        # Insert into Elasticsearch
+        # Build every document, then insert them into Elasticsearch with streamed _bulk
+        # requests instead of one index request per dog
+        now = datetime.now()
+        docs = []
+        for dog_data in extracted_dogs:
+            # Create AsyncDocument instance
+            doc = Dog(meta={"id": str(uuid.uuid4())})
+
+            # Set basic fields
+            doc.name = dog_data["name"]
+            doc.breed = dog_data.get("breed")
+            doc.age = dog_data.get("age")
+            doc.weight_kg = dog_data.get("weight_kg")
+            doc.sex = dog_data.get("sex")
+            doc.rescue_date = now
+            doc.adoption_status = "available"
+
+            # Set medical fields
+            doc.medical_history = dog_data.get("medical_history")
+            doc.medical_events = dog_data.get("medical_events", [])
+            doc.past_conditions = dog_data.get("past_conditions", [])
+            doc.active_treatments = dog_data.get("active_treatments", [])
+            doc.severity_score = dog_data.get("severity_score", 0)
+            doc.adoption_readiness = dog_data.get("adoption_readiness", "ready")
+
+            # Initialize arrays
+            doc.photos = []
+            doc.medical_document_ids = []
+
+            # Timestamps Dog.save would set; _bulk bypasses it
+            doc.created_at = now
+            doc.updated_at = now
+            docs.append(doc)
+
         dog_ids = []
         errors = []
-        successful = 0
 
-        for i, dog_data in enumerate(extracted_dogs):
-            try:
-                dog_id = str(uuid.uuid4())
-
-                # Create AsyncDocument instance
-                doc = Dog(meta={"id": dog_id})
-
-                # Set basic fields
-                doc.name = dog_data["name"]
-                doc.breed = dog_data.get("breed")
-                doc.age = dog_data.get("age")
-                doc.weight_kg = dog_data.get("weight_kg")
-                doc.sex = dog_data.get("sex")
-                doc.rescue_date = datetime.now()
-                doc.adoption_status = "available"
-
-                # Set medical fields
-                doc.medical_history = dog_data.get("medical_history")
-                doc.medical_events = dog_data.get("medical_events", [])
-                doc.past_conditions = dog_data.get("past_conditions", [])
-                doc.active_treatments = dog_data.get("active_treatments", [])
-                doc.severity_score = dog_data.get("severity_score", 0)
-                doc.adoption_readiness = dog_data.get("adoption_readiness", "ready")
-
-                # Initialize arrays
-                doc.photos = []
-                doc.medical_document_ids = []
-
-                # Save to Elasticsearch
-                await doc.save(using=es_client.client)
-
-                dog_ids.append(dog_id)
-                successful += 1
-
-                logger.info(
-                    f"Bulk upload: Created dog {i+1}/{len(extracted_dogs)}: {doc.name} ({dog_id})"
-                )
-
-            except Exception as e:
-                logger.error(f"Failed to create dog {dog_data.get('name', 'Unknown')}: {e}")
+        # Results come back in action order
+        i = 0
+        async for ok, item in async_streaming_bulk(
+            es_client.client,
+            (doc.to_dict(include_meta=True) for doc in docs),
+            raise_on_error=False,
+            raise_on_exception=False,
+            refresh=False,
+        ):
+            doc = docs[i]
+            if ok:
+                dog_ids.append(doc.meta.id)
+            else:
+                error = item.get("index", {}).get("error", item)
+                logger.error(f"Failed to create dog {doc.name}: {error}")
                 errors.append(
                     {
                         "row": i + 2,  # +2 for CSV line number (header + 0-index)
-                        "name": dog_data.get("name", "Unknown"),
-                        "error": str(e),
+                        "name": doc.name,
+                        "error": str(error),
                     }
                 )
+            i += 1
 
+        successful = len(dog_ids)
         logger.info(f"Bulk upload complete: {successful}/{len(dogs_data)} successful")
 
         return BulkUploadResponse(
@@ -119,15 +119,17 @@ async def list_articles(
     """List all articles using DSL, optionally filter by language"""
     # Build search using AsyncSearch
     s = AsyncSearch(using=es_client.client, index=settings.vet_knowledge_index)
-    s = s.query("match_all")
 
-    # Add filters if provided
+    # Add filters if provided, as a filter-only bool (no scoring, cacheable clauses)
+    filters = []
     if source:
-        s = s.filter("term", source=source)
+        filters.append(Q("term", source=source))
     if language:
-        s = s.filter("term", language=language.value)
+        filters.append(Q("term", language=language.value))
     if tag:
-        s = s.filter("term", tags=tag)
+        filters.append(Q("term", tags=tag))
+    if filters:
+        s = s.query("bool", filter=filters)
 
     # Sort and paginate
     s = s.sort({"upload_date": {"order": "desc"}})
@@ -159,11 +159,33 @@ async def list_medical_documents(
         documents = []
         dog_ids_to_lookup = set()
         
-        # First pass: collect all unique dog_ids
+        # Single pass over the hits: build documents and collect unique dog_ids
         for hit in response.hits:
             dog_id = hit.dog_id if hasattr(hit, 'dog_id') else None
             if dog_id:
                 dog_ids_to_lookup.add(dog_id)
+            documents.append({
+                "id": hit.meta.id,
+                "document_id": hit.document_id if hasattr(hit, 'document_id') else hit.meta.id,
+                "title": hit.source_filename if hasattr(hit, 'source_filename') else "Unknown",
+                "document_type": hit.document_type if hasattr(hit, 'document_type') else "other",
+                "dog_id": dog_id,
+                "dog_name": None,  # Enriched from dogs index below
+                "content": hit.document_text if hasattr(hit, 'document_text') else None,
+                "filename": hit.source_filename if hasattr(hit, 'source_filename') else None,
+                "file_type": hit.file_type if hasattr(hit, 'file_type') else None,
+                "file_size": hit.file_size if hasattr(hit, 'file_size') else None,
+                "document_date": hit.visit_date if hasattr(hit, 'visit_date') else None,
+                "upload_date": hit.upload_timestamp if hasattr(hit, 'upload_timestamp') else None,
+                "severity": hit.severity if hasattr(hit, 'severity') else None,
+                "category": hit.category if hasattr(hit, 'category') else None,
+                "veterinarian_name": hit.veterinarian_name if hasattr(hit, 'veterinarian_name') else None,
+                "clinic_name": hit.vet_clinic_name if hasattr(hit, 'vet_clinic_name') else None,
+                "medications": hit.medications if hasattr(hit, 'medications') else [],
+                "procedures": hit.procedures if hasattr(hit, 'procedures') else [],
+                "vaccinations": hit.vaccinations if hasattr(hit, 'vaccinations') else [],
+                "notes": hit.notes if hasattr(hit, 'notes') else None,
+            })
         
         # Lookup dog names from dogs index
         dog_names = {}
@@ -172,7 +194,7 @@ async def list_medical_documents(
                 logger.info(f"Looking up dog IDs: {dog_ids_to_lookup}")
                 dog_search = AsyncSearch(using=es_client.client, index=settings.dogs_index)
                 dog_search = dog_search.filter("terms", _id=list(dog_ids_to_lookup))
-                dog_search = dog_search[:len(dog_ids_to_lookup)]
+                dog_search = dog_search.source(["name"])[:len(dog_ids_to_lookup)]
                 dog_response = await dog_search.execute()
                 
                 for dog_hit in dog_response.hits:
@@ -188,31 +210,11 @@ async def list_medical_documents(
             except Exception as e:
                 logger.warning(f"Could not lookup dog names: {e}")
         
-        # Second pass: build documents with enriched dog names
-        for hit in response.hits:
-            dog_id = hit.dog_id if hasattr(hit, 'dog_id') else None
-            documents.append({
-                "id": hit.meta.id,
-                "document_id": hit.document_id if hasattr(hit, 'document_id') else hit.meta.id,
-                "title": hit.source_filename if hasattr(hit, 'source_filename') else "Unknown",
-                "document_type": hit.document_type if hasattr(hit, 'document_type') else "other",
-                "dog_id": dog_id,
-                "dog_name": dog_names.get(dog_id) if dog_id else None,  # Enriched from dogs index
-                "content": hit.document_text if hasattr(hit, 'document_text') else None,
-                "filename": hit.source_filename if hasattr(hit, 'source_filename') else None,
-                "file_type": hit.file_type if hasattr(hit, 'file_type') else None,
-                "file_size": hit.file_size if hasattr(hit, 'file_size') else None,
-                "document_date": hit.visit_date if hasattr(hit, 'visit_date') else None,
-                "upload_date": hit.upload_timestamp if hasattr(hit, 'upload_timestamp') else None,
-                "severity": hit.severity if hasattr(hit, 'severity') else None,
-                "category": hit.category if hasattr(hit, 'category') else None,
-                "veterinarian_name": hit.veterinarian_name if hasattr(hit, 'veterinarian_name') else None,
-                "clinic_name": hit.vet_clinic_name if hasattr(hit, 'vet_clinic_name') else None,
-                "medications": hit.medications if hasattr(hit, 'medications') else [],
-                "procedures": hit.procedures if hasattr(hit, 'procedures') else [],
-                "vaccinations": hit.vaccinations if hasattr(hit, 'vaccinations') else [],
-                "notes": hit.notes if hasattr(hit, 'notes') else None,
-            })
+        # Enrich documents with dog names
+        if dog_names:
+            for document in documents:
+                if document["dog_id"]:
+                    document["dog_name"] = dog_names.get(document["dog_id"])
         
         return documents
     except Exception as e:
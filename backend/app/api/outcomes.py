@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Path, Query, Body, UploadFile, Fil
 from typing import List, Optional
 from datetime import datetime
 import uuid
+import asyncio
 import csv
 import io
 
@@ -318,11 +319,10 @@ async def list_outcomes(
     """List all outcomes with pagination using AsyncSearch"""
     try:
         s = AsyncSearch(using=es_client.client, index=settings.outcomes_index)
-        s = s.query("match_all")
 
-        # Add filter if specified
+        # Add filter if specified, in filter context so it is cached and not scored
         if outcome_filter:
-            s = s.filter("term", outcome=outcome_filter)
+            s = s.query("bool", filter=[Q("term", outcome=outcome_filter)])
 
         # Sort and paginate
         s = s.sort("-created_at")
@@ -411,6 +411,11 @@ async def get_outcome(outcome_id: str = Path(...)):
         raise HTTPException(status_code=404, detail=f"Outcome not found: {str(e)}")
 
 
+def _parse_csv(content: bytes) -> List[dict]:
+    """Decode and parse an uploaded CSV into row dicts (CPU-bound, run in a thread)"""
+    return list(csv.DictReader(io.StringIO(content.decode("utf-8"))))
+
+
 # 10. CSV Bulk Upload for outcomes
 @router.post("/csv/upload")
 async def upload_outcomes_csv(file: UploadFile = File(...)):
@@ -432,16 +437,16 @@ async def upload_outcomes_csv(file: UploadFile = File(...)):
     - match_score (optional)
     """
     try:
-        # Read and parse CSV
+        # Read and parse CSV off the event loop so other requests aren't stalled
         content = await file.read()
-        csv_string = content.decode("utf-8")
-        csv_reader = csv.DictReader(io.StringIO(csv_string))
-        rows = list(csv_reader)
+        rows = await asyncio.to_thread(_parse_csv, content)
 
         indexed_count = 0
         failed_count = 0
         errors = []
         indexed_ids = []
+        # Default adoption date for rows without a usable one; one clock read per upload
+        uploaded_at = datetime.now()
 
         for idx, row in enumerate(rows):
             try:
@@ -463,9 +468,9 @@ async def upload_outcomes_csv(file: UploadFile = File(...)):
                     try:
                         doc.adoption_date = datetime.fromisoformat(adoption_date_str)
                     except ValueError:
-                        doc.adoption_date = datetime.now()
+                        doc.adoption_date = uploaded_at
                 else:
-                    doc.adoption_date = datetime.now()
+                    doc.adoption_date = uploaded_at
                 
                 return_date_str = row.get("return_date")
                 if return_date_str:
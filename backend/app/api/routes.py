@@ -1,17 +1,16 @@
 from fastapi import APIRouter, HTTPException
 from datetime import datetime
 
-from app.core.config import get_elasticsearch_client
+from app.services.elasticsearch_client import es_client
 
 router = APIRouter()
-es_client = get_elasticsearch_client()
 
 
 @router.get("/health")
-def health_check():
+async def health_check():
     try:
         # Use info() instead of cluster.health() for Elasticsearch Serverless compatibility
-        info = es_client.info()
+        info = await es_client.client.info()
 
         return {
             "status": "success",
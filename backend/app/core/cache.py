@@ -0,0 +1,84 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Small in-process TTL cache with LRU eviction
+    Used for read-heavy endpoints backed by slow-changing data (analytics, predictions)
+    Concurrent misses for the same key share a single computation (single-flight)
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key, or default if missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry when full"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for key, or await compute() and cache its result
+        Callers that miss while a computation for key is running await that one
+        instead of starting their own
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        # Shielded so one caller disconnecting doesn't cancel the work for the others
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        """Cache a finished computation, unless key was invalidated while it ran"""
+        if self._inflight.get(key) is not task:
+            return
+        del self._inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self.set(key, task.result())
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop a single key, or everything when no key is given"""
+        if key is None:
+            self._data.clear()
+            self._inflight.clear()
+        else:
+            self._data.pop(key, None)
+            self._inflight.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
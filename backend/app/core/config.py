@@ -2,7 +2,6 @@ from pydantic_settings import BaseSettings
 from functools import lru_cache
 from pathlib import Path
 from typing import Optional
-from elasticsearch import Elasticsearch
 
 # Get the backend directory (parent of parent of this file)
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -21,6 +20,8 @@ class Settings(BaseSettings):
     elastic_verify_certs: bool = True
     elastic_ca_certs: Optional[str] = None
     elastic_timeout: int = 60  # seconds
+    elastic_connections_per_node: int = 64  # async client keep-alive pool size
+    elastic_max_concurrent_shard_requests: int = 16  # per node, per search (ES default: 5)
 
     # Google Cloud
     gcp_project_id: str
@@ -35,35 +36,41 @@ class Settings(BaseSettings):
     case_studies_index: str = "case_studies"
     applications_index: str = "applications"
     outcomes_index: str = "rescue-adoption-outcomes"
+    outcomes_daily_index: str = "rescue-adoption-outcomes-daily"
+    dashboard_snapshot_index: str = "rescue-dashboard-snapshot"
+    sync_jobs_index: str = "rescue-sync-jobs"
     medical_documents_index: str = "medical_documents"
 
     # Optional: Google Cloud Storage
     gcs_bucket_name: str = ""
 
+    # Response caching
+    analytics_cache_ttl: int = 30  # seconds
+    predict_cache_ttl: int = 300  # seconds
+    similar_cases_cache_ttl: int = 60  # seconds
+    csv_inspection_cache_ttl: int = 300  # seconds
+    semantic_search_cache_ttl: int = 60  # seconds
+    case_study_cache_ttl: int = 300  # seconds
+    case_study_list_cache_ttl: int = 30  # seconds
+    case_search_cache_ttl: int = 60  # seconds
+    # Semantic cache for Gemini responses to near-identical chat messages
+    gemini_cache_index: str = "gemini-response-cache"
+    gemini_cache_inference_id: str = ".multilingual-e5-small-elasticsearch"
+    gemini_cache_min_score: float = 0.93
+    gemini_cache_ttl: int = 3600  # seconds
+    intent_cache_ttl: int = 1800  # seconds
+    applicant_details_cache_ttl: int = 600  # seconds
+    # Fixed search preference so repeated aggregation reads land on the same shard
+    # copies and hit their shard request cache
+    analytics_search_preference: str = "analytics"
+
     class Config:
         env_file = str(ENV_FILE)
         case_sensitive = False
         env_file_encoding = "utf-8"
 
-    # Method to create es client
-    def get_elasticsearch_client(self) -> Elasticsearch:
-        """Create and return an Elasticsearch client using the settings."""
-        # For serverless projects, you can use either cloud_id or endpoint
-        if self.elastic_cloud_id:
-            # Using cloud_id (Connection alias)
-            return Elasticsearch(cloud_id=self.elastic_cloud_id, api_key=self.elastic_api_key)
-        else:
-            # Using direct endpoint
-            return Elasticsearch(hosts=[self.elastic_endpoint], api_key=self.elastic_api_key)
-
 
 @lru_cache()
 def get_settings():
     return Settings()
 
-
-# Create a singleton es client
-@lru_cache()
-def get_elasticsearch_client() -> Elasticsearch:
-    settings = get_settings()
-    return settings.get_elasticsearch_client()
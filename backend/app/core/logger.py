@@ -1,13 +1,15 @@
 import logging
 import sys
+from functools import lru_cache
 from pathlib import Path
 from app.core.config import get_settings
 
 settings = get_settings()
 
 
+@lru_cache(maxsize=None)
 def setup_logger(name: str = __name__) -> logging.Logger:
-    """Configure and return a logger instance"""
+    """Configure and return a logger instance (configured once per name)"""
 
     # Create logger
     logger = logging.getLogger(name)
@@ -0,0 +1,57 @@
+import base64
+import json
+
+from fastapi import HTTPException, Response
+from elasticsearch.dsl import AsyncSearch
+
+from app.services.elasticsearch_client import es_client
+
+# Cursor pages keep their point-in-time open this long between requests
+PIT_KEEP_ALIVE = "1m"
+CURSOR_FILTER_PATH = ["pit_id", "hits.hits._id", "hits.hits._source", "hits.hits.sort"]
+
+
+def encode_cursor(pit_id: str, sort_values: list) -> str:
+    """Opaque cursor carrying the PIT id and the last hit's sort values"""
+    state = json.dumps({"pit": pit_id, "after": sort_values})
+    return base64.urlsafe_b64encode(state.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """Return (pit_id, search_after values) from a cursor issued by encode_cursor"""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor))
+        return state["pit"], state["after"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+async def search_page_after(
+    s: AsyncSearch, index_name: str, cursor: str, limit: int, response: Response
+):
+    """
+    Fetch one search_after page of s inside a point-in-time, so deep pages cost the
+    same as the first one; the PIT's implicit _shard_doc sort breaks ties in s's sort
+    An empty cursor opens a new PIT; X-Next-Cursor is set while more pages may follow
+    """
+    if cursor:
+        pit_id, search_after = decode_cursor(cursor)
+    else:
+        pit = await es_client.client.open_point_in_time(
+            index=index_name, keep_alive=PIT_KEEP_ALIVE
+        )
+        pit_id, search_after = pit["id"], None
+
+    s = s.extra(size=limit, pit={"id": pit_id, "keep_alive": PIT_KEEP_ALIVE})
+    if search_after:
+        s = s.extra(search_after=search_after)
+
+    result = await es_client.client.search(body=s.to_dict(), filter_path=CURSOR_FILTER_PATH)
+    hits = result.body.get("hits", {}).get("hits", [])
+
+    if len(hits) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(result["pit_id"], hits[-1]["sort"])
+    else:
+        await es_client.client.close_point_in_time(id=result["pit_id"])
+
+    return hits
@@ -4,18 +4,39 @@ import warnings
 # Must be set before importing any Google Cloud libraries
 warnings.filterwarnings("ignore", message="Field name .* shadows an attribute in parent")
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from app.api import routes, dogs, knowledge, case_studies, chat, chat_history, applications, outcomes, analytics, medical_documents
 from app.core.config import get_settings
+from app.services.elasticsearch_client import get_es_client
+from app.services.chat_history_writer import chat_history_writer
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Every router shares one pooled AsyncElasticsearch client; create it and open a
+    # first keep-alive connection before the first request, release them on shutdown
+    es = get_es_client()
+    await es.ping()
+    yield
+    await case_studies.case_study_writes.flush()
+    await chat_history_writer.flush()
+    await es.close()
+
+
 app = FastAPI(
     title=settings.app_name,
     version="1.0.0",
     debug=settings.debug,
     description="AI-powered veterinary assistance for rescue organizations",
+    # orjson serializes the large analytics/search payloads much faster than stdlib json
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS Configuration
@@ -31,8 +52,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+class StreamAwareGZipMiddleware(GZipMiddleware):
+    """GZip that skips /stream endpoints, whose event frames the compressor would hold back"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Gzip responses for clients that accept it; case study and search payloads are long
+# free text that compresses well, while tiny bodies aren't worth the CPU
+app.add_middleware(StreamAwareGZipMiddleware, minimum_size=1024)
+
 # API v1 routers
 api_v1_prefix = "/api/v1"
 app.include_router(routes.router, prefix=api_v1_prefix, tags=["health"])
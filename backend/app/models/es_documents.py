@@ -100,9 +100,10 @@ class CaseStudy(AsyncDocument):
 
     def save(self, **kwargs):
         """Override save to set timestamps"""
+        now = datetime.now()
         if not self.created_at:
-            self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+            self.created_at = now
+        self.updated_at = now
         return super().save(**kwargs)
 
 
@@ -142,9 +143,10 @@ class Dog(AsyncDocument):
 
     def save(self, **kwargs):
         """Override save to set timestamps"""
+        now = datetime.now()
         if not self.created_at:
-            self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+            self.created_at = now
+        self.updated_at = now
         return super().save(**kwargs)
 
 
@@ -241,6 +243,28 @@ class RescueAdoptionOutcome(AsyncDocument):
         return super().save(**kwargs)
 
 
+class OutcomeDailyRollup(AsyncDocument):
+    """
+    Pre-aggregated outcome counts per (day, adopter experience, dog difficulty)
+    Written by the nightly rollup job and read by the analytics dashboard
+    """
+
+    date = Date()
+    adopter_experience_level = Keyword()
+    dog_difficulty_level = Keyword()
+
+    total_count = Integer()
+    success_count = Integer()
+    returned_count = Integer()
+    days_until_return_sum = Float()
+
+    rolled_up_at = Date()
+
+    class Index:
+        name = settings.outcomes_daily_index
+        # No settings for serverless - managed by Elasticsearch
+
+
 class MedicalDocument(AsyncDocument):
     """
     Elasticsearch Document model for medical documents (vet records, prescriptions, etc.)
@@ -294,9 +318,10 @@ class MedicalDocument(AsyncDocument):
 
     def save(self, **kwargs):
         """Override save to set timestamps"""
+        now = datetime.now()
         if not self.created_at:
-            self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+            self.created_at = now
+        self.updated_at = now
         if not self.upload_date:
-            self.upload_date = datetime.now()
+            self.upload_date = now
         return super().save(**kwargs)
@@ -272,6 +272,14 @@ class ApplicationResponse(BaseModel):
             return cls(id=doc_id, **data)
 
 
+class ApplicationBatchOperation(BaseModel):
+    """One read in a POST /applications/_batch request"""
+
+    op: Literal["get", "list", "search"]
+    # get: id | list: limit, offset, status, experience_level | search: query, limit, status_filter
+    args: Dict[str, Any] = {}
+
+
 # Rescue Adoption Outcome Models
 class OutcomeCreate(BaseModel):
     dog_id: str
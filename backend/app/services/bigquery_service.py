@@ -11,6 +11,10 @@ from app.core.google_cloud import GoogleCloudClients
 settings = get_settings()
 logger = setup_logger(__name__)
 
+# Streaming insert batching: rows per insert_rows_json call and max calls in flight
+INSERT_BATCH_SIZE = 500
+INSERT_CONCURRENCY = 8
+
 
 class BigQueryService:
     """
@@ -34,49 +38,52 @@ class BigQueryService:
         Run this as a nightly batch job
         """
         try:
+            # Only the synced fields are fetched; hits are read as plain dicts instead of
+            # going through AttrDict attribute lookups for every field of every outcome
             search = AsyncSearch(using=es_client.client, index=settings.outcomes_index)
+            search = search.source(
+                [
+                    "outcome",
+                    "dog_id",
+                    "adopter_experience_level",
+                    "dog_difficulty_level",
+                    "match_score_at_adoption",
+                    "adopter_satisfaction_score",
+                    "days_until_return",
+                ]
+            )
             rows_to_insert = []
+            synced_at = datetime.now().isoformat()
 
             async for hit in search.scan():
-                if hit.outcome == "success":
-                    rows_to_insert.append(
-                        {
-                            "outcome_id": hit.meta.id,
-                            "dog_id": hit.dog_id,
-                            "outcome": "success",
-                            "adopter_experience_level": hit.adopter_experience_level
-                            or "intermediate",
-                            "dog_difficulty_level": hit.dog_difficulty_level or "moderate",
-                            "match_score_at_adoption": hit.match_score_at_adoption or 0.0,
-                            "outcome_successful": True,
-                            "satisfaction_score": hit.adopter_satisfaction_score,
-                            "days_until_return": None,
-                            "synced_at": datetime.now().isoformat(),
-                        }
-                    )
-                elif hit.outcome == "returned":
-                    rows_to_insert.append(
-                        {
-                            "outcome_id": hit.meta.id,
-                            "dog_id": hit.dog_id,
-                            "outcome": "returned",
-                            "adopter_experience_level": hit.adopter_experience_level
-                            or "intermediate",
-                            "dog_difficulty_level": hit.dog_difficulty_level or "moderate",
-                            "match_score_at_adoption": hit.match_score_at_adoption or 0.0,
-                            "outcome_successful": False,
-                            "satisfaction_score": None,
-                            "days_until_return": hit.days_until_return,
-                            "synced_at": datetime.now().isoformat(),
-                        }
-                    )
+                doc = hit.to_dict()
+                outcome = doc.get("outcome")
+                if outcome not in ("success", "returned"):
+                    continue
+
+                successful = outcome == "success"
+                rows_to_insert.append(
+                    {
+                        "outcome_id": hit.meta.id,
+                        "dog_id": doc.get("dog_id"),
+                        "outcome": outcome,
+                        "adopter_experience_level": doc.get("adopter_experience_level")
+                        or "intermediate",
+                        "dog_difficulty_level": doc.get("dog_difficulty_level") or "moderate",
+                        "match_score_at_adoption": doc.get("match_score_at_adoption") or 0.0,
+                        "outcome_successful": successful,
+                        "satisfaction_score": (
+                            doc.get("adopter_satisfaction_score") if successful else None
+                        ),
+                        "days_until_return": None if successful else doc.get("days_until_return"),
+                        "synced_at": synced_at,
+                    }
+                )
 
             if not rows_to_insert:
                 return {"synced_count": 0, "message": "No outcomes to sync"}
 
-            errors = await asyncio.to_thread(
-                self.client.insert_rows_json, self.table_ref, rows_to_insert
-            )
+            errors = await self._insert_rows_batched(self.table_ref, rows_to_insert)
 
             if errors:
                 logger.error(f"Errors inserting rows to BigQuery: {errors}")
@@ -94,6 +101,39 @@ class BigQueryService:
             logger.error(f"Error syncing to BigQuery: {e}")
             raise
 
+    async def _insert_rows_batched(
+        self, table_ref: str, rows: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Stream rows into BigQuery in fixed-size batches, a few batches at a time
+        Returns the combined insert errors from every batch
+        """
+        semaphore = asyncio.Semaphore(INSERT_CONCURRENCY)
+
+        async def _insert(batch: List[Dict[str, Any]]):
+            async with semaphore:
+                return await asyncio.to_thread(self.client.insert_rows_json, table_ref, batch)
+
+        batch_errors = await asyncio.gather(
+            *(
+                _insert(rows[i : i + INSERT_BATCH_SIZE])
+                for i in range(0, len(rows), INSERT_BATCH_SIZE)
+            )
+        )
+        return [error for errors in batch_errors for error in errors]
+
+    async def _run_query(self, query: str, job_config: bigquery.QueryJobConfig) -> List[Any]:
+        """
+        Submit a query, wait for it and fetch every result row in one worker thread
+        Iterating a RowIterator can page more rows over HTTP, so it must not happen
+        on the event loop
+        """
+
+        def _query_rows():
+            return list(self.client.query(query, job_config=job_config).result())
+
+        return await asyncio.to_thread(_query_rows)
+
     async def query_success_rates(self, filters: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Query success rates by various dimensions safely using parameterized queries.
@@ -126,8 +166,7 @@ class BigQueryService:
             job_config = bigquery.QueryJobConfig(query_parameters=query_params)
 
             # FIXED: Run the blocking query call in a separate thread
-            query_job = await asyncio.to_thread(self.client.query, query, job_config=job_config)
-            results = await asyncio.to_thread(query_job.result)
+            results = await self._run_query(query, job_config)
 
             stats = [dict(row) for row in results]  # More concise conversion
             logger.info(f"Retrieved success rate stats: {len(stats)} rows")
@@ -165,8 +204,7 @@ class BigQueryService:
             ]
             job_config = bigquery.QueryJobConfig(query_parameters=query_params)
 
-            query_job = await asyncio.to_thread(self.client.query, query, job_config=job_config)
-            results = await asyncio.to_thread(query_job.result)
+            results = await self._run_query(query, job_config)
 
             for row in results:
                 predicted_success = row["predicted_outcome_successful"]
@@ -0,0 +1,104 @@
+"""
+Buffered bulk writer
+Coalesces single-document index requests that arrive close together into one _bulk call
+"""
+import asyncio
+from typing import List, Optional, Set, Tuple
+
+from elasticsearch.helpers import async_streaming_bulk
+
+from app.services.elasticsearch_client import es_client
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class BulkWriteBuffer:
+    """
+    Queues index actions and writes them with _bulk once max_batch actions are
+    waiting or flush_interval seconds after the first one was queued
+    Each caller awaits the outcome of its own document
+    """
+
+    def __init__(self, flush_interval: float = 0.25, max_batch: int = 500):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending: List[Tuple[dict, "asyncio.Future[dict]"]] = []
+        self._flusher: Optional["asyncio.Task[None]"] = None
+        self._full_flushes: Set["asyncio.Task[None]"] = set()
+        # Serializes timer, size-triggered and shutdown flushes so no batch is sent twice
+        self._lock = asyncio.Lock()
+
+    async def index(self, index_name: str, id: str, document: dict) -> dict:
+        """Queue a document for indexing and wait until its batch has been written"""
+        future = asyncio.get_running_loop().create_future()
+        action = {"_op_type": "index", "_index": index_name, "_id": id, "_source": document}
+        self._pending.append((action, future))
+
+        # The flush writes every queued caller's document, so it runs in its own task:
+        # cancelling the request that filled the batch mustn't abandon the others
+        if len(self._pending) >= self.max_batch:
+            task = asyncio.ensure_future(self.flush())
+            self._full_flushes.add(task)
+            task.add_done_callback(self._full_flushes.discard)
+        elif self._flusher is None:
+            self._flusher = asyncio.ensure_future(self._flush_later())
+
+        return await future
+
+    async def flush(self) -> None:
+        """Write everything queued so far"""
+        async with self._lock:
+            while self._pending:
+                # Take the batch off the queue before awaiting the write
+                batch = self._pending[: self.max_batch]
+                self._pending = self._pending[self.max_batch :]
+                await self._write(batch)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._flusher = None
+        await self.flush()
+
+    async def _write(self, batch: List[Tuple[dict, "asyncio.Future[dict]"]]) -> None:
+        """Send one batch through _bulk and resolve each caller's future with its item"""
+        actions = [action for action, _ in batch]
+        futures = [future for _, future in batch]
+
+        try:
+            position = 0
+            async for ok, item in async_streaming_bulk(
+                es_client.client,
+                actions,
+                chunk_size=len(actions),
+                raise_on_error=False,
+                raise_on_exception=False,
+                refresh=False,
+            ):
+                future = futures[position]
+                position += 1
+                if future.done():  # caller went away
+                    continue
+
+                result = item.get("index", {})
+                if ok:
+                    future.set_result(result)
+                else:
+                    future.set_exception(
+                        RuntimeError(f"Bulk index failed: {result.get('error', item)}")
+                    )
+        except Exception as e:
+            logger.error(f"Error writing buffered batch of {len(batch)} documents: {e}")
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            logger.info(f"Wrote buffered batch of {len(batch)} documents")
+        finally:
+            # Cancelled mid-write (or no item came back for a doc): fail whoever is
+            # still waiting rather than leaving them hanging
+            for future in futures:
+                if not future.done():
+                    future.set_exception(
+                        RuntimeError("Buffered bulk write ended before this document was written")
+                    )
@@ -0,0 +1,80 @@
+"""
+Buffered chat history writer
+Takes chat history writes off the request path and coalesces them per session
+"""
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.services.storage_service import storage_service
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ChatHistoryWriter:
+    """
+    Queues chat messages and appends them to GCS once max_batch messages are waiting
+    or flush_interval seconds after the first one was queued
+    Each flush does one read-modify-write per session, sessions in parallel threads
+    Messages keep their order within a session; callers don't wait for the write
+    """
+
+    def __init__(self, flush_interval: float = 0.1, max_batch: int = 16):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._flusher: Optional["asyncio.Task[None]"] = None
+        self._full_flushes: Set["asyncio.Task[None]"] = set()
+        # Serializes flushes so two can't read-modify-write the same session blob at once
+        self._lock = asyncio.Lock()
+
+    def enqueue(
+        self,
+        session_id: str,
+        role: str,
+        content: str,
+        intent: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Queue a message for the session; it's timestamped now, not when it's written"""
+        message = storage_service.build_chat_message(role, content, intent, metadata)
+        self._pending.append((session_id, message))
+
+        if len(self._pending) >= self.max_batch:
+            task = asyncio.ensure_future(self.flush())
+            self._full_flushes.add(task)
+            task.add_done_callback(self._full_flushes.discard)
+        elif self._flusher is None:
+            self._flusher = asyncio.ensure_future(self._flush_later())
+
+    async def flush(self) -> None:
+        """Write everything queued so far"""
+        async with self._lock:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                await self._write(batch)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._flusher = None
+        await self.flush()
+
+    async def _write(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        by_session: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for session_id, message in batch:
+            by_session[session_id].append(message)
+
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(storage_service.append_chat_messages, session_id, messages)
+                for session_id, messages in by_session.items()
+            ),
+            return_exceptions=True,
+        )
+        failed = sum(1 for result in results if result is not True)
+        if failed:
+            logger.error(f"Failed to write chat history for {failed} of {len(results)} sessions")
+
+
+chat_history_writer = ChatHistoryWriter()
@@ -7,6 +7,12 @@ import math
 
 logger = setup_logger(__name__)
 
+# Category values checked for every application scored; frozensets avoid rebuilding
+# a list literal and scanning it on each check
+RENTED_OWNERSHIP = frozenset({"Leased", "Rented"})
+HOUSE_TYPES = frozenset({"Detached House", "Townhouse"})
+STABLE_MARITAL_STATUSES = frozenset({"Married", "Partnered"})
+
 
 class CompatibilityService:
     """Service for calculating compatibility scores between applications and dogs"""
@@ -164,7 +170,7 @@ class CompatibilityService:
                 score -= 15
 
         # Landlord permission (critical for renters)
-        if app.housing_info.ownership_status in ["Leased", "Rented"]:
+        if app.housing_info.ownership_status in RENTED_OWNERSHIP:
             if app.housing_info.landlord_permission_granted == "Yes":
                 score += 10
             elif app.housing_info.landlord_permission_granted == "No":
@@ -173,7 +179,7 @@ class CompatibilityService:
                 score -= 25
 
         # Housing type suitability
-        if app.housing_info.type in ["Detached House", "Townhouse"]:
+        if app.housing_info.type in HOUSE_TYPES:
             score += 5
         elif app.housing_info.type == "Apartment" and dog.weight_kg and dog.weight_kg > 35:
             score -= 10  # Large dog in apartment
@@ -202,7 +208,7 @@ class CompatibilityService:
             score += 15
 
         # Marital stability (optional field)
-        if app.applicant_info.marital_status in ["Married", "Partnered"]:
+        if app.applicant_info.marital_status in STABLE_MARITAL_STATUSES:
             score += 5  # Stable household
 
         return min(100, max(0, score))
@@ -341,7 +347,7 @@ class CompatibilityService:
 
         if dimension_scores["housing"] < 50:
             concerns.append("Housing may not be suitable")
-            if app.housing_info.ownership_status in ["Leased", "Rented"]:
+            if app.housing_info.ownership_status in RENTED_OWNERSHIP:
                 if app.housing_info.landlord_permission_granted != "Yes":
                     concerns.append("CRITICAL: No landlord permission")
 
@@ -1,3 +1,7 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
 from elasticsearch import AsyncElasticsearch
 from app.core.config import get_settings
 from app.core.logger import setup_logger
@@ -5,22 +9,35 @@ from app.core.logger import setup_logger
 settings = get_settings()
 logger = setup_logger(__name__)
 
+# Response paths kept by search_hits; ES drops shard info, scores and metadata
+HIT_FILTER_PATH = ["hits.hits._id", "hits.hits._source"]
+
 
 class AsyncElasticsearchClient:
     def __init__(self):
+        # Shared transport options: one keep-alive aiohttp pool per node, sized for
+        # concurrent msearch/aggregation bursts, with gzip-compressed request bodies
+        client_options = dict(
+            api_key=settings.elastic_api_key,
+            request_timeout=30,
+            node_class="aiohttp",
+            connections_per_node=settings.elastic_connections_per_node,
+            http_compress=True,
+            sniff_on_start=False,
+        )
+
         # Create async client
         if settings.elastic_cloud_id:
-            self.client = AsyncElasticsearch(
-                cloud_id=settings.elastic_cloud_id,
-                api_key=settings.elastic_api_key,
-                request_timeout=30,
-            )
+            self.client = AsyncElasticsearch(cloud_id=settings.elastic_cloud_id, **client_options)
         else:
-            self.client = AsyncElasticsearch(
-                hosts=[settings.elastic_endpoint],
-                api_key=settings.elastic_api_key,
-                request_timeout=30,
-            )
+            self.client = AsyncElasticsearch(hosts=[settings.elastic_endpoint], **client_options)
+
+        # Bulk loads in flight per index, so overlapping loads restore refresh_interval once
+        self._bulk_loads: Dict[str, int] = {}
+        self._saved_refresh_intervals: Dict[str, Optional[str]] = {}
+        # Per index: the first load's setup and the last load's restore are awaited, so
+        # they run under a lock to keep a concurrent load from reading a half-set state
+        self._bulk_load_locks: Dict[str, asyncio.Lock] = {}
 
         logger.info("Async Elasticsearch client initialized")
 
@@ -56,6 +73,43 @@ class AsyncElasticsearchClient:
         """Index a single document (compatible with DSL Document.save())"""
         return await self.client.index(index=index_name, document=document, id=id)
 
+    @asynccontextmanager
+    async def bulk_refresh_interval(self, index_name: str, interval: str = "30s"):
+        """
+        Relax the index's refresh_interval for the duration of a bulk load, then restore it
+        New documents may take up to interval to become searchable while the load runs
+        """
+        lock = self._bulk_load_locks.setdefault(index_name, asyncio.Lock())
+        async with lock:
+            if self._bulk_loads.get(index_name, 0) == 0:
+                current = await self.client.indices.get_settings(
+                    index=index_name, name="index.refresh_interval", flat_settings=True
+                )
+                previous = next(iter(current.body.values()), {}).get("settings", {})
+                previous = previous.get("index.refresh_interval")
+                # Another worker's load left the relaxed value in place: restore the default
+                self._saved_refresh_intervals[index_name] = (
+                    None if previous == interval else previous
+                )
+                await self.client.indices.put_settings(
+                    index=index_name, settings={"index.refresh_interval": interval}
+                )
+            self._bulk_loads[index_name] = self._bulk_loads.get(index_name, 0) + 1
+
+        try:
+            yield
+        finally:
+            async with lock:
+                self._bulk_loads[index_name] -= 1
+                if self._bulk_loads[index_name] == 0:
+                    # None resets the setting to the index default
+                    await self.client.indices.put_settings(
+                        index=index_name,
+                        settings={
+                            "index.refresh_interval": self._saved_refresh_intervals.pop(index_name)
+                        },
+                    )
+
     async def close(self):
         """Close the async client connection"""
         await self.client.close()
@@ -64,6 +118,14 @@ class AsyncElasticsearchClient:
         """Search documents"""
         return await self.client.search(index=index_name, body=body)
 
+    async def search_hits(self, index_name: str, body: dict):
+        """Search and return only each hit's _id and _source, pruned server-side"""
+        response = await self.client.search(
+            index=index_name, body=body, filter_path=HIT_FILTER_PATH
+        )
+        # An empty result is filtered down to {}
+        return response.body.get("hits", {}).get("hits", [])
+
     async def get_document(self, index_name: str, id: str):
         """Get a document by ID"""
         return await self.client.get(index=index_name, id=id)
@@ -1,12 +1,88 @@
 from app.core.config import get_settings
+from app.core.cache import TTLCache
 from app.services.elasticsearch_client import es_client
-from app.models.es_documents import KnowledgeArticle, CaseStudy, Dog
+from app.models.es_documents import KnowledgeArticle, CaseStudy, Dog, OutcomeDailyRollup
+from elasticsearch import NotFoundError
 from elasticsearch.dsl import AsyncSearch, Q
-from typing import List, Dict, Any, Optional
+from elasticsearch.helpers import async_bulk
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 import logging, datetime
 
 logger = logging.getLogger(__name__)
 
+# Common species names accepted by the API, mapped to the patient_species values stored
+# on case studies; anything else is matched as given
+PATIENT_SPECIES = {"dog": "canine", "cat": "feline"}
+
+# Similar-case results keyed by normalized (symptoms, species, size): symptom queries
+# repeat a lot, and each miss costs an inference-endpoint embedding plus a kNN search.
+# Case study writes invalidate it in the worker that handled them; the short TTL
+# bounds how long other workers keep serving results without the change
+case_search_cache = TTLCache(ttl=get_settings().case_search_cache_ttl, maxsize=1024)
+
+# Dashboard aggregation bodies are fixed, so they're built once here and sent as-is
+# instead of rebuilding and serializing DSL objects on every dashboard load
+_IS_SUCCESS = {"term": {"outcome": "success"}}
+
+# Raw outcomes: success counts are pushed down into filter sub-aggs so each bucket
+# exposes its success count directly; totals come from aggs, so skip hit tracking
+OUTCOMES_ANALYTICS_BODY = {
+    "size": 0,
+    "track_total_hits": False,
+    "aggs": {
+        "total": {"filter": {"match_all": {}}},
+        "success": {"filter": _IS_SUCCESS},
+        "returned": {
+            "filter": {"term": {"outcome": "returned"}},
+            "aggs": {"days_until_return": {"sum": {"field": "days_until_return"}}},
+        },
+        "by_experience": {
+            "terms": {"field": "adopter_experience_level"},
+            "aggs": {"success": {"filter": _IS_SUCCESS}},
+        },
+        "by_difficulty": {
+            "terms": {"field": "dog_difficulty_level"},
+            "aggs": {"success": {"filter": _IS_SUCCESS}},
+        },
+    },
+}
+
+DASHBOARD_SNAPSHOT_ID = "current"
+
+# Outcomes are only ever added, so a rollup or snapshot built before the newest
+# outcome's created_at is missing data
+NEWEST_OUTCOME_BODY = {
+    "size": 0,
+    "track_total_hits": False,
+    "aggs": {"newest": {"max": {"field": "created_at"}}},
+}
+
+_ROLLUP_COUNTS = {
+    "total": {"sum": {"field": "total_count"}},
+    "success": {"sum": {"field": "success_count"}},
+}
+
+# Daily rollup: sum the pre-aggregated counters
+ROLLUP_ANALYTICS_BODY = {
+    "size": 0,
+    "track_total_hits": False,
+    "aggs": {
+        **_ROLLUP_COUNTS,
+        "returned": {"sum": {"field": "returned_count"}},
+        "days_until_return": {"sum": {"field": "days_until_return_sum"}},
+        "rolled_up_at": {"max": {"field": "rolled_up_at"}},
+        "by_experience": {
+            "terms": {"field": "adopter_experience_level"},
+            "aggs": _ROLLUP_COUNTS,
+        },
+        "by_difficulty": {
+            "terms": {"field": "dog_difficulty_level"},
+            "aggs": _ROLLUP_COUNTS,
+        },
+    },
+}
+
 
 class ElasticsearchService:
     def __init__(self):
@@ -40,16 +116,31 @@ class ElasticsearchService:
             for hit in response
         ]
 
-    async def vector_search_cases(self, symptoms: List[str], size: int = 5) -> List[Dict[str, Any]]:
+    async def vector_search_cases(
+        self, symptoms: List[str], size: int = 5, species: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """
         Semantic search for similar cases using ES inference endpoint
         Note: ES handles embeddings automatically via semantic_text fields
+        A species filter is applied inside the query, so up to size matching cases come back
+        Symptoms are normalized (trimmed, lowercased, deduplicated, sorted), so the same set
+        in any order or case shares one cached result
         """
+        symptoms = tuple(sorted({symptom.strip().lower() for symptom in symptoms} - {""}))
+        return await case_search_cache.get_or_compute(
+            (symptoms, species, size), lambda: self._vector_search_cases(symptoms, size, species)
+        )
+
+    async def _vector_search_cases(
+        self, symptoms: Tuple[str, ...], size: int, species: Optional[str]
+    ) -> List[Dict[str, Any]]:
         query_text = " ".join(symptoms)
 
         # Build semantic search using AsyncSearch
         s = AsyncSearch(using=self.client, index=self.settings.case_studies_index)
         s = s.query("semantic", field="presenting_complaint", query=query_text)
+        if species:
+            s = s.filter("term", patient_species=PATIENT_SPECIES.get(species, species))
         s = s[0:size]
 
         response = await s.execute()
@@ -241,9 +332,12 @@ class ElasticsearchService:
             }
         return {}
 
-    async def get_realtime_analytics_from_es(self) -> Dict[str, Any]:
+    async def get_realtime_analytics_from_es(self, fresh: bool = False) -> Dict[str, Any]:
         """
         Get comprehensive analytics for dashboard using Elasticsearch DSL
+        Reads the pre-aggregated daily rollup index when it has been populated and is
+        newer than the latest outcome, otherwise (or with fresh=True) aggregates the
+        raw outcomes index
 
         Returns:
         - Overall success rate
@@ -252,26 +346,11 @@ class ElasticsearchService:
         - Average days until return (for failures)
         """
         try:
-            # Use AsyncSearch to get stats from Elasticsearch
-            s = AsyncSearch(using=self.client, index=self.settings.outcomes_index)
-            total_count = await s.count()
-
-            # Success count
-            success_s = s.filter("term", outcome="success")
-            success_count = await success_s.count()
-
-            # Calculate success rate
-            success_rate = (success_count / total_count * 100) if total_count > 0 else 0
-
-            analytics = {
-                "total_adoptions": total_count,
-                "successful_adoptions": success_count,
-                "overall_success_rate": round(success_rate, 2),
-                "data_source": "Elasticsearch (real-time)",
-                "last_updated": datetime.datetime.now().isoformat(),
-            }
+            analytics = None if fresh else await self._analytics_from_rollup()
+            if analytics is None:
+                analytics = await self._analytics_from_outcomes()
 
-            logger.info("Retrieved advanced analytics from Elasticsearch")
+            logger.info(f"Retrieved advanced analytics from {analytics['data_source']}")
 
             return analytics
 
@@ -279,6 +358,250 @@ class ElasticsearchService:
             logger.error(f"Error getting advanced analytics: {e}")
             raise
 
+    async def _search_aggregations(self, index: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a prebuilt zero-hit aggregation body through the shard request cache"""
+        response = await self.client.search(
+            index=index,
+            request_cache=True,
+            preference=self.settings.analytics_search_preference,
+            max_concurrent_shard_requests=self.settings.elastic_max_concurrent_shard_requests,
+            **body,
+        )
+        return response["aggregations"]
+
+    async def _analytics_from_outcomes(self) -> Dict[str, Any]:
+        """Aggregate the raw outcomes index in a single zero-hit search"""
+        aggs = await self._search_aggregations(
+            self.settings.outcomes_index, OUTCOMES_ANALYTICS_BODY
+        )
+
+        return self._build_analytics(
+            total_count=aggs["total"]["doc_count"],
+            success_count=aggs["success"]["doc_count"],
+            returned_count=aggs["returned"]["doc_count"],
+            days_until_return_sum=aggs["returned"]["days_until_return"]["value"],
+            by_experience=[
+                (b["key"], b["doc_count"], b["success"]["doc_count"])
+                for b in aggs["by_experience"]["buckets"]
+            ],
+            by_difficulty=[
+                (b["key"], b["doc_count"], b["success"]["doc_count"])
+                for b in aggs["by_difficulty"]["buckets"]
+            ],
+            data_source="Elasticsearch (real-time)",
+            last_updated=datetime.datetime.now().isoformat(),
+        )
+
+    async def _analytics_from_rollup(self) -> Optional[Dict[str, Any]]:
+        """
+        Sum the pre-aggregated daily rollup docs
+        Returns None when the rollup index is missing or empty
+        """
+        try:
+            aggs, newest_outcome = await asyncio.gather(
+                self._search_aggregations(
+                    self.settings.outcomes_daily_index, ROLLUP_ANALYTICS_BODY
+                ),
+                self._newest_outcome_millis(),
+            )
+        except NotFoundError:
+            return None
+
+        if not aggs["total"]["value"]:
+            return None
+
+        # Outcomes recorded since the last rollup aren't in it
+        if newest_outcome and newest_outcome > (aggs["rolled_up_at"]["value"] or 0):
+            logger.info("Daily rollup is older than the newest outcome; using raw outcomes")
+            return None
+
+        return self._build_analytics(
+            total_count=int(aggs["total"]["value"]),
+            success_count=int(aggs["success"]["value"]),
+            returned_count=int(aggs["returned"]["value"]),
+            days_until_return_sum=aggs["days_until_return"]["value"],
+            by_experience=[
+                (b["key"], int(b["total"]["value"]), int(b["success"]["value"]))
+                for b in aggs["by_experience"]["buckets"]
+            ],
+            by_difficulty=[
+                (b["key"], int(b["total"]["value"]), int(b["success"]["value"]))
+                for b in aggs["by_difficulty"]["buckets"]
+            ],
+            data_source="Elasticsearch (daily rollup)",
+            last_updated=aggs["rolled_up_at"].get("value_as_string"),
+        )
+
+    async def _newest_outcome_millis(self) -> Optional[float]:
+        """created_at of the most recent outcome as epoch millis, None when there are none"""
+        aggs = await self._search_aggregations(self.settings.outcomes_index, NEWEST_OUTCOME_BODY)
+        return aggs["newest"]["value"]
+
+    async def rollup_outcomes_daily(self) -> Dict[str, Any]:
+        """
+        Pre-aggregate outcomes into one doc per (day, experience level, difficulty level)
+        Run this as a nightly batch job; the dashboard then sums a handful of rollup
+        docs instead of re-aggregating every outcome
+        """
+        await OutcomeDailyRollup.init(using=self.client)
+
+        rolled_up_at = datetime.datetime.now()
+        sources = [
+            {
+                "date": {
+                    "date_histogram": {
+                        "field": "adoption_date",
+                        "calendar_interval": "day",
+                        "format": "yyyy-MM-dd",
+                        "missing_bucket": True,
+                    }
+                }
+            },
+            {"experience": {"terms": {"field": "adopter_experience_level", "missing_bucket": True}}},
+            {"difficulty": {"terms": {"field": "dog_difficulty_level", "missing_bucket": True}}},
+        ]
+
+        actions = []
+        after = None
+        while True:
+            s = AsyncSearch(using=self.client, index=self.settings.outcomes_index)[0:0]
+            s = s.extra(track_total_hits=False)
+            composite = {"sources": sources, "size": 1000}
+            if after:
+                composite["after"] = after
+            daily = s.aggs.bucket("daily", "composite", **composite)
+            daily.bucket("success", "filter", Q("term", outcome="success"))
+            daily.bucket("returned", "filter", Q("term", outcome="returned")).metric(
+                "days_until_return", "sum", field="days_until_return"
+            )
+
+            response = await s.execute()
+            buckets = response.aggregations.daily.buckets
+            for b in buckets:
+                key = b.key.to_dict()
+                doc = OutcomeDailyRollup(
+                    meta={"id": f"{key['date']}|{key['experience']}|{key['difficulty']}"},
+                    date=key["date"],
+                    adopter_experience_level=key["experience"],
+                    dog_difficulty_level=key["difficulty"],
+                    total_count=b.doc_count,
+                    success_count=b.success.doc_count,
+                    returned_count=b.returned.doc_count,
+                    days_until_return_sum=b.returned.days_until_return.value or 0,
+                    rolled_up_at=rolled_up_at,
+                )
+                actions.append(doc.to_dict(include_meta=True))
+
+            after = getattr(response.aggregations.daily, "after_key", None)
+            if not buckets or after is None:
+                break
+            after = after.to_dict()
+
+        if actions:
+            # Refresh so the stale-doc sweep below sees the rewritten docs
+            await async_bulk(self.client, actions, refresh=True)
+
+        # Drop rollup docs for combinations that no longer exist
+        stale = AsyncSearch(using=self.client, index=self.settings.outcomes_daily_index)
+        await stale.filter("range", rolled_up_at={"lt": rolled_up_at}).delete()
+
+        logger.info(f"Rolled up outcomes into {len(actions)} daily docs")
+
+        return {
+            "rollup_docs": len(actions),
+            "index": self.settings.outcomes_daily_index,
+            "timestamp": rolled_up_at.isoformat(),
+        }
+
+    async def materialize_dashboard(self) -> Dict[str, Any]:
+        """
+        Compute the dashboard analytics and store them as a single snapshot doc
+        Run after the nightly rollup; /dashboard then serves the snapshot with one GET
+        until a newer outcome is recorded
+        """
+        # Read before computing, so an outcome added meanwhile marks the snapshot stale
+        outcomes_through = await self._newest_outcome_millis()
+        analytics = await self.get_realtime_analytics_from_es()
+
+        # The snapshot is only ever fetched by id, so none of its fields are indexed
+        await self.client.options(ignore_status=400).indices.create(
+            index=self.settings.dashboard_snapshot_index, mappings={"dynamic": False}
+        )
+        await self.client.index(
+            index=self.settings.dashboard_snapshot_index,
+            id=DASHBOARD_SNAPSHOT_ID,
+            document={**analytics, "outcomes_through": outcomes_through},
+        )
+        logger.info("Materialized dashboard snapshot")
+
+        return analytics
+
+    async def get_dashboard_analytics(self) -> Dict[str, Any]:
+        """
+        Serve the materialized dashboard snapshot, computing the analytics directly
+        when no snapshot has been written yet or outcomes were added since
+        """
+        try:
+            response, newest_outcome = await asyncio.gather(
+                self.client.get(
+                    index=self.settings.dashboard_snapshot_index, id=DASHBOARD_SNAPSHOT_ID
+                ),
+                self._newest_outcome_millis(),
+            )
+        except NotFoundError:
+            return await self.get_realtime_analytics_from_es()
+
+        snapshot = response["_source"]
+        outcomes_through = snapshot.pop("outcomes_through", None)
+        if newest_outcome and (outcomes_through is None or newest_outcome > outcomes_through):
+            logger.info("Dashboard snapshot is older than the newest outcome; recomputing")
+            return await self.get_realtime_analytics_from_es()
+        return snapshot
+
+    def _build_analytics(
+        self,
+        total_count: int,
+        success_count: int,
+        returned_count: int,
+        days_until_return_sum: Optional[float],
+        by_experience: List[tuple],
+        by_difficulty: List[tuple],
+        data_source: str,
+        last_updated: str,
+    ) -> Dict[str, Any]:
+        """Shape dashboard counts into the response payload"""
+        # Calculate success rate
+        success_rate = (success_count / total_count * 100) if total_count > 0 else 0
+        avg_days_until_return = (
+            round(days_until_return_sum / returned_count, 1)
+            if returned_count and days_until_return_sum is not None
+            else None
+        )
+
+        return {
+            "total_adoptions": total_count,
+            "successful_adoptions": success_count,
+            "returned_adoptions": returned_count,
+            "overall_success_rate": round(success_rate, 2),
+            "success_by_experience": self._success_breakdown(by_experience),
+            "success_by_difficulty": self._success_breakdown(by_difficulty),
+            "avg_days_until_return": avg_days_until_return,
+            "data_source": data_source,
+            "last_updated": last_updated,
+        }
+
+    @staticmethod
+    def _success_breakdown(rows: List[tuple]) -> List[Dict[str, Any]]:
+        """Turn (level, total, successful) rows into success-rate entries"""
+        return [
+            {
+                "level": level,
+                "total": total,
+                "successful": successful,
+                "success_rate": round(successful / total * 100, 2) if total else 0,
+            }
+            for level, total, successful in rows
+        ]
 
 es_service = ElasticsearchService()
 
@@ -2,7 +2,7 @@
 Language detection service using Vertex AI Gemini
 Provides fast, accurate language detection for multilingual content
 """
-from typing import Optional
+from typing import List, Optional
 from app.core.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -20,6 +20,19 @@ async def detect_language(text: str) -> str:
     Returns:
         Language code (e.g., 'en', 'ko', 'es', 'zh', 'ja')
     """
+    return _detect_language(text)
+
+
+def detect_languages_batch(texts: List[str]) -> List[str]:
+    """
+    Detect the language of each text in one call, preserving order.
+    Synchronous so callers can run a whole batch in a single worker thread.
+    """
+    return [_detect_language(text) for text in texts]
+
+
+def _detect_language(text: str) -> str:
+    """Heuristic language detection shared by the single and batch entry points"""
     if not text or len(text.strip()) < 5:
         return 'en'
     
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, Any, List, Optional
 from app.services.elasticsearch_service import es_service
 from app.core.config import get_settings
@@ -20,25 +21,27 @@ class MatchingService:
         """
         from app.services.vertex_gemini_service import vertex_gemini_service
 
-        # Generate formatted summary using Gemini
-        formatted_summary = await vertex_gemini_service.format_application_summary(application_text)
-
-        # Find similar past adopters (successes)
-        similar_successes = await es_service.semantic_search(
-            index=settings.outcomes_index,
-            query=application_text,
-            semantic_field="success_factors",
-            filters=[{"outcome": "success"}],
-            size=10,
-        )
-
-        # Find similar failures
-        similar_failures = await es_service.semantic_search(
-            index=settings.outcomes_index,
-            query=application_text,
-            semantic_field="failure_factors",
-            filters=[{"outcome": "returned"}],
-            size=10,
+        # The Gemini summary and both outcome searches are independent, so they run
+        # concurrently: the wait is the slowest of the three, not their sum
+        formatted_summary, similar_successes, similar_failures = await asyncio.gather(
+            # Generate formatted summary using Gemini
+            vertex_gemini_service.format_application_summary(application_text),
+            # Find similar past adopters (successes)
+            es_service.semantic_search(
+                index=settings.outcomes_index,
+                query=application_text,
+                semantic_field="success_factors",
+                filters=[{"outcome": "success"}],
+                size=10,
+            ),
+            # Find similar failures
+            es_service.semantic_search(
+                index=settings.outcomes_index,
+                query=application_text,
+                semantic_field="failure_factors",
+                filters=[{"outcome": "returned"}],
+                size=10,
+            ),
         )
 
         # Extract patterns
@@ -140,30 +143,32 @@ class MatchingService:
         Uses both success and failure patterns
         """
         # Get dog and application data
-        dog = await es_service.get_document(settings.dogs_index, dog_id)
-        application = await es_service.get_document(settings.applications_index, application_id)
+        dog, application = await asyncio.gather(
+            es_service.get_document(settings.dogs_index, dog_id),
+            es_service.get_document(settings.applications_index, application_id),
+        )
 
         # Build search query
         search_text = (
             f"{dog['personality_traits']} {dog['behavioral_notes']} " f"{application['motivation']}"
         )
 
-        # Find similar successful outcomes
-        success_results = await es_service.semantic_search(
-            index=settings.outcomes_index,
-            query=search_text,
-            semantic_field="success_factors",
-            filters=[{"outcome": "success"}],
-            size=10,
-        )
-
-        # Find similar failed outcomes
-        failure_results = await es_service.semantic_search(
-            index=settings.outcomes_index,
-            query=search_text,
-            semantic_field="failure_factors",
-            filters=[{"outcome": "returned"}],
-            size=10,
+        # Find similar successful and failed outcomes concurrently
+        success_results, failure_results = await asyncio.gather(
+            es_service.semantic_search(
+                index=settings.outcomes_index,
+                query=search_text,
+                semantic_field="success_factors",
+                filters=[{"outcome": "success"}],
+                size=10,
+            ),
+            es_service.semantic_search(
+                index=settings.outcomes_index,
+                query=search_text,
+                semantic_field="failure_factors",
+                filters=[{"outcome": "returned"}],
+                size=10,
+            ),
         )
 
         # Calculate prediction
@@ -0,0 +1,149 @@
+"""
+Semantic response cache
+Serves Gemini outputs for messages that mean the same as one answered recently,
+matched by embedding similarity in Elasticsearch
+"""
+import asyncio
+import re
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional, Set
+
+from app.services.elasticsearch_client import es_client
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+
+settings = get_settings()
+logger = setup_logger(__name__)
+
+# Numbers change the answer ("top 3" vs "top 5") while barely moving the embedding,
+# so a hit must also carry exactly the same numbers as the message
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+class SemanticResponseCache:
+    """
+    Caches responses per namespace (one per Gemini call, since their outputs differ)
+    under a semantic_text copy of the message; ES embeds it with the inference endpoint
+    A lookup is one semantic query for the closest message younger than the TTL
+    Failures never reach callers: the cache just misses, and turns itself off for this
+    process if its index can't be created
+    """
+
+    def __init__(self):
+        self.index_name = settings.gemini_cache_index
+        self._ready: Optional["asyncio.Future[bool]"] = None
+        self._writes: Set["asyncio.Task[None]"] = set()
+
+    async def get_or_generate(
+        self,
+        namespace: str,
+        message: str,
+        generate: Callable[[], Awaitable[Any]],
+        should_store: Callable[[Any], bool] = lambda response: True,
+    ) -> Any:
+        """
+        Return a cached response for a near-identical message, or generate one and store
+        it unless should_store rejects it (e.g. a fallback returned after a Gemini error)
+        """
+        cached = await self.get(namespace, message)
+        if cached is not None:
+            return cached
+
+        response = await generate()
+        if should_store(response):
+            await self.put(namespace, message, response)
+        return response
+
+    async def get(self, namespace: str, message: str) -> Optional[Any]:
+        """Cached response for a near-identical message, or None"""
+        numbers = " ".join(NUMBER_PATTERN.findall(message))
+        cached = await self._lookup(namespace, message, numbers)
+        if cached is not None:
+            logger.info(f"Semantic cache hit for {namespace}")
+        return cached
+
+    async def put(self, namespace: str, message: str, response: Any) -> None:
+        """Store a response for the message in the background"""
+        # Indexing embeds the message too, so it runs after the response is returned
+        if await self._ensure_index():
+            numbers = " ".join(NUMBER_PATTERN.findall(message))
+            task = asyncio.create_task(self._store(namespace, message, numbers, response))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    async def _ensure_index(self) -> bool:
+        """Create the cache index once per process; False if that failed"""
+        if self._ready is None:
+            self._ready = asyncio.ensure_future(self._create_index())
+        return await asyncio.shield(self._ready)
+
+    async def _create_index(self) -> bool:
+        try:
+            # Responses are only returned, never searched, so they aren't indexed
+            await es_client.client.options(ignore_status=400).indices.create(
+                index=self.index_name,
+                mappings={
+                    "dynamic": False,
+                    "properties": {
+                        "message": {
+                            "type": "semantic_text",
+                            "inference_id": settings.gemini_cache_inference_id,
+                        },
+                        "namespace": {"type": "keyword"},
+                        "numbers": {"type": "keyword"},
+                        "response": {"type": "object", "enabled": False},
+                        "created_at": {"type": "date"},
+                    },
+                },
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Semantic response cache disabled, index unavailable: {e}")
+            return False
+
+    async def _lookup(self, namespace: str, message: str, numbers: str) -> Optional[Any]:
+        if not await self._ensure_index():
+            return None
+
+        body = {
+            "size": 1,
+            "min_score": settings.gemini_cache_min_score,
+            "track_total_hits": False,
+            "_source": ["response"],
+            "query": {
+                "bool": {
+                    "must": {"semantic": {"field": "message", "query": message}},
+                    "filter": [
+                        {"term": {"namespace": namespace}},
+                        {"term": {"numbers": numbers}},
+                        {"range": {"created_at": {"gte": f"now-{settings.gemini_cache_ttl}s"}}},
+                    ],
+                }
+            },
+        }
+        try:
+            hits = await es_client.search_hits(self.index_name, body)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed for {namespace}: {e}")
+            return None
+        return hits[0]["_source"]["response"]["value"] if hits else None
+
+    async def _store(self, namespace: str, message: str, numbers: str, response: Any):
+        try:
+            await es_client.client.index(
+                index=self.index_name,
+                document={
+                    "message": message,
+                    "namespace": namespace,
+                    "numbers": numbers,
+                    # Wrapped so string and dict responses both fit the object field
+                    "response": {"value": response},
+                    "created_at": datetime.now(),
+                },
+                refresh=False,
+            )
+        except Exception as e:
+            logger.warning(f"Semantic cache write failed for {namespace}: {e}")
+
+
+gemini_response_cache = SemanticResponseCache()
@@ -1,14 +1,18 @@
 from google.cloud import storage
+from google.api_core.exceptions import NotFound, PreconditionFailed
 from app.core.config import get_settings
 import uuid
 import json
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, BinaryIO
 from datetime import datetime
 from app.core.logger import setup_logger
 
 settings = get_settings()
 logger = setup_logger(__name__)
 
+# Conditional chat history writes that lose to a concurrent write are retried this often
+CHAT_WRITE_ATTEMPTS = 5
+
 
 class StorageService:
     def __init__(self):
@@ -34,6 +38,23 @@ class StorageService:
 
         return blob.public_url
 
+    def upload_image_file(
+        self, file_obj: BinaryIO, content_type: str, size: Optional[int] = None
+    ) -> Optional[str]:
+        """Upload image from a file object (e.g. an upload's spooled file) and return public URL"""
+        if not self.bucket:
+            return None
+
+        # Generate unique filename
+        filename = f"images/{uuid.uuid4()}.jpg"
+        blob = self.bucket.blob(filename)
+
+        # The client reads the file itself, so the image is never copied into a bytes object
+        blob.upload_from_file(file_obj, size=size, content_type=content_type, rewind=True)
+        blob.make_public()
+
+        return blob.public_url
+
     def delete_image(self, image_url: str):
         """Delete image from GCS"""
         if not self.bucket:
@@ -60,6 +81,34 @@ class StorageService:
         Save a chat message to GCS
         Storage path: chat-history/{session_id}/messages.json
         """
+        return self.append_chat_messages(
+            session_id, [self.build_chat_message(role, content, intent, metadata)]
+        )
+
+    @staticmethod
+    def build_chat_message(
+        role: str,
+        content: str,
+        intent: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """A chat history entry, timestamped now"""
+        return {
+            "role": role,
+            "content": content,
+            "intent": intent,
+            "timestamp": datetime.now().isoformat(),
+            "metadata": metadata or {}
+        }
+
+    def append_chat_messages(self, session_id: str, new_messages: List[Dict[str, Any]]) -> bool:
+        """
+        Append messages to a session's history in one read-modify-write of its blob
+        Storage path: chat-history/{session_id}/messages.json
+        The write is conditional on the blob being unchanged since it was read, so
+        concurrent writers (other requests, other workers) retry instead of dropping
+        each other's messages
+        """
         if not self.bucket:
             logger.warning("GCS bucket not configured, cannot save chat history")
             return False
@@ -67,45 +116,68 @@ class StorageService:
         try:
             # Path for this session's messages
             blob_path = f"chat-history/{session_id}/messages.json"
-            blob = self.bucket.blob(blob_path)
-
-            # Get existing messages or create new list
-            messages = []
-            if blob.exists():
-                existing_data = blob.download_as_text()
-                messages = json.loads(existing_data)
-
-            # Add new message
-            message_data = {
-                "role": role,
-                "content": content,
-                "intent": intent,
-                "timestamp": datetime.now().isoformat(),
-                "metadata": metadata or {}
-            }
-            messages.append(message_data)
 
             # Log metadata for debugging
-            if metadata:
-                logger.info(f"Saving message with metadata keys: {list(metadata.keys())}")
-                if 'matches' in metadata:
-                    logger.info(f"  - Saving {len(metadata['matches'])} matches")
-                if 'applicationAnalysis' in metadata:
-                    logger.info(f"  - Saving applicationAnalysis")
-            else:
-                logger.info("Saving message with no metadata")
+            for message in new_messages:
+                metadata = message["metadata"]
+                if metadata:
+                    logger.info(f"Saving message with metadata keys: {list(metadata.keys())}")
+                    if 'matches' in metadata:
+                        logger.info(f"  - Saving {len(metadata['matches'])} matches")
+                    if 'applicationAnalysis' in metadata:
+                        logger.info(f"  - Saving applicationAnalysis")
+                else:
+                    logger.info("Saving message with no metadata")
+
+            for _ in range(CHAT_WRITE_ATTEMPTS):
+                if self._try_append_chat_messages(blob_path, new_messages):
+                    logger.info(f"Saved {len(new_messages)} message(s) to session {session_id}")
+                    return True
+                logger.info(f"Chat history for session {session_id} changed while appending; retrying")
+
+            logger.error(
+                f"Gave up saving to session {session_id} after {CHAT_WRITE_ATTEMPTS} conflicting writes"
+            )
+            return False
+
+        except Exception as e:
+            logger.error(f"Error saving chat message: {e}")
+            return False
 
-            # Save back to GCS
+    def _try_append_chat_messages(self, blob_path: str, new_messages: List[Dict[str, Any]]) -> bool:
+        """One conditional read-modify-write; False when another write got in first"""
+        # get_blob loads the generation and custom metadata with the existence check;
+        # a missing blob is a new session, which must still not exist when uploading
+        blob = self.bucket.get_blob(blob_path)
+        try:
+            if blob is None:
+                blob = self.bucket.blob(blob_path)
+                messages = []
+                preconditions = {"if_generation_match": 0}
+            else:
+                messages = json.loads(blob.download_as_text(if_generation_match=blob.generation))
+                # Metageneration too, so a rename landing meanwhile isn't overwritten
+                preconditions = {
+                    "if_generation_match": blob.generation,
+                    "if_metageneration_match": blob.metageneration,
+                }
+                # A new generation doesn't inherit custom metadata; resend the chat name
+                if blob.metadata:
+                    blob.metadata = blob.metadata
+
+            # Add new messages
+            messages.extend(new_messages)
+
+            # Save back to GCS; compact JSON keeps the upload a single multipart request
+            # for longer than pretty-printing would
             blob.upload_from_string(
-                json.dumps(messages, indent=2),
-                content_type="application/json"
+                json.dumps(messages, separators=(",", ":")),
+                content_type="application/json",
+                **preconditions,
             )
-
-            logger.info(f"Saved message to session {session_id}")
             return True
 
-        except Exception as e:
-            logger.error(f"Error saving chat message: {e}")
+        except (PreconditionFailed, NotFound):
             return False
 
     def get_chat_history(self, session_id: str) -> Optional[Dict[str, Any]]:
@@ -117,10 +189,11 @@ class StorageService:
             return None
 
         try:
+            # get_blob loads the metadata with the existence check, so no reload() later
             blob_path = f"chat-history/{session_id}/messages.json"
-            blob = self.bucket.blob(blob_path)
+            blob = self.bucket.get_blob(blob_path)
 
-            if not blob.exists():
+            if blob is None:
                 return None
 
             # Download messages
@@ -137,7 +210,6 @@ class StorageService:
                     logger.info(f"    Metadata keys: {meta_keys}")
 
             # Get timestamps
-            blob.reload()  # Load metadata
             created_at = blob.time_created
             updated_at = blob.updated
 
@@ -214,27 +286,42 @@ class StorageService:
             return []
 
     def update_chat_name(self, session_id: str, name: str) -> bool:
-        """Update the custom name of a chat session"""
+        """
+        Update the custom name of a chat session
+        The metadata patch is conditional like appends are, so a rename and a message
+        write landing together can't undo one another
+        """
         if not self.bucket:
             return False
 
         try:
             blob_path = f"chat-history/{session_id}/messages.json"
-            blob = self.bucket.blob(blob_path)
-
-            if not blob.exists():
-                logger.warning(f"Chat session {session_id} not found")
-                return False
 
-            # Update metadata with custom name
-            blob.reload()  # Load current metadata
-            metadata = blob.metadata or {}
-            metadata["chat_name"] = name
-            blob.metadata = metadata
-            blob.patch()  # Update only metadata
+            for _ in range(CHAT_WRITE_ATTEMPTS):
+                # get_blob loads the current metadata with the existence check
+                blob = self.bucket.get_blob(blob_path)
+                if blob is None:
+                    logger.warning(f"Chat session {session_id} not found")
+                    return False
+
+                # Update metadata with custom name
+                blob.metadata = {**(blob.metadata or {}), "chat_name": name}
+                try:
+                    blob.patch(  # Update only metadata
+                        if_generation_match=blob.generation,
+                        if_metageneration_match=blob.metageneration,
+                    )
+                except (PreconditionFailed, NotFound):
+                    logger.info(f"Chat session {session_id} changed while renaming; retrying")
+                    continue
+
+                logger.info(f"Updated chat session {session_id} name to '{name}'")
+                return True
 
-            logger.info(f"Updated chat session {session_id} name to '{name}'")
-            return True
+            logger.error(
+                f"Gave up renaming session {session_id} after {CHAT_WRITE_ATTEMPTS} conflicting writes"
+            )
+            return False
 
         except Exception as e:
             logger.error(f"Error updating chat name: {e}")
@@ -260,6 +347,42 @@ class StorageService:
             logger.error(f"Error deleting chat session: {e}")
             return False
 
+    # ========================================
+    # SEARCH RESULT METHODS
+    # ========================================
+
+    def upload_search_results(self, query_id: str, matches: List[Dict[str, Any]]) -> bool:
+        """
+        Store a chat search's matches once, so chat history can refer to them by query_id
+        Storage path: search-results/{query_id}.json
+        """
+        if not self.bucket:
+            return False
+
+        try:
+            blob = self.bucket.blob(f"search-results/{query_id}.json")
+            blob.upload_from_string(json.dumps(matches), content_type="application/json")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving search results {query_id}: {e}")
+            return False
+
+    def get_search_results(self, query_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Matches stored by upload_search_results, or None if there are none"""
+        if not self.bucket:
+            return None
+
+        try:
+            blob = self.bucket.blob(f"search-results/{query_id}.json")
+            return json.loads(blob.download_as_text())
+
+        except NotFound:
+            return None
+        except Exception as e:
+            logger.error(f"Error loading search results {query_id}: {e}")
+            return None
+
 
 # Create singleton instance
 storage_service = StorageService()
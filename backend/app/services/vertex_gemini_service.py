@@ -1,6 +1,6 @@
 # app/services/vertex_ai_service.py
 from __future__ import annotations
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional
 import json
 import anyio
 
@@ -16,6 +16,9 @@ from app.core.logger import setup_logger
 settings = get_settings()
 logger = setup_logger(__name__)
 
+# Returned by generate_response when Gemini fails, so callers can tell it from a reply
+GENERATE_RESPONSE_FALLBACK = "I apologize, I'm having trouble processing your request right now."
+
 
 class VertexGeminiService:
     """
@@ -858,7 +861,28 @@ RULES:
             return (response.text or "").strip()
         except Exception as e:
             logger.error(f"Error generating response: {e}")
-            return "I apologize, I'm having trouble processing your request right now."
+            return GENERATE_RESPONSE_FALLBACK
+
+    async def generate_response_stream(
+        self, prompt: str, context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """generate_response, yielding the text in chunks as Gemini produces it"""
+        produced = False
+        try:
+            full_prompt = f"Context: {context}\n\n{prompt}" if context else prompt
+            stream = await self.client.aio.models.generate_content_stream(
+                model=self.model_id,
+                contents=full_prompt,
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    produced = True
+                    yield chunk.text
+        except Exception as e:
+            logger.error(f"Error streaming response: {e}")
+            # Text already sent can't be taken back; only a reply that never started falls back
+            if not produced:
+                yield GENERATE_RESPONSE_FALLBACK
 
     async def generate_applicant_details(
         self, query: str, applicant_data: Dict[str, Any]
@@ -75,14 +75,11 @@ async def search_similar_cases(symptoms: List[str], species: str = "dog") -> Dic
         }
 
     try:
-        # Search case studies index for similar medical cases
-        cases = await es_service.vector_search_cases(symptoms, size=10)
-
-        # Filter by species
-        cases = [c for c in cases if c.get("species", "dog") == species]
+        # Search case studies index for similar medical cases of this species
+        cases = await es_service.vector_search_cases(symptoms, size=5, species=species)
 
         formatted_cases = []
-        for case in cases[:5]:  # Limit to top 5 results
+        for case in cases:
             formatted_cases.append(
                 {
                     "case_id": case.get("case_id"),
@@ -0,0 +1,29 @@
+"""
+Shared test setup
+App modules build their settings and Google clients at import time; without a .env or
+Application Default Credentials, test values stand in so the suite runs offline.
+Elasticsearch and GCS calls are mocked per test
+"""
+import os
+
+import google.auth
+from google.auth.credentials import AnonymousCredentials
+from google.auth.exceptions import DefaultCredentialsError
+
+TEST_SETTINGS = {
+    "ELASTIC_CLOUD_ID": "",
+    "ELASTIC_ENDPOINT": "http://localhost:9200",
+    "ELASTIC_API_KEY": "test-api-key",
+    "GCP_PROJECT_ID": "test-project",
+    "GCP_REGION": "us-central1",
+    "VERTEX_AI_LOCATION": "us-central1",
+    "DOC_AI_PROCESSOR_ID": "test-processor",
+    "GEMINI_MODEL": "gemini-1.5-flash",
+}
+for name, value in TEST_SETTINGS.items():
+    os.environ.setdefault(name, value)
+
+try:
+    google.auth.default()
+except DefaultCredentialsError:
+    google.auth.default = lambda *args, **kwargs: (AnonymousCredentials(), "test-project")
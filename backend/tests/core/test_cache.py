@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Controls time.monotonic() as seen by the cache module"""
+    now = {"t": 1000.0}
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now["t"])
+    return now
+
+
+def test_get_returns_value_until_ttl_expires(fake_clock):
+    cache = TTLCache(ttl=30)
+    cache.set(("expert", None), {"success_rate": 90.0})
+
+    fake_clock["t"] += 29
+    assert cache.get(("expert", None)) == {"success_rate": 90.0}
+
+    fake_clock["t"] += 2
+    assert cache.get(("expert", None)) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted(fake_clock):
+    cache = TTLCache(ttl=30, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_invalidate_single_key_and_all(fake_clock):
+    cache = TTLCache(ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_only_computes_on_miss(fake_clock):
+    cache = TTLCache(ttl=30)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"total_adoptions": len(calls)}
+
+    assert await cache.get_or_compute("dashboard", compute) == {"total_adoptions": 1}
+    assert await cache.get_or_compute("dashboard", compute) == {"total_adoptions": 1}
+
+    fake_clock["t"] += 31
+    assert await cache.get_or_compute("dashboard", compute) == {"total_adoptions": 2}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_computation(fake_clock):
+    cache = TTLCache(ttl=30)
+    calls = []
+    release = asyncio.Event()
+
+    async def compute():
+        calls.append(1)
+        await release.wait()
+        return "prediction"
+
+    waiters = [asyncio.ensure_future(cache.get_or_compute("key", compute)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["prediction"] * 5
+    assert len(calls) == 1
+    assert cache.get("key") == "prediction"
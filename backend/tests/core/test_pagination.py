@@ -0,0 +1,89 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import HTTPException, Response
+from elasticsearch.dsl import AsyncSearch
+
+from app.core import pagination
+from app.core.pagination import decode_cursor, encode_cursor, search_page_after
+
+
+def search_result(pit_id, hits):
+    """Stand-in for the client's ObjectApiResponse"""
+    body = {"pit_id": pit_id, "hits": {"hits": hits}} if hits else {"pit_id": pit_id}
+    result = MagicMock()
+    result.body = body
+    result.__getitem__.side_effect = body.__getitem__
+    return result
+
+
+@pytest.fixture
+def mock_es(mocker):
+    """Replaces the Elasticsearch client used for PIT searches"""
+    client = MagicMock()
+    client.open_point_in_time = AsyncMock(return_value={"id": "pit-1"})
+    client.close_point_in_time = AsyncMock()
+    client.search = AsyncMock()
+    mocker.patch.object(pagination, "es_client", MagicMock(client=client))
+    return client
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("pit-1", ["2024-01-01T00:00:00", 42])
+    assert decode_cursor(cursor) == ("pit-1", ["2024-01-01T00:00:00", 42])
+
+
+# "e30=" decodes to an empty JSON object
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30="])
+def test_bad_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_first_full_page_opens_pit_and_sets_next_cursor(mock_es):
+    hits = [{"_id": "a", "sort": [2, 10]}, {"_id": "b", "sort": [1, 11]}]
+    mock_es.search.return_value = search_result("pit-2", hits)
+    response = Response()
+
+    page = await search_page_after(
+        AsyncSearch().sort("-created_at"), "applications", "", 2, response
+    )
+
+    assert page == hits
+    mock_es.open_point_in_time.assert_awaited_once_with(
+        index="applications", keep_alive=pagination.PIT_KEEP_ALIVE
+    )
+    body = mock_es.search.await_args.kwargs["body"]
+    assert body["size"] == 2
+    assert body["pit"] == {"id": "pit-1", "keep_alive": pagination.PIT_KEEP_ALIVE}
+    assert "search_after" not in body
+    # The cursor carries the PIT id from the latest response
+    assert decode_cursor(response.headers["X-Next-Cursor"]) == ("pit-2", [1, 11])
+    mock_es.close_point_in_time.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_last_page_resumes_from_cursor_and_closes_pit(mock_es):
+    mock_es.search.return_value = search_result("pit-2", [{"_id": "c", "sort": [0, 12]}])
+    response = Response()
+
+    page = await search_page_after(
+        AsyncSearch(), "applications", encode_cursor("pit-2", [1, 11]), 2, response
+    )
+
+    assert [hit["_id"] for hit in page] == ["c"]
+    mock_es.open_point_in_time.assert_not_awaited()
+    body = mock_es.search.await_args.kwargs["body"]
+    assert body["pit"]["id"] == "pit-2"
+    assert body["search_after"] == [1, 11]
+    assert "X-Next-Cursor" not in response.headers
+    mock_es.close_point_in_time.assert_awaited_once_with(id="pit-2")
+
+
+@pytest.mark.asyncio
+async def test_empty_page_closes_pit(mock_es):
+    mock_es.search.return_value = search_result("pit-1", [])
+
+    assert await search_page_after(AsyncSearch(), "applications", "", 5, Response()) == []
+    mock_es.close_point_in_time.assert_awaited_once_with(id="pit-1")
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from app.services import bulk_write_buffer as buffer_module
+from app.services.bulk_write_buffer import BulkWriteBuffer
+
+
+@pytest.fixture
+def bulk_calls(mocker):
+    """Fakes async_streaming_bulk; records each batch and fails docs whose id starts with 'bad'"""
+    calls = []
+
+    async def fake_streaming_bulk(client, actions, **kwargs):
+        calls.append([action["_id"] for action in actions])
+        await asyncio.sleep(0)  # yield so concurrent flushes can interleave
+        for action in actions:
+            if action["_id"].startswith("bad"):
+                yield False, {"index": {"_id": action["_id"], "error": "mapper_parsing_exception"}}
+            else:
+                yield True, {"index": {"_id": action["_id"], "result": "created"}}
+
+    mocker.patch.object(buffer_module, "es_client")
+    mocker.patch.object(buffer_module, "async_streaming_bulk", fake_streaming_bulk)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_documents_queued_together_share_one_bulk_call(bulk_calls):
+    buffer = BulkWriteBuffer(flush_interval=0.01)
+
+    results = await asyncio.gather(
+        *(buffer.index("outcomes", f"doc-{i}", {"n": i}) for i in range(3))
+    )
+
+    assert bulk_calls == [["doc-0", "doc-1", "doc-2"]]
+    assert [result["_id"] for result in results] == ["doc-0", "doc-1", "doc-2"]
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_flushes_without_waiting_for_timer(bulk_calls):
+    buffer = BulkWriteBuffer(flush_interval=60, max_batch=2)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(buffer.index("outcomes", "a", {}), buffer.index("outcomes", "b", {})),
+        timeout=1,
+    )
+
+    assert bulk_calls == [["a", "b"]]
+    assert [result["result"] for result in results] == ["created", "created"]
+    buffer._flusher.cancel()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_flushes_write_each_document_once(bulk_calls):
+    buffer = BulkWriteBuffer(flush_interval=60, max_batch=2)
+    writes = [
+        asyncio.ensure_future(buffer.index("outcomes", f"doc-{i}", {})) for i in range(5)
+    ]
+    await asyncio.sleep(0)
+
+    await asyncio.gather(buffer.flush(), buffer.flush())
+    await asyncio.gather(*writes)
+
+    written = [doc_id for batch in bulk_calls for doc_id in batch]
+    assert sorted(written) == [f"doc-{i}" for i in range(5)]
+    assert all(len(batch) <= 2 for batch in bulk_calls)
+    buffer._flusher.cancel()
+
+
+@pytest.mark.asyncio
+async def test_failed_item_raises_only_for_its_caller(bulk_calls):
+    buffer = BulkWriteBuffer(flush_interval=0.01)
+
+    good, bad = await asyncio.gather(
+        buffer.index("outcomes", "good", {}),
+        buffer.index("outcomes", "bad", {}),
+        return_exceptions=True,
+    )
+
+    assert good["_id"] == "good"
+    assert isinstance(bad, RuntimeError)
+    assert "mapper_parsing_exception" in str(bad)
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_caller_that_filled_the_batch_spares_the_others(mocker):
+    written = asyncio.Event()
+
+    async def slow_streaming_bulk(client, actions, **kwargs):
+        await asyncio.sleep(0.01)
+        for action in actions:
+            yield True, {"index": {"_id": action["_id"], "result": "created"}}
+        written.set()
+
+    mocker.patch.object(buffer_module, "es_client")
+    mocker.patch.object(buffer_module, "async_streaming_bulk", slow_streaming_bulk)
+    buffer = BulkWriteBuffer(flush_interval=60, max_batch=2)
+
+    first = asyncio.ensure_future(buffer.index("outcomes", "a", {}))
+    await asyncio.sleep(0)
+    last = asyncio.ensure_future(buffer.index("outcomes", "b", {}))
+    await asyncio.sleep(0)
+    last.cancel()  # client of the request that filled the batch went away
+
+    result = await asyncio.wait_for(first, timeout=1)
+    assert result["_id"] == "a"
+    assert written.is_set()
+    buffer._flusher.cancel()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_write_fails_waiting_callers(mocker):
+    async def hanging_streaming_bulk(client, actions, **kwargs):
+        await asyncio.sleep(60)
+        yield True, {}
+
+    mocker.patch.object(buffer_module, "es_client")
+    mocker.patch.object(buffer_module, "async_streaming_bulk", hanging_streaming_bulk)
+    buffer = BulkWriteBuffer(flush_interval=60, max_batch=2)
+
+    writes = [asyncio.ensure_future(buffer.index("outcomes", i, {})) for i in ("a", "b")]
+    await asyncio.sleep(0.01)
+    for task in list(buffer._full_flushes):
+        task.cancel()
+
+    results = await asyncio.wait_for(asyncio.gather(*writes, return_exceptions=True), timeout=1)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    buffer._flusher.cancel()
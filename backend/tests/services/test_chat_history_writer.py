@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from app.services import chat_history_writer as writer_module
+from app.services.chat_history_writer import ChatHistoryWriter
+
+
+@pytest.fixture
+def mock_append(mocker):
+    """Replaces the GCS read-modify-write of a session's history"""
+    return mocker.patch.object(
+        writer_module.storage_service, "append_chat_messages", return_value=True
+    )
+
+
+def written(mock_append):
+    """{session_id: [contents, ...]} for every append call, in call order"""
+    sessions = {}
+    for call in mock_append.call_args_list:
+        session_id, messages = call.args
+        sessions.setdefault(session_id, []).append([m["content"] for m in messages])
+    return sessions
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_each_session_once_in_order(mock_append):
+    writer = ChatHistoryWriter(flush_interval=60)
+    writer.enqueue("s1", "user", "hi")
+    writer.enqueue("s2", "user", "hello")
+    writer.enqueue("s1", "assistant", "hi there", intent="general")
+
+    await writer.flush()
+    writer._flusher.cancel()
+
+    assert written(mock_append) == {"s1": [["hi", "hi there"]], "s2": [["hello"]]}
+    message = mock_append.call_args_list[0].args[1][1]
+    assert message["role"] == "assistant"
+    assert message["intent"] == "general"
+
+
+@pytest.mark.asyncio
+async def test_timer_flushes_queued_messages(mock_append):
+    writer = ChatHistoryWriter(flush_interval=0.01)
+    writer.enqueue("s1", "user", "hi")
+    assert mock_append.call_count == 0  # enqueue doesn't write on the request path
+
+    await asyncio.sleep(0.05)
+
+    assert written(mock_append) == {"s1": [["hi"]]}
+    assert writer._flusher is None
+
+
+@pytest.mark.asyncio
+async def test_full_queue_flushes_without_waiting_for_timer(mock_append):
+    writer = ChatHistoryWriter(flush_interval=60, max_batch=2)
+    writer.enqueue("s1", "user", "one")
+    writer.enqueue("s1", "assistant", "two")
+
+    await asyncio.gather(*writer._full_flushes)
+    writer._flusher.cancel()
+
+    assert written(mock_append) == {"s1": [["one", "two"]]}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_flushes_write_each_message_once(mock_append):
+    writer = ChatHistoryWriter(flush_interval=60)
+    for i in range(4):
+        writer.enqueue("s1", "user", f"m{i}")
+
+    await asyncio.gather(writer.flush(), writer.flush())
+    writer._flusher.cancel()
+
+    assert written(mock_append) == {"s1": [["m0", "m1", "m2", "m3"]]}
+
+
+@pytest.mark.asyncio
+async def test_failed_session_does_not_block_others(mock_append):
+    mock_append.side_effect = lambda session_id, messages: session_id != "s1"
+    writer = ChatHistoryWriter(flush_interval=60)
+    writer.enqueue("s1", "user", "lost")
+    writer.enqueue("s2", "user", "kept")
+
+    await writer.flush()
+    writer._flusher.cancel()
+
+    assert mock_append.call_count == 2
+    assert writer._pending == []
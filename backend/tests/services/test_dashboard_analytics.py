@@ -0,0 +1,160 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from elasticsearch import NotFoundError
+
+from app.services.elasticsearch_service import DASHBOARD_SNAPSHOT_ID, ElasticsearchService
+
+ROLLED_UP_AT = 1_700_000_000_000
+
+
+def not_found():
+    return NotFoundError("index_not_found_exception", MagicMock(status=404), {})
+
+
+class FakeOutcomes:
+    """Answers the dashboard's aggregation searches from in-memory values"""
+
+    def __init__(self, newest_outcome, rollup_total=10):
+        self.newest_outcome = newest_outcome
+        self.rollup_total = rollup_total
+        self.rollup_missing = False
+        self.indices = []
+
+    async def search(self, index, aggs, **kwargs):
+        self.indices.append(index)
+        if "newest" in aggs:
+            return {"aggregations": {"newest": {"value": self.newest_outcome}}}
+        if index == "outcomes-daily":
+            if self.rollup_missing:
+                raise not_found()
+            return {"aggregations": self.rollup_aggs()}
+        return {"aggregations": self.raw_aggs()}
+
+    def rollup_aggs(self):
+        return {
+            "total": {"value": self.rollup_total},
+            "success": {"value": 8},
+            "returned": {"value": 2},
+            "days_until_return": {"value": 30},
+            "rolled_up_at": {"value": ROLLED_UP_AT, "value_as_string": "2023-11-14T22:13:20Z"},
+            "by_experience": {"buckets": [
+                {"key": "expert", "total": {"value": 10}, "success": {"value": 8}}
+            ]},
+            "by_difficulty": {"buckets": []},
+        }
+
+    @staticmethod
+    def raw_aggs():
+        return {
+            "total": {"doc_count": 12},
+            "success": {"doc_count": 9},
+            "returned": {"doc_count": 3, "days_until_return": {"value": 30}},
+            "by_experience": {"buckets": [
+                {"key": "expert", "doc_count": 12, "success": {"doc_count": 9}}
+            ]},
+            "by_difficulty": {"buckets": []},
+        }
+
+
+@pytest.fixture
+def outcomes():
+    return FakeOutcomes(newest_outcome=ROLLED_UP_AT - 1)
+
+
+@pytest.fixture
+def service(mocker, outcomes):
+    """ElasticsearchService over a mocked client and fixed index names"""
+    service = ElasticsearchService.__new__(ElasticsearchService)
+    service.settings = MagicMock(
+        outcomes_index="outcomes",
+        outcomes_daily_index="outcomes-daily",
+        dashboard_snapshot_index="dashboard",
+    )
+    service.client = MagicMock()
+    service.client.search = AsyncMock(side_effect=outcomes.search)
+    service.client.get = AsyncMock(side_effect=not_found())
+    service.client.index = AsyncMock()
+    service.client.options.return_value.indices.create = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_fresh_rollup_is_used(service, outcomes):
+    analytics = await service.get_realtime_analytics_from_es()
+
+    assert analytics["data_source"] == "Elasticsearch (daily rollup)"
+    assert analytics["total_adoptions"] == 10
+    assert analytics["overall_success_rate"] == 80.0
+    assert analytics["avg_days_until_return"] == 15.0
+    # Rollup sums plus the newest-outcome check; raw outcomes aren't aggregated
+    assert sorted(outcomes.indices) == ["outcomes", "outcomes-daily"]
+
+
+@pytest.mark.asyncio
+async def test_outcome_newer_than_rollup_falls_back_to_raw(service, outcomes):
+    outcomes.newest_outcome = ROLLED_UP_AT + 1
+
+    analytics = await service.get_realtime_analytics_from_es()
+
+    assert analytics["data_source"] == "Elasticsearch (real-time)"
+    assert analytics["total_adoptions"] == 12
+    assert analytics["success_by_experience"][0]["success_rate"] == 75.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("rollup_total, rollup_missing", [(0, False), (10, True)])
+async def test_empty_or_missing_rollup_falls_back_to_raw(
+    service, outcomes, rollup_total, rollup_missing
+):
+    outcomes.rollup_total = rollup_total
+    outcomes.rollup_missing = rollup_missing
+
+    analytics = await service.get_realtime_analytics_from_es()
+
+    assert analytics["data_source"] == "Elasticsearch (real-time)"
+
+
+@pytest.mark.asyncio
+async def test_fresh_skips_rollup(service, outcomes):
+    analytics = await service.get_realtime_analytics_from_es(fresh=True)
+
+    assert analytics["data_source"] == "Elasticsearch (real-time)"
+    assert outcomes.indices == ["outcomes"]
+
+
+@pytest.mark.asyncio
+async def test_materialized_snapshot_records_newest_outcome(service):
+    analytics = await service.materialize_dashboard()
+
+    document = service.client.index.await_args.kwargs["document"]
+    assert service.client.index.await_args.kwargs["id"] == DASHBOARD_SNAPSHOT_ID
+    assert document == {**analytics, "outcomes_through": ROLLED_UP_AT - 1}
+
+
+@pytest.mark.asyncio
+async def test_current_snapshot_is_served(service):
+    snapshot = {"total_adoptions": 5, "data_source": "snapshot"}
+    service.client.get = AsyncMock(
+        return_value={"_source": {**snapshot, "outcomes_through": ROLLED_UP_AT - 1}}
+    )
+
+    assert await service.get_dashboard_analytics() == snapshot
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("outcomes_through", [ROLLED_UP_AT - 2, None])
+async def test_stale_snapshot_is_recomputed(service, outcomes_through):
+    service.client.get = AsyncMock(
+        return_value={"_source": {"data_source": "snapshot", "outcomes_through": outcomes_through}}
+    )
+
+    analytics = await service.get_dashboard_analytics()
+
+    assert analytics["data_source"] == "Elasticsearch (daily rollup)"
+
+
+@pytest.mark.asyncio
+async def test_missing_snapshot_is_computed(service):
+    analytics = await service.get_dashboard_analytics()
+
+    assert analytics["data_source"] == "Elasticsearch (daily rollup)"
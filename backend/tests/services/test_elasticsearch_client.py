@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.elasticsearch_client import AsyncElasticsearchClient
+
+
+@pytest.fixture
+def es():
+    """AsyncElasticsearchClient over a mocked index settings API; es.stored holds the index settings"""
+    stored = {"index.refresh_interval": "5s"}
+
+    async def get_settings(index, **kwargs):
+        # Read when the request is sent, answered a little later
+        body = {index: {"settings": dict(stored)}}
+        await asyncio.sleep(0.01)
+        return MagicMock(body=body)
+
+    async def put_settings(index, settings: dict):
+        await asyncio.sleep(0.01)
+        value = settings["index.refresh_interval"]
+        if value is None:
+            stored.pop("index.refresh_interval", None)
+        else:
+            stored["index.refresh_interval"] = value
+
+    es = AsyncElasticsearchClient.__new__(AsyncElasticsearchClient)
+    es.client = MagicMock()
+    es.client.indices.get_settings = AsyncMock(side_effect=get_settings)
+    es.client.indices.put_settings = AsyncMock(side_effect=put_settings)
+    es._bulk_loads = {}
+    es._saved_refresh_intervals = {}
+    es._bulk_load_locks = {}
+    es.stored = stored
+    return es
+
+
+async def bulk_load(es, pause: float):
+    async with es.bulk_refresh_interval("case_studies"):
+        assert es.stored["index.refresh_interval"] == "30s"
+        await asyncio.sleep(pause)
+
+
+@pytest.mark.asyncio
+async def test_overlapping_loads_restore_original_interval(es):
+    await asyncio.gather(bulk_load(es, 0.02), bulk_load(es, 0.05))
+
+    assert es.stored["index.refresh_interval"] == "5s"
+    # Relaxed once by the first load, restored once by the last
+    assert es.client.indices.put_settings.await_count == 2
+    assert es._bulk_loads["case_studies"] == 0
+
+
+@pytest.mark.asyncio
+async def test_load_starting_during_restore_sees_original_interval(es):
+    async def late_load():
+        # Starts while the first load is restoring the interval
+        await asyncio.sleep(0.025)
+        await bulk_load(es, 0)
+
+    await asyncio.gather(bulk_load(es, 0), late_load())
+
+    assert es.stored["index.refresh_interval"] == "5s"
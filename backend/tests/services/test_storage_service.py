@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from unittest.mock import MagicMock
+from google.api_core.exceptions import PreconditionFailed
+
+from app.services.storage_service import CHAT_WRITE_ATTEMPTS, StorageService
+
+
+def stored_blob(messages: list, generation: int, metadata: dict = None):
+    """A chat history blob as get_blob returns it"""
+    blob = MagicMock(generation=generation, metageneration=1, metadata=metadata)
+    blob.download_as_text.return_value = json.dumps(messages)
+    return blob
+
+
+def uploaded_messages(blob) -> list:
+    return json.loads(blob.upload_from_string.call_args.args[0])
+
+
+@pytest.fixture
+def service():
+    """StorageService over a mocked bucket"""
+    service = StorageService.__new__(StorageService)
+    service.client = MagicMock()
+    service.bucket = MagicMock()
+    return service
+
+
+def test_append_is_conditional_on_the_generation_read(service):
+    blob = stored_blob([{"content": "hi"}], generation=7, metadata={"chat_name": "Beagles"})
+    service.bucket.get_blob.return_value = blob
+
+    assert service.append_chat_messages("s1", [{"content": "hello", "metadata": {}}])
+
+    assert uploaded_messages(blob) == [{"content": "hi"}, {"content": "hello", "metadata": {}}]
+    kwargs = blob.upload_from_string.call_args.kwargs
+    assert (kwargs["if_generation_match"], kwargs["if_metageneration_match"]) == (7, 1)
+    blob.download_as_text.assert_called_once_with(if_generation_match=7)
+    # The chat name is carried over to the new generation
+    assert blob.metadata == {"chat_name": "Beagles"}
+
+
+def test_append_to_new_session_requires_blob_still_missing(service):
+    service.bucket.get_blob.return_value = None
+    new_blob = service.bucket.blob.return_value
+
+    assert service.append_chat_messages("s1", [{"content": "hello", "metadata": {}}])
+
+    assert uploaded_messages(new_blob) == [{"content": "hello", "metadata": {}}]
+    assert new_blob.upload_from_string.call_args.kwargs["if_generation_match"] == 0
+
+
+def test_conflicting_write_is_retried_on_fresh_read(service):
+    stale = stored_blob([{"content": "hi"}], generation=7)
+    stale.upload_from_string.side_effect = PreconditionFailed("generation changed")
+    fresh = stored_blob([{"content": "hi"}, {"content": "from another worker"}], generation=8)
+    service.bucket.get_blob.side_effect = [stale, fresh]
+
+    assert service.append_chat_messages("s1", [{"content": "hello", "metadata": {}}])
+
+    assert [m["content"] for m in uploaded_messages(fresh)] == [
+        "hi", "from another worker", "hello"
+    ]
+    assert fresh.upload_from_string.call_args.kwargs["if_generation_match"] == 8
+
+
+def test_append_gives_up_after_repeated_conflicts(service):
+    blob = stored_blob([], generation=7)
+    blob.upload_from_string.side_effect = PreconditionFailed("generation changed")
+    service.bucket.get_blob.return_value = blob
+
+    assert not service.append_chat_messages("s1", [{"content": "hello", "metadata": {}}])
+    assert blob.upload_from_string.call_count == CHAT_WRITE_ATTEMPTS
+
+
+def test_rename_is_conditional_and_retried(service):
+    stale = stored_blob([], generation=7, metadata={"owner": "shelter"})
+    stale.patch.side_effect = PreconditionFailed("metageneration changed")
+    fresh = stored_blob([], generation=8, metadata={"owner": "shelter"})
+    service.bucket.get_blob.side_effect = [stale, fresh]
+
+    assert service.update_chat_name("s1", "Beagles")
+
+    assert fresh.metadata == {"owner": "shelter", "chat_name": "Beagles"}
+    fresh.patch.assert_called_once_with(if_generation_match=8, if_metageneration_match=1)
+
+
+def test_rename_of_missing_session_fails(service):
+    service.bucket.get_blob.return_value = None
+
+    assert not service.update_chat_name("missing", "Beagles")
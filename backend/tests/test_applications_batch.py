@@ -0,0 +1,128 @@
+"""
+Test batch reads of applications, with Elasticsearch _msearch mocked
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+
+
+def application_hit(id: str, name: str) -> dict:
+    return {
+        "_id": id,
+        "_source": {
+            "applicant_name": name,
+            "phone": "555-1234",
+            "email": f"{id}@example.com",
+            "housing_type": "House",
+            "has_yard": True,
+            "all_family_members_agree": True,
+            "experience_level": "Expert",
+            "has_other_pets": False,
+            "motivation": "I love dogs",
+            "status": "Pending",
+        },
+    }
+
+
+def hits(*hits) -> dict:
+    return {"hits": {"hits": list(hits)}}
+
+
+@pytest.fixture
+def mock_msearch(mocker):
+    client = MagicMock()
+    client.msearch = AsyncMock()
+    mocker.patch("app.api.applications.es_client", MagicMock(client=client))
+    return client.msearch
+
+
+async def post_batch(operations: list):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.post("/api/v1/applications/_batch", json=operations)
+
+
+@pytest.mark.asyncio
+async def test_operations_share_one_msearch_in_request_order(mock_msearch):
+    mock_msearch.return_value = {
+        "responses": [
+            hits(application_hit("a1", "Alice")),
+            hits(),
+            hits(application_hit("a2", "Bob"), application_hit("a3", "Cara")),
+            hits(application_hit("a3", "Cara")),
+        ]
+    }
+
+    response = await post_batch([
+        {"op": "get", "args": {"id": "a1"}},
+        {"op": "get", "args": {"id": "missing"}},
+        {"op": "list", "args": {"limit": 2, "offset": 4, "status": "Pending"}},
+        {"op": "search", "args": {"query": "active family", "limit": 1}},
+    ])
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["op"] for r in results] == ["get", "get", "list", "search"]
+    assert results[0]["result"]["id"] == "a1"
+    assert results[0]["result"]["applicant_name"] == "Alice"
+    assert results[1]["result"] is None
+    assert [a["id"] for a in results[2]["result"]] == ["a2", "a3"]
+    assert [a["id"] for a in results[3]["result"]] == ["a3"]
+
+    mock_msearch.assert_awaited_once()
+    searches = mock_msearch.await_args.kwargs["searches"]
+    assert len(searches) == 8
+    headers, bodies = searches[0::2], searches[1::2]
+    assert headers == [{}] * 4
+    assert bodies[0]["query"] == {"ids": {"values": ["a1"]}}
+    assert (bodies[2]["from"], bodies[2]["size"]) == (4, 2)
+    assert bodies[3]["size"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_search_reported_in_place(mock_msearch):
+    error = {"type": "index_not_found_exception", "reason": "no such index"}
+    mock_msearch.return_value = {
+        "responses": [{"error": error, "status": 404}, hits(application_hit("a1", "Alice"))]
+    }
+
+    response = await post_batch([
+        {"op": "search", "args": {"query": "yard"}},
+        {"op": "get", "args": {"id": "a1"}},
+    ])
+
+    assert response.status_code == 200
+    results = response.json()
+    assert results[0] == {"op": "search", "error": error}
+    assert results[1]["result"]["id"] == "a1"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("operation", [
+    {"op": "get", "args": {}},
+    {"op": "search", "args": {"limit": 5}},
+    {"op": "list", "args": {"limit": "ten"}},
+])
+async def test_invalid_args_rejected(mock_msearch, operation):
+    response = await post_batch([{"op": "get", "args": {"id": "a1"}}, operation])
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid args for operation 1")
+    mock_msearch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_unknown_op_rejected(mock_msearch):
+    response = await post_batch([{"op": "delete", "args": {"id": "a1"}}])
+
+    assert response.status_code == 422
+    mock_msearch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_empty_batch_skips_elasticsearch(mock_msearch):
+    response = await post_batch([])
+
+    assert response.status_code == 200
+    assert response.json() == []
+    mock_msearch.assert_not_awaited()
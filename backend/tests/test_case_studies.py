@@ -0,0 +1,48 @@
+"""
+Test case study updates, with the Elasticsearch update mocked
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+
+CASE_STUDY = {
+    "title": "Parvo recovery",
+    "diagnosis": "Canine parvovirus",
+    "treatment_plan": "IV fluids and antiemetics",
+    "outcome": "Full recovery",
+}
+
+
+@pytest.fixture
+def mock_update(mocker):
+    """Echoes the sent doc back as the stored document"""
+    async def fake_update(index, id, doc, **kwargs):
+        stored = {**doc, "updated_at": doc["updated_at"].isoformat()}
+        return {"get": {"_source": stored}}
+
+    client = MagicMock()
+    client.update = AsyncMock(side_effect=fake_update)
+    mocker.patch("app.api.case_studies.es_client", MagicMock(client=client))
+    return client.update
+
+
+@pytest.mark.asyncio
+async def test_put_replaces_fields_and_null_clears_them(mock_update):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.put(
+            "/api/v1/case-studies/case-1",
+            json={**CASE_STUDY, "patient_breed": None, "estimated_cost": None},
+        )
+
+    assert response.status_code == 200
+    doc = mock_update.await_args.kwargs["doc"]
+    # Unset and null optional fields are sent as null, not left out of the merge
+    assert doc["patient_breed"] is None
+    assert doc["estimated_cost"] is None
+    assert doc["date_published"] is None
+    assert doc["title"] == "Parvo recovery"
+
+    body = response.json()
+    assert body["id"] == "case-1"
+    assert body["patient_breed"] is None
@@ -0,0 +1,49 @@
+"""
+Test chat intent detection caching, with Gemini mocked
+"""
+import pytest
+from unittest.mock import AsyncMock
+from app.api import chat
+
+
+@pytest.fixture
+def mock_detect(mocker):
+    mocker.patch.object(chat, "intent_cache", chat.TTLCache(ttl=60))
+    mocker.patch.object(chat.gemini_response_cache, "get", AsyncMock(return_value="cached"))
+    mocker.patch.object(chat.gemini_response_cache, "put", AsyncMock())
+    return mocker.patch.object(
+        chat.vertex_gemini_service, "detect_intent", AsyncMock()
+    )
+
+
+@pytest.mark.asyncio
+async def test_similar_searches_are_detected_separately(mock_detect):
+    labradors = {"type": "find_adopters", "filters": {"breed": "labrador"}, "limit": 3}
+    poodles = {"type": "find_adopters", "filters": {"breed": "poodle"}, "limit": 3}
+    mock_detect.side_effect = [labradors, poodles]
+
+    assert await chat._detect_intent("adopters for labradors under 3") == labradors
+    assert await chat._detect_intent("adopters for poodles under 3") == poodles
+
+    # Never answered from, or written to, the semantic cache
+    chat.gemini_response_cache.get.assert_not_awaited()
+    chat.gemini_response_cache.put.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_exact_repeat_answered_by_intent_cache(mock_detect):
+    intent = {"type": "general", "filters": {}, "limit": 5}
+    mock_detect.return_value = intent
+
+    await chat._detect_intent("How do I crate train?")
+
+    assert chat._cached_intent("  how do i crate train?") == intent
+
+
+@pytest.mark.asyncio
+async def test_keyword_fallback_not_cached(mock_detect):
+    mock_detect.return_value = {"type": "general", "filters": {}}
+
+    await chat._detect_intent("How do I crate train?")
+
+    assert chat._cached_intent("How do I crate train?") is None
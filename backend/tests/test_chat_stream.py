@@ -0,0 +1,135 @@
+"""
+Test the Server-Sent Events chat endpoint, with Gemini, its caches and GCS history mocked
+"""
+import orjson
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+from app.api import chat
+
+GENERAL_QUESTION = "What should I feed a senior beagle?"
+
+
+def parse_frames(body: bytes) -> list:
+    """(event, data) for each SSE frame in a response body"""
+    frames = []
+    for frame in body.split(b"\n\n"):
+        if not frame:
+            continue
+        event_line, data_line = frame.split(b"\n")
+        frames.append((
+            event_line.removeprefix(b"event: ").decode(),
+            orjson.loads(data_line.removeprefix(b"data: ")),
+        ))
+    return frames
+
+
+@pytest.fixture
+def mock_gemini(mocker):
+    """Mocks intent detection, the streamed reply, the response cache and chat history"""
+    async def fake_stream(prompt, context):
+        for chunk in ["Soft food ", "and short walks. "]:
+            yield chunk
+
+    mocker.patch.object(chat.intent_cache, "get", return_value=None)
+    mocks = MagicMock(
+        detect_intent=mocker.patch.object(
+            chat, "_detect_intent", AsyncMock(return_value={"type": "general", "limit": 5})
+        ),
+        stream=mocker.patch.object(
+            chat.vertex_gemini_service, "generate_response_stream", side_effect=fake_stream
+        ),
+        cache_get=mocker.patch.object(
+            chat.gemini_response_cache, "get", AsyncMock(return_value=None)
+        ),
+        cache_put=mocker.patch.object(chat.gemini_response_cache, "put", AsyncMock()),
+        enqueue=mocker.patch.object(chat.chat_history_writer, "enqueue"),
+        chat_reply=mocker.patch.object(
+            chat, "_chat_reply", AsyncMock(return_value={"success": True, "intent": "find_adopters"})
+        ),
+    )
+    return mocks
+
+
+async def post_stream(message: str, context: dict = None):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.post(
+            "/api/v1/chat/message/stream", json={"message": message, "context": context}
+        )
+
+
+@pytest.mark.asyncio
+async def test_general_reply_streams_tokens_then_done(mock_gemini):
+    response = await post_stream(GENERAL_QUESTION, {"session_id": "s1"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+
+    frames = parse_frames(response.content)
+    assert frames[:2] == [
+        ("token", {"text": "Soft food "}),
+        ("token", {"text": "and short walks. "}),
+    ]
+    event, done = frames[2]
+    assert event == "done"
+    assert (done["intent"], done["session_id"]) == ("general", "s1")
+    assert [step["id"] for step in done["trace"]["steps"]][-1] == "gemini-generate"
+
+    # Stripped full reply is cached and saved after the user's message
+    mock_gemini.cache_put.assert_awaited_once_with(
+        "generate_response", GENERAL_QUESTION, "Soft food and short walks."
+    )
+    saved = [call.kwargs for call in mock_gemini.enqueue.call_args_list]
+    assert [(m["role"], m["content"]) for m in saved] == [
+        ("user", GENERAL_QUESTION), ("assistant", "Soft food and short walks.")
+    ]
+    mock_gemini.chat_reply.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cached_reply_sent_as_one_token(mock_gemini):
+    mock_gemini.cache_get.return_value = "Soft food."
+
+    response = await post_stream(GENERAL_QUESTION)
+
+    frames = parse_frames(response.content)
+    assert frames[0] == ("token", {"text": "Soft food."})
+    assert [event for event, _ in frames] == ["token", "done"]
+    mock_gemini.stream.assert_not_called()
+    mock_gemini.cache_put.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_session_context_reply_is_not_cached(mock_gemini):
+    response = await post_stream(GENERAL_QUESTION, {"session_id": "s1", "dog_id": "d1"})
+
+    assert [event for event, _ in parse_frames(response.content)] == ["token", "token", "done"]
+    mock_gemini.cache_get.assert_not_awaited()
+    mock_gemini.cache_put.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_search_intent_passes_resolved_intent_to_chat_reply(mock_gemini):
+    intent = {"type": "find_adopters", "filters": {}, "limit": 5}
+    mock_gemini.detect_intent.return_value = intent
+
+    response = await post_stream("Find adopters with a big yard")
+
+    assert parse_frames(response.content) == [
+        ("message", {"success": True, "intent": "find_adopters"})
+    ]
+    mock_gemini.detect_intent.assert_awaited_once()
+    resolved_intent = mock_gemini.chat_reply.await_args.args[2]
+    assert resolved_intent[:2] == (intent, "gemini")
+    mock_gemini.stream.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_dog_query_answered_as_single_message(mock_gemini):
+    response = await post_stream("Show me the medical history for dog_001")
+
+    assert [event for event, _ in parse_frames(response.content)] == ["message"]
+    assert len(mock_gemini.chat_reply.await_args.args) == 2
+    mock_gemini.detect_intent.assert_not_awaited()
@@ -304,3 +304,104 @@ class TestElasticsearchIndexing:
             # Should find the trainer first
             assert len(results) > 0
             assert "trainer" in results[0]["motivation"].lower()
+
+
+@pytest.fixture
+def mock_bulk_index(mocker):
+    """
+    Replaces Elasticsearch and language detection for /csv/upload
+    Returns the list of indexed sources; applicants named "Reject" fail at _bulk
+    """
+    indexed = []
+
+    async def fake_streaming_bulk(client, actions, **kwargs):
+        async for action in actions:
+            source = action["_source"]
+            indexed.append(source)
+            if source["applicant_name"] == "Reject":
+                yield False, {"index": {"error": {"type": "mapper_parsing_exception"}}}
+            else:
+                yield True, {"index": {"_id": f"app-{len(indexed)}", "result": "created"}}
+
+    mocker.patch("app.api.applications.es_client")
+    mocker.patch("app.api.applications.async_streaming_bulk", fake_streaming_bulk)
+    mocker.patch(
+        "app.api.applications.detect_languages_batch",
+        side_effect=lambda texts: ["en"] * len(texts),
+    )
+    return indexed
+
+
+class TestCSVUploadBulkIndexing:
+    """Test CSV upload column checks and per-row bulk results, with Elasticsearch mocked"""
+
+    @pytest.mark.asyncio
+    async def test_missing_required_columns_rejected_before_indexing(self, mock_bulk_index):
+        """Test that upload refuses a CSV lacking required columns"""
+        csv_content = create_test_csv([
+            {"applicant_name": "John Doe", "email": "john@example.com"}
+        ])
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post(
+                "/api/v1/applications/csv/upload",
+                files={"file": ("missing.csv", csv_content, "text/csv")}
+            )
+
+        assert response.status_code == 400
+        detail = response.json()["detail"]
+        assert detail.startswith("Missing required columns:")
+        for column in ("phone", "housing_type", "motivation"):
+            assert column in detail
+        assert mock_bulk_index == []
+
+    @pytest.mark.asyncio
+    async def test_empty_file_rejected(self, mock_bulk_index):
+        """Test that upload refuses a CSV without a header"""
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post(
+                "/api/v1/applications/csv/upload",
+                files={"file": ("empty.csv", b"", "text/csv")}
+            )
+
+        assert response.status_code == 400
+        assert mock_bulk_index == []
+
+    @pytest.mark.asyncio
+    async def test_failed_rows_reported_by_row_number(self, mock_bulk_index):
+        """Test that mapping and _bulk failures name their CSV row while other rows index"""
+        base = {
+            "email": "a@example.com",
+            "phone": "555-0000",
+            "housing_type": "House",
+            "motivation": "I love dogs",
+            "yard_size_sqm": "",
+        }
+        csv_content = create_test_csv([
+            {**base, "applicant_name": "Good One"},
+            {**base, "applicant_name": "Bad Yard", "yard_size_sqm": "big"},
+            {**base, "applicant_name": "Reject"},
+            {**base, "applicant_name": "Good Two", "yard_size_sqm": "40"},
+        ])
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post(
+                "/api/v1/applications/csv/upload",
+                files={"file": ("mixed.csv", csv_content, "text/csv")}
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_rows"] == 4
+        assert data["indexed_count"] == 2
+        assert data["failed_count"] == 2
+        assert data["indexed_ids"] == ["app-1", "app-3"]
+        assert data["errors"][0].startswith("Row 2:")
+        assert data["errors"][1].startswith("Row 3:")
+        assert "mapper_parsing_exception" in data["errors"][1]
+
+        assert [source["applicant_name"] for source in mock_bulk_index] == [
+            "Good One", "Reject", "Good Two"
+        ]
+        assert mock_bulk_index[2]["yard_size_sqm"] == 40
+        assert all(source["language"] == "en" for source in mock_bulk_index)
@@ -0,0 +1,75 @@
+"""
+Test CSV bulk upload for dogs, with Elasticsearch and medical extraction mocked
+"""
+import pytest
+from unittest.mock import AsyncMock
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+
+
+@pytest.fixture
+def mock_dog_indexing(mocker):
+    """Returns the list of indexed dog docs; dogs named "Reject" fail at _bulk"""
+    indexed = []
+
+    async def fake_streaming_bulk(client, actions, **kwargs):
+        for action in actions:
+            indexed.append(action["_source"])
+            if action["_source"]["name"] == "Reject":
+                yield False, {"index": {"error": {"type": "mapper_parsing_exception"}}}
+            else:
+                yield True, {"index": {"_id": action["_id"], "result": "created"}}
+
+    mocker.patch("app.api.dogs.es_client")
+    mocker.patch("app.api.dogs.async_streaming_bulk", fake_streaming_bulk)
+    mocker.patch(
+        "app.api.dogs.medical_extraction_service.batch_extract",
+        AsyncMock(side_effect=lambda dogs: dogs),
+    )
+    return indexed
+
+
+async def post_csv(csv_content: bytes):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.post(
+            "/api/v1/dogs/bulk-upload",
+            files={"file": ("dogs.csv", csv_content, "text/csv")}
+        )
+
+
+@pytest.mark.asyncio
+async def test_missing_name_column_rejected(mock_dog_indexing):
+    response = await post_csv(b"breed,age\nBeagle,3\n")
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "CSV must contain 'name' column"
+    assert mock_dog_indexing == []
+
+
+@pytest.mark.asyncio
+async def test_rows_without_name_rejected(mock_dog_indexing):
+    response = await post_csv(b"name,breed\n,Beagle\n")
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "No valid dog data found in CSV"
+
+
+@pytest.mark.asyncio
+async def test_failed_dogs_reported_by_row(mock_dog_indexing):
+    response = await post_csv(
+        b"name,breed,age,weight_kg\nBuddy,Beagle,3,12.5\nReject,Mutt,,\nLuna,,1,\n"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_processed"] == 3
+    assert data["successful"] == 2
+    assert data["failed"] == 1
+    assert len(data["dog_ids"]) == 2
+    assert data["errors"][0]["row"] == 3
+    assert data["errors"][0]["name"] == "Reject"
+    assert "mapper_parsing_exception" in data["errors"][0]["error"]
+
+    buddy = mock_dog_indexing[0]
+    assert (buddy["breed"], buddy["age"], buddy["weight_kg"]) == ("Beagle", 3, 12.5)
+    assert all(dog["adoption_status"] == "available" for dog in mock_dog_indexing)
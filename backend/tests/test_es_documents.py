@@ -0,0 +1,38 @@
+"""
+Test the timestamps Elasticsearch documents set on save, with the ES write mocked
+"""
+from datetime import datetime
+
+import pytest
+from unittest.mock import AsyncMock
+from elasticsearch.dsl import AsyncDocument
+
+from app.models.es_documents import KnowledgeArticle
+
+
+@pytest.fixture
+def mock_es_save(mocker):
+    return mocker.patch.object(AsyncDocument, "save", AsyncMock(return_value="created"))
+
+
+@pytest.mark.asyncio
+async def test_knowledge_article_save_sets_upload_date(mock_es_save):
+    article = KnowledgeArticle(title="Parvo basics", content_chunk="...")
+
+    before = datetime.now()
+    assert await article.save(refresh=True) == "created"
+
+    assert before <= article.upload_date <= datetime.now()
+    mock_es_save.assert_awaited_once_with(refresh=True)
+
+
+@pytest.mark.asyncio
+async def test_knowledge_article_save_keeps_existing_upload_date(mock_es_save):
+    uploaded = datetime(2024, 1, 15, 9, 30)
+    article = KnowledgeArticle(title="Parvo basics", upload_date=uploaded)
+
+    await article.save()
+    await article.save()
+
+    assert article.upload_date == uploaded
+    assert mock_es_save.await_count == 2